@@ -0,0 +1,147 @@
+"""Store AI feedback in compressed content-addressed blobs
+
+Revision ID: b84f0e3a61c7
+Revises: 7c1e5a9d2b40
+Create Date: 2026-10-19 10:02:17.640913
+
+"""
+import hashlib
+import json
+import zlib
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b84f0e3a61c7'
+down_revision: Union[str, None] = '7c1e5a9d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PAYLOAD_COLUMNS = {
+    'feedback_content': 'feedback_hash',
+    'career_suggestions': 'suggestions_hash',
+    'book_recommendations': 'books_hash',
+}
+
+feedback_blobs = sa.table(
+    'feedback_blobs',
+    sa.column('hash', sa.String),
+    sa.column('raw_size', sa.Integer),
+    sa.column('data', sa.LargeBinary),
+    sa.column('created_at', sa.DateTime),
+)
+
+
+def _encode(payload):
+    raw = json.dumps(
+        payload, ensure_ascii=False, sort_keys=True, separators=(',', ':')
+    ).encode('utf-8')
+    return hashlib.sha256(raw).hexdigest(), raw
+
+
+def upgrade() -> None:
+    op.create_table('feedback_blobs',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('raw_size', sa.Integer(), nullable=False),
+    sa.Column('data', sa.LargeBinary(length=16777215), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('hash')
+    )
+    op.create_table('ai_feedback_versions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('feedback_hash', sa.String(length=64), nullable=False),
+    sa.Column('suggestions_hash', sa.String(length=64), nullable=True),
+    sa.Column('books_hash', sa.String(length=64), nullable=True),
+    sa.Column('generated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['books_hash'], ['feedback_blobs.hash'], ),
+    sa.ForeignKeyConstraint(['feedback_hash'], ['feedback_blobs.hash'], ),
+    sa.ForeignKeyConstraint(['suggestions_hash'], ['feedback_blobs.hash'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ai_feedback_versions_user_id_generated_at', 'ai_feedback_versions', ['user_id', 'generated_at'], unique=False)
+    for hash_column in PAYLOAD_COLUMNS.values():
+        op.add_column('ai_feedback', sa.Column(hash_column, sa.String(length=64), nullable=True))
+
+    # Move existing payloads into the blob table
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text('SELECT id, user_id, generated_at, feedback_content, career_suggestions, book_recommendations FROM ai_feedback')
+    ).mappings().all()
+    stored = set()
+    for row in rows:
+        hashes = {}
+        for payload_column, hash_column in PAYLOAD_COLUMNS.items():
+            payload = row[payload_column]
+            if isinstance(payload, (str, bytes)):
+                payload = json.loads(payload)
+            if payload is None:
+                hashes[hash_column] = None
+                continue
+            digest, raw = _encode(payload)
+            if digest not in stored:
+                exists = conn.execute(
+                    sa.text('SELECT 1 FROM feedback_blobs WHERE hash = :hash'), {'hash': digest}
+                ).first()
+                if not exists:
+                    conn.execute(feedback_blobs.insert().values(
+                        hash=digest, raw_size=len(raw), data=zlib.compress(raw, 6), created_at=datetime.utcnow()
+                    ))
+                stored.add(digest)
+            hashes[hash_column] = digest
+        conn.execute(
+            sa.text('UPDATE ai_feedback SET feedback_hash = :feedback_hash, suggestions_hash = :suggestions_hash, books_hash = :books_hash WHERE id = :id'),
+            {'id': row['id'], **hashes},
+        )
+        conn.execute(
+            sa.text('INSERT INTO ai_feedback_versions (user_id, feedback_hash, suggestions_hash, books_hash, generated_at) VALUES (:user_id, :feedback_hash, :suggestions_hash, :books_hash, :generated_at)'),
+            {'user_id': row['user_id'], 'generated_at': row['generated_at'], **hashes},
+        )
+
+    op.alter_column('ai_feedback', 'feedback_hash', existing_type=sa.String(length=64), nullable=False)
+    for hash_column in PAYLOAD_COLUMNS.values():
+        op.create_foreign_key(f'fk_ai_feedback_{hash_column}', 'ai_feedback', 'feedback_blobs', [hash_column], ['hash'])
+    for payload_column in PAYLOAD_COLUMNS:
+        op.drop_column('ai_feedback', payload_column)
+
+
+def downgrade() -> None:
+    op.add_column('ai_feedback', sa.Column('feedback_content', sa.JSON(), nullable=True))
+    op.add_column('ai_feedback', sa.Column('career_suggestions', sa.JSON(), nullable=True))
+    op.add_column('ai_feedback', sa.Column('book_recommendations', sa.JSON(), nullable=True))
+
+    conn = op.get_bind()
+    blobs = {
+        row.hash: json.loads(zlib.decompress(row.data))
+        for row in conn.execute(sa.text('SELECT hash, data FROM feedback_blobs'))
+    }
+    ai_feedback = sa.table(
+        'ai_feedback',
+        sa.column('id', sa.Integer),
+        sa.column('feedback_content', sa.JSON),
+        sa.column('career_suggestions', sa.JSON),
+        sa.column('book_recommendations', sa.JSON),
+    )
+    rows = conn.execute(
+        sa.text('SELECT id, feedback_hash, suggestions_hash, books_hash FROM ai_feedback')
+    ).mappings().all()
+    for row in rows:
+        conn.execute(
+            ai_feedback.update().where(ai_feedback.c.id == row['id']).values(**{
+                payload_column: blobs.get(row[hash_column])
+                for payload_column, hash_column in PAYLOAD_COLUMNS.items()
+            })
+        )
+
+    op.alter_column('ai_feedback', 'feedback_content', existing_type=sa.JSON(), nullable=False)
+    for hash_column in PAYLOAD_COLUMNS.values():
+        op.drop_constraint(f'fk_ai_feedback_{hash_column}', 'ai_feedback', type_='foreignkey')
+        op.drop_column('ai_feedback', hash_column)
+    op.drop_index('ix_ai_feedback_versions_user_id_generated_at', table_name='ai_feedback_versions')
+    op.drop_table('ai_feedback_versions')
+    op.drop_table('feedback_blobs')
@@ -1,35 +1,77 @@
 """API dependencies."""
-from typing import Generator
+import time
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core import security
 from app.core.config import settings
-from app.core.database import SessionLocal
+from app.core.database import (
+    AsyncReplicaSessionLocal,
+    AsyncSessionLocal,
+    ReplicaSessionLocal,
+    SessionLocal,
+)
+from app.core.read_routing import bind_session_user, is_pinned_to_primary
+from app.core.revocation import revocation_list
+from app.core.tracing import current_span, span
+from app.core.user_cache import snapshot_user, user_cache, user_from_claims
+from app.crud.crud_auth_token import crud_token_revocation
 from app.crud.crud_user import crud_user
 from app.models import User
+from app.services.answer_buffer import answer_buffer
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
 
+# Session info key set on read sessions that are bound to the replica
+_SESSION_ON_REPLICA = "on_replica"
+
 
 def get_db() -> Generator:
-    """Get database session."""
+    """
+    Get a database session scoped to the request as a unit of work.
+
+    CRUD methods only flush; the session is committed once after the
+    endpoint returns and rolled back if anything raises.
+    """
+    db = SessionLocal()
     try:
-        db = SessionLocal()
         yield db
+        with span("db.commit"):
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> User:
-    """Get current authenticated user."""
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get an async database session scoped to the request as a unit of work.
+
+    Same commit/rollback semantics as get_db, for async endpoints.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            with span("db.commit"):
+                await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+def get_token_payload(token: str = Depends(reusable_oauth2)) -> Dict[str, Any]:
+    """Decode and verify the bearer access token."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -44,12 +86,185 @@ def get_current_user(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = crud_user.get(db, id=int(user_id))
+    return payload
+
+
+def _binds_differ(factory: Any, primary: Any) -> bool:
+    # Without a replica configured its factory is bound to the primary engine
+    return factory.kw.get("bind") is not primary.kw.get("bind")
+
+
+def _trace_read_target(pinned: bool) -> None:
+    request_span = current_span()
+    if request_span is not None:
+        request_span.set_attribute("db.read_from", "primary" if pinned else "replica")
+
+
+def get_read_db(
+    payload: Dict[str, Any] = Depends(get_token_payload),
+) -> Generator:
+    """
+    Get a read-only session for endpoints that never write.
+
+    Reads go to the replica unless the user wrote recently, in which case
+    they stay on the primary so the user sees their own changes. Nothing
+    is committed.
+    """
+    pinned = is_pinned_to_primary(int(payload["sub"]))
+    factory = SessionLocal if pinned else ReplicaSessionLocal
+    db = factory()
+    db.info[_SESSION_ON_REPLICA] = _binds_differ(factory, SessionLocal)
+    _trace_read_target(pinned)
+    try:
+        yield db
+    finally:
+        db.rollback()
+        db.close()
+
+
+async def get_async_read_db(
+    payload: Dict[str, Any] = Depends(get_token_payload),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Get a read-only async session, routed like get_read_db."""
+    pinned = is_pinned_to_primary(int(payload["sub"]))
+    _trace_read_target(pinned)
+    factory = AsyncSessionLocal if pinned else AsyncReplicaSessionLocal
+    async with factory() as db:
+        db.sync_session.info[_SESSION_ON_REPLICA] = _binds_differ(
+            factory, AsyncSessionLocal
+        )
+        try:
+            yield db
+        finally:
+            await db.rollback()
+
+
+async def flush_autosaved_answers(
+    payload: Dict[str, Any] = Depends(get_token_payload),
+) -> None:
+    """
+    Write the user's buffered autosaves before their answers are read.
+
+    Add to a route's dependencies so it runs before the session is opened;
+    the write pins the user's following reads to the primary.
+    """
+    user_id = int(payload["sub"])
+    if answer_buffer.has_pending(user_id):
+        await run_in_threadpool(answer_buffer.flush_user, user_id)
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    payload: Dict[str, Any] = Depends(get_token_payload),
+) -> User:
+    """Get current authenticated user."""
+    return _authenticate(db, payload)
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    payload: Dict[str, Any] = Depends(get_token_payload),
+) -> User:
+    """Get current authenticated user on the request's async session."""
+    return await db.run_sync(_authenticate, payload)
+
+
+def get_current_user_read(
+    db: Session = Depends(get_read_db),
+    payload: Dict[str, Any] = Depends(get_token_payload),
+) -> User:
+    """
+    Get current authenticated user on the request's read-only session.
+
+    Revocations are still checked on the primary so replica lag can't hide
+    them; that session only connects when the filter needs a sync or flags
+    the token.
+    """
+    with SessionLocal() as primary:
+        trusted = _check_revocation(primary, payload)
+    return _resolve_user(db, payload, trusted)
+
+
+async def get_current_user_async_read(
+    db: AsyncSession = Depends(get_async_read_db),
+    payload: Dict[str, Any] = Depends(get_token_payload),
+) -> User:
+    """Get current authenticated user on the async read-only session."""
+    async with AsyncSessionLocal() as primary:
+        trusted = await primary.run_sync(_check_revocation, payload)
+    return await db.run_sync(_resolve_user, payload, trusted)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _authenticate(db: Session, payload: Dict[str, Any]) -> User:
+    """Resolve the user of a verified token payload."""
+    trusted = _check_revocation(db, payload)
+    return _resolve_user(db, payload, trusted)
+
+
+def _check_revocation(db: Session, payload: Dict[str, Any]) -> bool:
+    """
+    Reject a revoked token.
+
+    Returns False when the filter flagged the token, in which case its
+    embedded claims are not used even though it was not revoked.
+    """
+    user_id = int(payload["sub"])
+    jti = payload.get("jti")
+    if revocation_list.needs_sync():
+        crud_token_revocation.sync(db)
+    if not revocation_list.might_be_revoked(jti, user_id):
+        return True
+    # Filter hits can be false positives, so confirm against the table
+    issued_at = datetime.utcfromtimestamp(payload.get("iat", 0))
+    if crud_token_revocation.is_revoked(
+        db, jti=jti, user_id=user_id, issued_at=issued_at
+    ):
+        raise _credentials_exception()
+    return False
+
+
+def _resolve_user(db: Session, payload: Dict[str, Any], trusted: bool) -> User:
+    """Load the token's user on db, from its claims or the cache if possible."""
+    user_id = int(payload["sub"])
+    bind_session_user(db, user_id)
+
+    principal = _principal_from_token(user_id, payload) if trusted else None
+    if principal is None:
+        principal = user_cache.get(user_id)
+    if principal is not None:
+        # Attach a session-bound copy without emitting a SELECT
+        return db.merge(principal, load=False)
+
+    user = crud_user.get(db, id=user_id)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    if not db.info.get(_SESSION_ON_REPLICA):
+        # A lagging replica row would also be served to primary requests
+        user_cache.set(user.id, snapshot_user(user))
     return user
 
 
+def _principal_from_token(user_id: int, payload: Dict[str, Any]) -> Optional[User]:
+    """Build the user from signed token claims when they are trusted and fresh."""
+    if not settings.AUTH_TRUST_TOKEN_CLAIMS:
+        return None
+    claims = payload.get("usr")
+    issued_at = payload.get("iat")
+    if not isinstance(claims, dict) or issued_at is None:
+        return None
+    if time.time() - issued_at > settings.AUTH_CLAIMS_MAX_AGE_SECONDS:
+        return None
+    return user_from_claims(user_id, claims)
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -59,6 +274,33 @@ def get_current_active_user(
     return current_user
 
 
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async),
+) -> User:
+    """Get current active user for async endpoints."""
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+
+def get_current_active_user_read(
+    current_user: User = Depends(get_current_user_read),
+) -> User:
+    """Get current active user for read-only endpoints."""
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+
+async def get_current_active_user_async_read(
+    current_user: User = Depends(get_current_user_async_read),
+) -> User:
+    """Get current active user for async read-only endpoints."""
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+
 def get_current_active_superuser(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -67,4 +309,15 @@ def get_current_active_superuser(
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+def get_current_active_superuser_read(
+    current_user: User = Depends(get_current_user_read),
+) -> User:
+    """Get current active superuser for read-only endpoints."""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=403, detail="The user doesn't have enough privileges"
+        )
+    return current_user
@@ -0,0 +1,136 @@
+"""Idempotency-Key handling for endpoints with side effects."""
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Union
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+
+from app import crud
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.encoding import NegotiatedResponse
+from app.core.http_cache import NO_STORE
+from app.models import IdempotencyKey
+from app.models.feedback_blob import canonical_json
+
+# Set on responses replayed from an earlier request with the same key
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Longest Idempotency-Key header accepted
+MAX_KEY_LENGTH = 255
+
+
+class ExpiredKeyPruner:
+    """
+    Deletes expired keys in small batches, in transactions of their own.
+
+    Pruning inside a request's transaction would hold range locks on the
+    expiry index until it commits and serialize every keyed request, so
+    each process prunes at most once per interval instead.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval_seconds: float,
+        batch_size: int,
+    ):
+        """Prune on the first claim."""
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._next_run = 0.0
+        self._lock = threading.Lock()
+
+    def due(self) -> bool:
+        """Whether this caller should prune now; only one caller per interval."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_run:
+                return False
+            self._next_run = now + self.interval_seconds
+            return True
+
+    def run(self) -> int:
+        """Delete a batch of expired keys; returns how many were deleted."""
+        db = self.session_factory()
+        try:
+            deleted = crud.crud_idempotency_key.prune(db, limit=self.batch_size)
+            db.commit()
+            return deleted
+        except Exception as e:
+            db.rollback()
+            print(f"Failed to prune idempotency keys: {e}")
+            return 0
+        finally:
+            db.close()
+
+
+key_pruner = ExpiredKeyPruner(
+    SessionLocal,
+    interval_seconds=settings.IDEMPOTENCY_KEY_PRUNE_SECONDS,
+    batch_size=settings.IDEMPOTENCY_KEY_PRUNE_BATCH,
+)
+
+
+def request_hash(*parts: Any) -> str:
+    """Digest of what a request asks for, to detect a key reused elsewhere."""
+    return hashlib.sha256(canonical_json(jsonable_encoder(parts))).hexdigest()
+
+
+async def claim(
+    db: AsyncSession, user_id: int, key: str, request_hash: str
+) -> Union[IdempotencyKey, Response]:
+    """
+    Claim a key for the request, or replay the response it already got.
+
+    Raises 422 when the key was used for a different request and 409 while
+    the request holding it is still in progress.
+    """
+    if key_pruner.due():
+        await run_in_threadpool(key_pruner.run)
+    return await db.run_sync(_claim, user_id, key, request_hash)
+
+
+def _claim(
+    db: Session, user_id: int, key: str, request_hash: str
+) -> Union[IdempotencyKey, Response]:
+    row, claimed = crud.crud_idempotency_key.claim(
+        db, user_id=user_id, key=key, request_hash=request_hash
+    )
+    if claimed:
+        return row
+    if row.request_hash != request_hash:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used for a different request",
+        )
+    if row.status_code is None:
+        raise HTTPException(
+            status_code=409,
+            detail="A request with this Idempotency-Key is still in progress",
+        )
+    return NegotiatedResponse(
+        row.content,
+        status_code=row.status_code,
+        headers={REPLAYED_HEADER: "true", "Cache-Control": NO_STORE},
+    )
+
+
+def store(
+    db: Session, row: IdempotencyKey, content: Any, status_code: int = 200
+) -> None:
+    """Store the response of a claimed request for replays."""
+    row.set_response(status_code, jsonable_encoder(content))
+    db.flush()
+
+
+def release(db: Session, row: IdempotencyKey) -> None:
+    """Give up a claim, so a retry with the key runs the request again."""
+    crud.crud_idempotency_key.release(db, row=row)
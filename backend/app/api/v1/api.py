@@ -1,7 +1,16 @@
 """API v1 router configuration."""
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import answers, auth, career_plans, competencies, questions, users
+from app.api.v1.endpoints import (
+    admin,
+    answers,
+    auth,
+    bootstrap,
+    career_plans,
+    competencies,
+    questions,
+    users,
+)
 
 api_router = APIRouter()
 
@@ -15,4 +24,6 @@ api_router.include_router(
 )
 api_router.include_router(
     career_plans.router, prefix="/career-plans", tags=["career-plans"]
-)
\ No newline at end of file
+)
+api_router.include_router(bootstrap.router, prefix="/bootstrap", tags=["bootstrap"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,120 @@
+"""Admin API endpoints."""
+from datetime import datetime, timedelta
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.api import deps
+from app.core.encoding import NegotiatedResponse, NegotiatedRoute
+from app.core.profiling import request_profiler
+from app.core.query_stats import query_metrics
+from app.core.user_cache import user_cache
+from app.models import User
+from app.services.recommendation_engine import evaluate_all_users
+
+router = APIRouter(
+    route_class=NegotiatedRoute, default_response_class=NegotiatedResponse
+)
+
+
+@router.get("/llm-usage", response_model=List[schemas.LLMUsageSummary])
+def read_llm_usage(
+    *,
+    db: Session = Depends(deps.get_read_db),
+    days: int = Query(30, ge=1, le=366),
+    group_by: Literal["day", "department"] = "day",
+    current_user: User = Depends(deps.get_current_active_superuser_read),
+) -> List[schemas.LLMUsageSummary]:
+    """
+    Get LLM spend and latency percentiles by day or by department.
+    """
+    end = datetime.utcnow().date()
+    start = end - timedelta(days=days - 1)
+    return crud.crud_llm_usage.get_summary(db, start=start, end=end, group_by=group_by)
+
+
+@router.get("/recommendations", response_model=List[schemas.UserRecommendations])
+def read_all_recommendations(
+    *,
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_superuser_read),
+) -> List[schemas.UserRecommendations]:
+    """
+    Batch-evaluate catalog recommendations for every active employee.
+    """
+    return [
+        schemas.UserRecommendations(
+            user_id=user.id,
+            name=user.name,
+            department=user.department,
+            career_suggestions=recommendations.suggestions,
+            trainings=recommendations.trainings,
+            book_recommendations=recommendations.books,
+        )
+        for user, recommendations in evaluate_all_users(db)
+    ]
+
+
+@router.get("/user-cache", response_model=schemas.CacheStats)
+def read_user_cache_stats(
+    *,
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> schemas.CacheStats:
+    """
+    Get hit rate and eviction counters of the authenticated user cache.
+    """
+    return schemas.CacheStats(**user_cache.stats())
+
+
+@router.get("/query-stats", response_model=List[schemas.RouteQueryStats])
+def read_query_stats(
+    *,
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> List[schemas.RouteQueryStats]:
+    """
+    Get SQL statement counts and database time per route, busiest first.
+    """
+    stats = [
+        schemas.RouteQueryStats(
+            route=route,
+            requests=totals.requests,
+            queries=totals.queries,
+            avg_queries=totals.queries / totals.requests,
+            max_queries=totals.max_queries,
+            avg_db_time_ms=totals.db_seconds * 1000 / totals.requests,
+            n_plus_one_requests=totals.n_plus_one_requests,
+        )
+        for route, totals in query_metrics.snapshot().items()
+    ]
+    return sorted(stats, key=lambda s: s.queries, reverse=True)
+
+
+@router.get("/profiles", response_model=List[schemas.RouteProfile])
+def read_profiles(
+    *,
+    current_user: User = Depends(deps.get_current_active_superuser),
+    limit: int = Query(20, ge=1, le=200),
+) -> List[schemas.RouteProfile]:
+    """
+    Get the hottest functions by self time per profiled route, most profiled first.
+    """
+    profiles = []
+    for route, (totals, functions) in request_profiler.hot_functions(limit).items():
+        profiles.append(
+            schemas.RouteProfile(
+                route=route,
+                profiles=totals.profiles,
+                avg_duration_ms=totals.seconds * 1000 / totals.profiles,
+                hot_functions=[
+                    schemas.HotFunction(
+                        function=function,
+                        self_ms=seconds * 1000,
+                        share=seconds / totals.seconds if totals.seconds else 0.0,
+                    )
+                    for function, seconds in functions
+                ],
+            )
+        )
+    return sorted(profiles, key=lambda p: p.profiles, reverse=True)
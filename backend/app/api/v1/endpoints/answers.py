@@ -1,44 +1,114 @@
 """Answers API endpoints."""
-from typing import List
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, schemas
-from app.api import deps
+from app.api import deps, idempotency
+from app.crud.crud_competency import UnknownQuestionError
 from app.models import User
+from app.services.answer_buffer import answer_buffer
+from app.services.catalog import catalog
 
 router = APIRouter()
 
 
 @router.post("/", response_model=List[schemas.Answer])
-def submit_answers(
+async def submit_answers(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     answers_in: schemas.AnswerBulkCreate,
-    current_user: User = Depends(deps.get_current_active_user),
-) -> List[schemas.Answer]:
+    idempotency_key: Optional[str] = Header(
+        None, max_length=idempotency.MAX_KEY_LENGTH
+    ),
+    current_user: User = Depends(deps.get_current_active_user_async),
+) -> Union[List[schemas.Answer], Response]:
     """
     Submit multiple answers at once.
+
+    Pending autosaves of the user are written in the same transaction;
+    submitted answers win over autosaves to the same question. A retry
+    with the same Idempotency-Key gets the stored response without
+    writing anything.
     """
-    answers = crud.crud_answer.bulk_create_or_update(
-        db, user_id=current_user.id, answers=answers_in.answers
-    )
+    key_claim = None
+    if idempotency_key is not None:
+        key_claim = await idempotency.claim(
+            db,
+            current_user.id,
+            idempotency_key,
+            idempotency.request_hash("POST /answers", answers_in),
+        )
+        if isinstance(key_claim, Response):
+            return key_claim
+
+    autosaved = {}
+    if answer_buffer.has_pending(current_user.id):
+        # May wait for a flush in progress, which must not land after us
+        autosaved = await run_in_threadpool(answer_buffer.take, current_user.id)
+        answer_buffer.restore_on_rollback(db.sync_session, current_user.id, autosaved)
+    submitted = {answer.question_id for answer in answers_in.answers}
+    answers = [
+        schemas.AnswerCreate(question_id=question_id, score=score)
+        for question_id, score in autosaved.items()
+        if question_id not in submitted
+    ] + answers_in.answers
+    try:
+        answers = await crud.async_crud_answer.bulk_create_or_update(
+            db, user_id=current_user.id, answers=answers
+        )
+    except UnknownQuestionError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown question ids: {e.question_ids}",
+        )
     
     # Invalidate cached AI feedback when new answers are submitted
-    crud.crud_ai_feedback.invalidate_user_feedback(db, user_id=current_user.id)
+    await crud.async_crud_ai_feedback.invalidate_user_feedback(
+        db, user_id=current_user.id
+    )
     
+    if key_claim is not None:
+        answers = [schemas.Answer.model_validate(answer) for answer in answers]
+        await db.run_sync(idempotency.store, key_claim, answers)
     return answers
 
 
-@router.get("/", response_model=List[schemas.Answer])
-def read_user_answers(
+@router.patch("/{question_id}", response_model=schemas.AnswerCreate, status_code=202)
+async def autosave_answer(
+    *,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    question_id: int,
+    answer_in: schemas.AnswerAutosave,
+    current_user: User = Depends(deps.get_current_active_user_async_read),
+) -> schemas.AnswerCreate:
+    """
+    Autosave one answer.
+
+    The answer is buffered and written with others shortly after, so the
+    response is 202 Accepted. Submit the answers to write them at once.
+    """
+    snapshot = await catalog.get_async(db)
+    if question_id not in snapshot.question_items:
+        raise HTTPException(status_code=404, detail="Question not found")
+    answer_buffer.put(current_user.id, question_id, answer_in.score)
+    return schemas.AnswerCreate(question_id=question_id, score=answer_in.score)
+
+
+@router.get(
+    "/",
+    response_model=List[schemas.Answer],
+    dependencies=[Depends(deps.flush_autosaved_answers)],
+)
+async def read_user_answers(
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    current_user: User = Depends(deps.get_current_active_user_async_read),
 ) -> List[schemas.Answer]:
     """
     Get all answers for the current user.
     """
-    answers = crud.crud_answer.get_user_answers(db, user_id=current_user.id)
-    return answers
\ No newline at end of file
+    answers = await crud.async_crud_answer.get_user_answers(db, user_id=current_user.id)
+    return answers
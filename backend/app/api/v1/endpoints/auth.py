@@ -1,8 +1,8 @@
 """Authentication endpoints."""
-from datetime import timedelta
-from typing import Any
+from datetime import datetime, timedelta
+from typing import Any, Dict
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -10,6 +10,8 @@ from app import crud, schemas
 from app.api import deps
 from app.core import security
 from app.core.config import settings
+from app.core.user_cache import user_claims
+from app.models import User
 
 router = APIRouter()
 
@@ -26,12 +28,55 @@ def login(
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     elif not crud.crud_user.is_active(user):
         raise HTTPException(status_code=400, detail="Inactive user")
+    return _issue_tokens(user, crud.crud_refresh_token.issue(db, user_id=user.id))
+
+
+@router.post("/refresh", response_model=schemas.Token)
+def refresh_token(
+    *,
+    db: Session = Depends(deps.get_db),
+    body: schemas.TokenRefresh,
+) -> Any:
+    """Exchange a refresh token for a new access and refresh token pair."""
+    rotated = crud.crud_refresh_token.rotate(db, token=body.refresh_token)
+    user = crud.crud_user.get(db, id=rotated[0]) if rotated else None
+    if user is None or not crud.crud_user.is_active(user):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+    return _issue_tokens(user, rotated[1])
+
+
+@router.post("/logout", status_code=204)
+def logout(
+    *,
+    db: Session = Depends(deps.get_db),
+    body: schemas.Logout = schemas.Logout(),
+    payload: Dict[str, Any] = Depends(deps.get_token_payload),
+    current_user: User = Depends(deps.get_current_user),
+) -> None:
+    """Revoke the current access token and its refresh token session."""
+    if payload.get("jti"):
+        crud.crud_token_revocation.revoke_access_token(
+            db,
+            jti=payload["jti"],
+            expires_at=datetime.utcfromtimestamp(payload["exp"]),
+        )
+    if body.refresh_token:
+        crud.crud_refresh_token.revoke_token(db, token=body.refresh_token)
+    return None
+
+
+def _issue_tokens(user: User, refresh: str) -> Dict[str, Any]:
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": security.create_access_token(
-            user.id, expires_delta=access_token_expires
+            user.id, expires_delta=access_token_expires, claims=user_claims(user)
         ),
+        "refresh_token": refresh,
         "token_type": "bearer",
+        "expires_in": int(access_token_expires.total_seconds()),
     }
 
 
@@ -0,0 +1,99 @@
+"""Bootstrap API endpoint."""
+import json
+from typing import Any, Dict, Tuple
+
+import msgpack
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.api import deps
+from app.api.v1.endpoints.competencies import cached_feedback_response
+from app.core.encoding import (
+    NegotiatedResponse,
+    NegotiatedRoute,
+    msgpack_requested,
+    negotiated_media_type,
+    packb,
+)
+from app.core.http_cache import NO_STORE
+from app.models import User
+from app.services.catalog import CatalogSnapshot, catalog
+from app.services.competency_calculator import CompetencyCalculator
+
+router = APIRouter(
+    route_class=NegotiatedRoute, default_response_class=NegotiatedResponse
+)
+
+
+@router.get(
+    "/",
+    response_model=schemas.Bootstrap,
+    dependencies=[Depends(deps.flush_autosaved_answers)],
+)
+async def read_bootstrap(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user_async),
+) -> Response:
+    """
+    Get the current user, questions with answers, career plan, competency
+    results and cached AI feedback in one round trip.
+    """
+    snapshot = await catalog.get_async(db)
+    scores, parts = await db.run_sync(_bootstrap_parts, current_user)
+    response = Response(
+        _encode(snapshot, scores, parts), media_type=negotiated_media_type()
+    )
+    response.headers["Cache-Control"] = NO_STORE
+    return response
+
+
+def _bootstrap_parts(
+    db: Session, current_user: User
+) -> Tuple[Dict[int, int], Dict[str, Any]]:
+    # One session and one connection for every part; the questions come
+    # from the catalog snapshot
+    scores = crud.crud_answer.get_user_scores(db, user_id=current_user.id)
+    career_plan = crud.crud_user_career_plan.get_by_user_id(db, user_id=current_user.id)
+    user_competencies, company_averages = CompetencyCalculator.get_competency_results(
+        db, user_id=current_user.id
+    )
+    results = schemas.CompetencyResult(
+        user_competencies=user_competencies, company_averages=company_averages
+    )
+    parts = {
+        "user": schemas.User.model_validate(current_user).model_dump(mode="json"),
+        "career_plan": (
+            schemas.UserCareerPlan.model_validate(career_plan).model_dump(mode="json")
+            if career_plan is not None
+            else None
+        ),
+        "results": results.model_dump(mode="json"),
+        "feedback": cached_feedback_response(db, current_user),
+    }
+    return scores, parts
+
+
+def _encode(
+    snapshot: CatalogSnapshot, scores: Dict[int, int], parts: Dict[str, Any]
+) -> bytes:
+    # The questions are spliced in pre-encoded, the rest is encoded here
+    if msgpack_requested():
+        packer = msgpack.Packer()
+        return b"".join(
+            [
+                packer.pack_map_header(len(parts) + 1),
+                packer.pack("questions"),
+                snapshot.questions_with_answers_msgpack(scores),
+                *(packer.pack(key) + packb(value) for key, value in parts.items()),
+            ]
+        )
+    rest = json.dumps(parts, ensure_ascii=False, separators=(",", ":")).encode()
+    return (
+        b'{"questions":'
+        + snapshot.questions_with_answers_json(scores)
+        + b","
+        + rest[1:]
+    )
@@ -12,8 +12,8 @@ router = APIRouter()
 @router.get("/", response_model=schemas.UserCareerPlan)
 def get_career_plan(
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user_read),
 ) -> schemas.UserCareerPlan:
     """
     Get current user's career plan.
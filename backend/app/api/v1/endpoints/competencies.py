@@ -1,58 +1,220 @@
 """Competencies API endpoints."""
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, schemas
-from app.api import deps
-from app.models import User
+from app.api import deps, idempotency
+from app.core.encoding import (
+    MSGPACK_MEDIA_TYPE,
+    NegotiatedResponse,
+    NegotiatedRoute,
+    msgpack_requested,
+    packb,
+)
+from app.core.http_cache import (
+    NO_STORE,
+    PRIVATE_REVALIDATE,
+    catalog_response,
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from app.core.metrics import AI_FEEDBACK_REQUESTS
+from app.core.tracing import traced
+from app.crud.crud_data_version import (
+    COMPANY_COMPETENCIES,
+    answers_key,
+    feedback_key,
+    version_number,
+)
+from app.models import (
+    CompanyAverageCompetency,
+    IdempotencyKey,
+    User,
+    UserCareerPlan,
+    UserCompetency,
+)
 from app.services.competency_calculator import CompetencyCalculator
-from app.services.ai_feedback_service import ai_feedback_service
+from app.services.ai_feedback_service import LLMCallStats, ai_feedback_service
+from app.services.catalog import CatalogSnapshot, catalog
 
-router = APIRouter()
+router = APIRouter(
+    route_class=NegotiatedRoute, default_response_class=NegotiatedResponse
+)
+
+# Hours stored feedback is served without asking for regeneration
+FEEDBACK_CACHE_HOURS = 7 * 24
+
+# Accept type selecting the compact results representation
+COMPACT_RESULTS_MEDIA_TYPE = "application/vnd.competency.compact+json"
+
+# Rows and career plan the feedback prompt is built from
+FeedbackInputs = Tuple[
+    List[UserCompetency], List[CompanyAverageCompetency], Optional[UserCareerPlan]
+]
+ResultPayload = Union[schemas.CompetencyResult, schemas.CompactCompetencyResult]
+
+
+def _record_llm_usage(db: Session, user: User, stats: LLMCallStats) -> None:
+    """Record a provider call in the LLM usage ledger."""
+    usage_in = schemas.LLMUsageCreate(
+        user_id=user.id,
+        department=user.department,
+        prompt_version=stats.prompt_version,
+        model=stats.model,
+        estimated_input_tokens=stats.estimated_input_tokens,
+        truncated_fields=list(stats.truncated_fields),
+        input_tokens=stats.input_tokens or 0,
+        output_tokens=stats.output_tokens or 0,
+        latency_ms=round(stats.latency_ms or 0),
+        outcome=stats.outcome,
+    )
+    crud.crud_llm_usage.record(db, obj_in=usage_in)
 
 
 @router.get("/items", response_model=List[schemas.CompetencyItem])
 def read_competency_items(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_active_user),
-) -> List[schemas.CompetencyItem]:
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(deps.get_current_active_user_read),
+) -> Response:
     """
     Retrieve all competency items with their questions.
     """
-    items = crud.crud_competency_item.get_all_with_questions(db)
-    return items[skip : skip + limit]
+    snapshot = catalog.get(db)
+    if msgpack_requested():
+        body = snapshot.items_page_msgpack(skip, limit)
+    else:
+        body = snapshot.items_page_json(skip, limit)
+    return catalog_response(snapshot.version, body, if_none_match)
 
 
-@router.get("/results", response_model=schemas.CompetencyResult)
-def get_competency_results(
+@router.get(
+    "/results",
+    response_model=schemas.CompetencyResult,
+    dependencies=[Depends(deps.flush_autosaved_answers)],
+)
+async def get_competency_results(
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
-) -> schemas.CompetencyResult:
+    db: AsyncSession = Depends(deps.get_async_db),
+    response: Response,
+    result_format: Literal["full", "compact"] = Query("full", alias="format"),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(deps.get_current_active_user_async),
+) -> Any:
     """
     Get user's competency evaluation results with company averages.
+    
+    ?format=compact, or an Accept header naming COMPACT_RESULTS_MEDIA_TYPE,
+    returns a CompactCompetencyResult that lists each competency item once.
     """
+    accepted = accept or ""
+    compact = result_format == "compact" or COMPACT_RESULTS_MEDIA_TYPE in accepted
+    etag, result = await db.run_sync(
+        _competency_results, current_user.id, if_none_match, compact
+    )
+    if result is None:
+        return not_modified(etag, PRIVATE_REVALIDATE)
+    if compact and msgpack_requested():
+        response = Response(
+            packb(result.model_dump(mode="json")), media_type=MSGPACK_MEDIA_TYPE
+        )
+    elif compact:
+        response = Response(
+            result.model_dump_json(), media_type=COMPACT_RESULTS_MEDIA_TYPE
+        )
+    set_cache_headers(response, etag, PRIVATE_REVALIDATE)
+    return response if compact else result
+
+
+def _results_etag(db: Session, user_id: int, compact: bool) -> str:
+    # Results follow the catalog, the user's answers and everyone's scores
+    snapshot = catalog.get(db)
+    names = [answers_key(user_id), COMPANY_COMPETENCIES]
+    versions = crud.crud_data_version.get_versions(db, names=names)
+    return make_etag(
+        "results",
+        "compact" if compact else "full",
+        snapshot.version,
+        *(f"{name}={version_number(versions, name)}" for name in names),
+    )
+
+
+def _competency_results(
+    db: Session, user_id: int, if_none_match: Optional[str], compact: bool
+) -> Tuple[str, Optional[ResultPayload]]:
+    # No results are built when the client's copy is current
+    etag = _results_etag(db, user_id, compact)
+    if etag_matches(if_none_match, etag):
+        return etag, None
+    
+    # Built inside run_sync so competency items can still be lazy-loaded
     user_competencies, company_averages = CompetencyCalculator.get_competency_results(
-        db, user_id=current_user.id
+        db, user_id=user_id
     )
     
-    return schemas.CompetencyResult(
-        user_competencies=user_competencies,
-        company_averages=company_averages
+    if compact:
+        result = _compact_result(catalog.get(db), user_competencies, company_averages)
+    else:
+        result = schemas.CompetencyResult(
+            user_competencies=user_competencies,
+            company_averages=company_averages
+        )
+    # Saving the results may have bumped the company version
+    return _results_etag(db, user_id, compact), result
+
+
+def _compact_result(
+    snapshot: CatalogSnapshot,
+    user_competencies: List[UserCompetency],
+    company_averages: List[CompanyAverageCompetency],
+) -> schemas.CompactCompetencyResult:
+    user_scores = {uc.competency_item_id: uc for uc in user_competencies}
+    averages = {ca.competency_item_id: ca for ca in company_averages}
+    item_ids = [item.id for item in snapshot.items]
+    return schemas.CompactCompetencyResult(
+        items={
+            item.id: schemas.CompactCompetencyItem(
+                name=item.name, description=item.description, order=item.order
+            )
+            for item in snapshot.items
+        },
+        item_ids=item_ids,
+        user_scores=[
+            user_scores[i].score if i in user_scores else None for i in item_ids
+        ],
+        company_averages=[
+            averages[i].average_score if i in averages else None for i in item_ids
+        ],
+        company_total_users=[
+            averages[i].total_users if i in averages else None for i in item_ids
+        ],
+        calculated_at=max(
+            (uc.calculated_at for uc in user_competencies), default=None
+        ),
     )
 
 
-@router.get("/feedback")
-def get_ai_feedback(
+@router.get("/feedback", dependencies=[Depends(deps.flush_autosaved_answers)])
+async def get_ai_feedback(
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(
+        None, max_length=idempotency.MAX_KEY_LENGTH
+    ),
+    current_user: User = Depends(deps.get_current_active_user_async),
     force_regenerate: bool = False,
 ):
     """
@@ -60,52 +222,165 @@ def get_ai_feedback(
     
     Args:
         force_regenerate: If True, regenerate feedback even if cached version exists
+        idempotency_key: Makes a forced regeneration run once; retries with
+            the same key get the stored response
     """
     # Check for cached feedback first (valid for 7 days)
     if not force_regenerate:
-        cached_feedback = crud.crud_ai_feedback.get_by_user_id(
-            db, user_id=current_user.id, hours_valid=7 * 24
-        )
-        if cached_feedback:
-            return {
-                "feedback": cached_feedback.feedback_content,
-                "career_suggestions": cached_feedback.career_suggestions or [],
-                "book_recommendations": cached_feedback.book_recommendations or [],
-                "generated_at": cached_feedback.generated_at.isoformat() + "Z",
-                "from_cache": True
-            }
+        etag = await db.run_sync(_feedback_etag, current_user.id)
+        if etag is None:
+            response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+        elif etag_matches(if_none_match, etag):
+            AI_FEEDBACK_REQUESTS.labels("not_modified").inc()
+            return not_modified(etag, PRIVATE_REVALIDATE)
         else:
-            # No cached feedback and not forced to regenerate - return empty response
-            return {
-                "feedback": None,
-                "career_suggestions": [],
-                "book_recommendations": [],
-                "generated_at": None,
-                "from_cache": False,
-                "message": "キャッシュされたフィードバックがありません。AIへ評価を依頼してください。"
-            }
+            set_cache_headers(response, etag, PRIVATE_REVALIDATE)
+        return await db.run_sync(cached_feedback_response, current_user)
     
     # Generate new feedback
+    response.headers["Cache-Control"] = NO_STORE
+    return await _regenerate_feedback(db, current_user, idempotency_key)
+
+
+async def _regenerate_feedback(
+    db: AsyncSession, current_user: User, idempotency_key: Optional[str]
+) -> Union[Dict[str, Any], Response]:
+    key_claim = None
+    if idempotency_key is not None:
+        key_claim = await idempotency.claim(
+            db,
+            current_user.id,
+            idempotency_key,
+            idempotency.request_hash("GET /competencies/feedback", "regenerate"),
+        )
+        if isinstance(key_claim, Response):
+            AI_FEEDBACK_REQUESTS.labels("replayed").inc()
+            return key_claim
+    AI_FEEDBACK_REQUESTS.labels("regenerate").inc()
+    inputs = await db.run_sync(_prepare_feedback_inputs, current_user)
+    if inputs is None:
+        result = {"error": "評価結果がありません。まず評価を完了してください。"}
+        if key_claim is not None:
+            await db.run_sync(idempotency.store, key_claim, result)
+        return result
+    user_competencies, company_averages, career_plan = inputs
+    
+    # Don't hold the recalculated rows locked for the duration of the LLM call.
+    # This commits the key claim too, so a concurrent retry gets a 409
+    # instead of paying for a second call.
+    await db.commit()
+    
+    try:
+        # Generate enhanced AI feedback with career plan consideration. The
+        # OpenAI client blocks, so it runs on the threadpool.
+        feedback, llm_stats = await run_in_threadpool(
+            ai_feedback_service.generate_enhanced_competency_feedback_with_stats,
+            user_competencies, company_averages, career_plan, current_user.name
+        )
+        
+        result = await db.run_sync(
+            _store_feedback, current_user, inputs, feedback, llm_stats
+        )
+        if key_claim is not None:
+            await db.run_sync(_settle_key_claim, key_claim, result, llm_stats)
+    except Exception:
+        if key_claim is not None:
+            # Let a retry with the same key run again
+            await db.rollback()
+            await db.run_sync(idempotency.release, key_claim)
+            await db.commit()
+        raise
+    return result
+
+
+def _settle_key_claim(
+    db: Session,
+    key_claim: IdempotencyKey,
+    result: Dict[str, Any],
+    llm_stats: Optional[LLMCallStats],
+) -> None:
+    if llm_stats is not None and llm_stats.outcome == "error":
+        # The provider failed and result is the fallback; let a retry ask again
+        idempotency.release(db, key_claim)
+    else:
+        idempotency.store(db, key_claim, result)
+
+
+def _feedback_etag(db: Session, user_id: int) -> Optional[str]:
+    """ETag of the stored feedback, or None if it may have expired since."""
+    key = feedback_key(user_id)
+    versions = crud.crud_data_version.get_versions(db, names=[key])
+    row = versions.get(key)
+    expired_before = datetime.utcnow() - timedelta(hours=FEEDBACK_CACHE_HOURS)
+    if row is not None and row.updated_at < expired_before:
+        return None
+    return make_etag("feedback", key, version_number(versions, key))
+
+
+def cached_feedback_response(db: Session, current_user: User) -> Dict[str, Any]:
+    """Body of a non-forced feedback request; also served by /bootstrap."""
+    cached_feedback = crud.crud_ai_feedback.get_by_user_id(
+        db, user_id=current_user.id, hours_valid=FEEDBACK_CACHE_HOURS
+    )
+    if cached_feedback:
+        AI_FEEDBACK_REQUESTS.labels("hit").inc()
+        return {
+            "feedback": cached_feedback.feedback_content,
+            "career_suggestions": cached_feedback.career_suggestions or [],
+            "book_recommendations": cached_feedback.book_recommendations or [],
+            "generated_at": cached_feedback.generated_at.isoformat() + "Z",
+            "from_cache": True
+        }
+    # No cached feedback and not forced to regenerate - return empty response
+    AI_FEEDBACK_REQUESTS.labels("miss").inc()
+    return {
+        "feedback": None,
+        "career_suggestions": [],
+        "book_recommendations": [],
+        "generated_at": None,
+        "from_cache": False,
+        "message": "キャッシュされたフィードバックがありません。AIへ評価を依頼してください。"
+    }
+
+
+@traced("ai_feedback.prepare_inputs")
+def _prepare_feedback_inputs(
+    db: Session, current_user: User
+) -> Optional[FeedbackInputs]:
     user_competencies, company_averages = CompetencyCalculator.get_competency_results(
         db, user_id=current_user.id
     )
-    
     if not user_competencies:
-        return {"error": "評価結果がありません。まず評価を完了してください。"}
+        return None
+    
+    # The LLM call runs outside the session, so load everything it reads now
+    for row in [*user_competencies, *company_averages]:
+        row.competency_item
+    current_user.name
     
     # Get user's career plan if available
     career_plan = crud.crud_user_career_plan.get_by_user_id(db, user_id=current_user.id)
-    
-    # Generate enhanced AI feedback with career plan consideration
-    feedback = ai_feedback_service.generate_enhanced_competency_feedback(
-        user_competencies, company_averages, career_plan, current_user.name
-    )
+    return user_competencies, company_averages, career_plan
+
+
+@traced("ai_feedback.store")
+def _store_feedback(
+    db: Session,
+    current_user: User,
+    inputs: FeedbackInputs,
+    feedback: Dict[str, str],
+    llm_stats: Optional[LLMCallStats],
+) -> Dict[str, Any]:
+    user_competencies, company_averages, career_plan = inputs
+    if llm_stats is not None:
+        _record_llm_usage(db, current_user, llm_stats)
     
     # Generate career suggestions
     suggestions = ai_feedback_service.generate_career_suggestions(
         user_competencies, 
         getattr(current_user, 'department', None), 
-        getattr(current_user, 'position', None)
+        getattr(current_user, 'position', None),
+        career_plan,
     )
     
     # Generate book recommendations
@@ -138,4 +413,17 @@ def get_ai_feedback(
         "book_recommendations": book_recommendations,
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "from_cache": False
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/feedback/history", response_model=List[schemas.AIFeedbackVersion])
+def get_ai_feedback_history(
+    *,
+    db: Session = Depends(deps.get_read_db),
+    current_user: User = Depends(deps.get_current_active_user_read),
+    limit: int = 20,
+) -> List[schemas.AIFeedbackVersion]:
+    """
+    Get previously generated AI feedback versions, newest first.
+    """
+    return crud.crud_ai_feedback.get_history(db, user_id=current_user.id, limit=limit)
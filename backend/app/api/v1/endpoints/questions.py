@@ -1,72 +1,101 @@
 """Questions API endpoints."""
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, schemas
 from app.api import deps
+from app.core.encoding import (
+    NegotiatedResponse,
+    NegotiatedRoute,
+    msgpack_requested,
+    negotiated_media_type,
+)
+from app.core.http_cache import (
+    PRIVATE_REVALIDATE,
+    catalog_response,
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from app.crud.crud_data_version import answers_key, version_number
 from app.models import User
+from app.services.catalog import catalog
 
-router = APIRouter()
+router = APIRouter(
+    route_class=NegotiatedRoute, default_response_class=NegotiatedResponse
+)
 
 
 @router.get("/", response_model=List[schemas.Question])
-def read_questions(
+async def read_questions(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_active_user),
-) -> List[schemas.Question]:
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(deps.get_current_active_user_async_read),
+) -> Response:
     """
     Retrieve all questions with their competency items.
     """
-    questions = crud.crud_question.get_all_with_competency(db)
-    return questions[skip : skip + limit]
+    snapshot = await catalog.get_async(db)
+    if msgpack_requested():
+        body = snapshot.questions_page_msgpack(skip, limit)
+    else:
+        body = snapshot.questions_page_json(skip, limit)
+    return catalog_response(snapshot.version, body, if_none_match)
 
 
-@router.get("/with-answers", response_model=List[schemas.QuestionWithAnswer])
-def read_questions_with_answers(
+@router.get(
+    "/with-answers",
+    response_model=List[schemas.QuestionWithAnswer],
+    dependencies=[Depends(deps.flush_autosaved_answers)],
+)
+async def read_questions_with_answers(
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
-) -> List[schemas.QuestionWithAnswer]:
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(deps.get_current_active_user_async_read),
+) -> Response:
     """
     Retrieve all questions with user's answers if they exist.
     """
-    questions = crud.crud_question.get_questions_with_user_answers(
-        db, user_id=current_user.id
-    )
-    # Convert to QuestionWithAnswer schema
-    result = []
-    for q in questions:
-        question_dict = {
-            "id": q.id,
-            "text": q.text,
-            "competency_item_id": q.competency_item_id,
-            "order": q.order,
-            "max_score": q.max_score,
-            "created_at": q.created_at,
-            "updated_at": q.updated_at,
-            "competency_item": q.competency_item,
-            "user_answer": getattr(q, "user_answer", None),
-        }
-        result.append(schemas.QuestionWithAnswer(**question_dict))
-    return result
+    snapshot = await catalog.get_async(db)
+    key = answers_key(current_user.id)
+    versions = await crud.async_crud_data_version.get_versions(db, names=[key])
+    etag = make_etag("catalog", snapshot.version, key, version_number(versions, key))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PRIVATE_REVALIDATE)
+
+    scores = await crud.async_crud_answer.get_user_scores(db, user_id=current_user.id)
+    if msgpack_requested():
+        body = snapshot.questions_with_answers_msgpack(scores)
+    else:
+        body = snapshot.questions_with_answers_json(scores)
+    response = Response(body, media_type=negotiated_media_type())
+    set_cache_headers(response, etag, PRIVATE_REVALIDATE)
+    return response
 
 
 @router.get("/{question_id}", response_model=schemas.Question)
-def read_question(
+async def read_question(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_read_db),
     question_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
-) -> schemas.Question:
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(deps.get_current_active_user_async_read),
+) -> Response:
     """
     Get question by ID.
     """
-    question = crud.crud_question.get(db=db, id=question_id)
-    if not question:
+    snapshot = await catalog.get_async(db)
+    if msgpack_requested():
+        question = snapshot.question_msgpack.get(question_id)
+    else:
+        question = snapshot.question_json.get(question_id)
+    if question is None:
         raise HTTPException(status_code=404, detail="Question not found")
-    return question
\ No newline at end of file
+    return catalog_response(snapshot.version, question, if_none_match)
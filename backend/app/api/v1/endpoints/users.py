@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.crud.crud_data_version import COMPANY_COMPETENCIES
 
 router = APIRouter()
 
@@ -58,7 +59,9 @@ def update_user_me(
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Update own user."""
-    current_user_data = schemas.UserUpdate(**current_user.__dict__)
+    current_user_data = schemas.UserUpdate.model_validate(
+        current_user, from_attributes=True
+    )
     if password is not None:
         current_user_data.password = password
     if name is not None:
@@ -107,4 +110,6 @@ def delete_user_for_testing(
             detail="The user with this email does not exist in the system.",
         )
     crud.crud_user.remove(db, id=user.id)
+    # The user's competency scores no longer count towards the averages
+    crud.crud_data_version.bump(db, name=COMPANY_COMPETENCIES)
     return None
\ No newline at end of file
@@ -16,10 +16,49 @@ class Settings(BaseSettings):
     # Security
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 8
+
+    # Authenticated user cache. Invalidation is per process, so with several
+    # workers the TTL bounds how long a stale principal can be served.
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: int = 60
+    # Trust the is_active/is_superuser claims signed into recently issued
+    # tokens instead of looking the user up. Deactivation and privilege
+    # changes are enforced through the revocation list.
+    AUTH_TRUST_TOKEN_CLAIMS: bool = True
+    AUTH_CLAIMS_MAX_AGE_SECONDS: int = 15 * 60
+
+    # Revoked access tokens are mirrored into a per-process Bloom filter that
+    # is resynced from the database every REVOCATION_SYNC_SECONDS.
+    REVOCATION_SYNC_SECONDS: int = 30
+    REVOCATION_FILTER_CAPACITY: int = 10000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+
+    # Password hashing. Stored hashes are upgraded on login when the cost
+    # changes. Workers run bcrypt in separate processes (0 runs it inline);
+    # calls beyond workers + max pending are rejected with a 503.
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 8
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10.0
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
 
     # Database
     DATABASE_URL: str
+    # Per engine and per worker process; see db_pool_* in /metrics
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Defaults to DATABASE_URL with the matching async driver
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Optional read replica for read-only endpoints. Users who just wrote
+    # are pinned to the primary for READ_YOUR_WRITES_SECONDS so they see
+    # their own changes despite replication lag.
+    DATABASE_REPLICA_URL: Optional[str] = None
+    ASYNC_DATABASE_REPLICA_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: int = 5
+    READ_YOUR_WRITES_MAX_USERS: int = 10000
 
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -38,6 +77,80 @@ class Settings(BaseSettings):
 
     # OpenAI
     OPENAI_API_KEY: Optional[str] = None
+    AI_FEEDBACK_MODEL: str = "gpt-4"
+    AI_FEEDBACK_MAX_INPUT_TOKENS: int = 2000
+    AI_FEEDBACK_MAX_OUTPUT_TOKENS: int = 2500
+    # Provider prices used for the usage ledger (USD per 1K tokens)
+    LLM_INPUT_COST_PER_1K_TOKENS: float = 0.03
+    LLM_OUTPUT_COST_PER_1K_TOKENS: float = 0.06
+
+    # A statement repeated this many times in one request is reported as a
+    # possible N+1 query
+    QUERY_REPEAT_WARNING_THRESHOLD: int = 5
+
+    # Statements slower than the threshold are sampled into a rotating JSON
+    # lines log together with their EXPLAIN output. None disables timing.
+    SLOW_QUERY_THRESHOLD_MS: Optional[float] = 200.0
+    SLOW_QUERY_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_LOG_PATH: str = "logs/slow_queries.jsonl"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUP_COUNT: int = 5
+
+    # Request tracing. A sampled share of requests is traced end to end
+    # (middleware, sessions, CRUD, calculator, LLM calls, SQL statements).
+    # TRACE_EXPORTERS is a comma separated list of "jsonl" (rotating file at
+    # TRACE_LOG_PATH) and "otlp" (OTLP/HTTP JSON posted to
+    # TRACE_OTLP_ENDPOINT, e.g. http://localhost:4318/v1/traces).
+    TRACE_SAMPLE_RATE: float = 0.01
+    TRACE_EXPORTERS: str = "jsonl"
+    TRACE_LOG_PATH: str = "logs/traces.jsonl"
+    TRACE_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    TRACE_LOG_BACKUP_COUNT: int = 5
+    TRACE_OTLP_ENDPOINT: Optional[str] = None
+    TRACE_SERVICE_NAME: str = "competency-api"
+
+    # Sampling profiler. A share of requests, or requests from an active
+    # superuser that carry PROFILE_HEADER, are profiled with pyinstrument.
+    # Folded stacks are written per route under PROFILE_DIR and the hottest
+    # functions are listed at /admin/profiles.
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_HEADER: str = "X-Profile"
+    PROFILE_INTERVAL_SECONDS: float = 0.001
+    PROFILE_DIR: str = "logs/profiles"
+    PROFILE_MAX_FILES_PER_ROUTE: int = 50
+
+    # Seconds the set of valid question ids is cached for answer validation
+    QUESTION_IDS_CACHE_TTL_SECONDS: int = 300
+
+    # Seconds between checks of the catalog version by the in-memory catalog.
+    # Changes from other processes are picked up within this window.
+    CATALOG_VERSION_CHECK_SECONDS: float = 5.0
+
+    # Seconds clients may reuse catalog responses before revalidating them
+    # with their ETag. Per-user responses are always revalidated.
+    CATALOG_CACHE_MAX_AGE_SECONDS: int = 60
+
+    # Autosaved answers (PATCH /answers/{question_id}) are buffered in memory
+    # and written every ANSWER_AUTOSAVE_FLUSH_SECONDS, or sooner once
+    # ANSWER_AUTOSAVE_MAX_PENDING answers are waiting. A crash can lose
+    # autosaves from the last interval; submitting answers writes them.
+    ANSWER_AUTOSAVE_FLUSH_SECONDS: float = 2.0
+    ANSWER_AUTOSAVE_MAX_PENDING: int = 5000
+
+    # Hours a response is kept for replay to requests repeating its
+    # Idempotency-Key (POST /answers, forced feedback regeneration)
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    # Seconds after which a key still without a response is assumed to
+    # belong to a crashed request and may be claimed again. Keep it above
+    # the LLM client's request timeout (600 seconds by default).
+    IDEMPOTENCY_KEY_ABANDON_SECONDS: int = 900
+    # Expired keys are deleted by each process at most every
+    # IDEMPOTENCY_KEY_PRUNE_SECONDS, up to IDEMPOTENCY_KEY_PRUNE_BATCH at a time
+    IDEMPOTENCY_KEY_PRUNE_SECONDS: float = 60.0
+    IDEMPOTENCY_KEY_PRUNE_BATCH: int = 1000
+
+    # Recommendations (defaults to the catalog bundled in app/data)
+    RECOMMENDATION_CATALOG_PATH: Optional[str] = None
 
     # Application
     DEBUG: bool = False
@@ -1,19 +1,129 @@
 """Database configuration and session management."""
+import time
+from typing import Any, Dict
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKOUT_SECONDS
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout takes."""
+
+    def connect(self):
+        """Check out a connection, timing the wait for a free one."""
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(self.logging_name).observe(
+                time.perf_counter() - started_at
+            )
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Async-adapted variant of InstrumentedQueuePool."""
+
+
+def pool_options(name: str, async_driver: bool = False) -> Dict[str, Any]:
+    """Return the configured pool arguments for an engine."""
+    pool_class = InstrumentedAsyncQueuePool if async_driver else InstrumentedQueuePool
+    return {
+        "poolclass": pool_class,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+
 
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    **pool_options("primary"),
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only endpoints use the replica when one is configured
+replica_engine = (
+    create_engine(
+        settings.DATABASE_REPLICA_URL,
+        pool_pre_ping=True,
+        **pool_options("replica"),
+    )
+    if settings.DATABASE_REPLICA_URL
+    else engine
+)
+
+ReplicaSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=replica_engine
+)
+
+# Async drivers matching the sync ones, so one DATABASE_URL configures both
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def make_async_url(url: str) -> str:
+    """Return the async-driver equivalent of a sync database URL."""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def make_async_engine(url: str, name: str) -> AsyncEngine:
+    """Create an async engine with the same pool settings as the sync one."""
+    return create_async_engine(
+        url,
+        pool_pre_ping=True,
+        # aiosqlite (used in tests) runs without a connection pool
+        **(
+            {}
+            if make_url(url).get_backend_name() == "sqlite"
+            else pool_options(name, async_driver=True)
+        ),
+    )
+
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or make_async_url(
+    settings.DATABASE_URL
+)
+
+async_engine = make_async_engine(ASYNC_DATABASE_URL, "async_primary")
+
+async_replica_engine = (
+    make_async_engine(
+        settings.ASYNC_DATABASE_REPLICA_URL
+        or make_async_url(settings.DATABASE_REPLICA_URL),
+        "async_replica",
+    )
+    if settings.DATABASE_REPLICA_URL
+    else async_engine
+)
+
+# Objects stay loaded after commit: lazy loads outside run_sync are not
+# possible on an async session.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+AsyncReplicaSessionLocal = async_sessionmaker(
+    async_replica_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -23,4 +133,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
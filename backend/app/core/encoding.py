@@ -0,0 +1,104 @@
+"""Response encoding negotiation between JSON and MessagePack."""
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Dict, Mapping, Optional
+
+import msgpack
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import Response
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# Whether the request being handled asked for MessagePack
+_msgpack_requested: ContextVar[bool] = ContextVar("msgpack_requested", default=False)
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    """
+    Check whether an Accept header prefers MessagePack to JSON.
+
+    MessagePack must be listed explicitly with a q-value at least that of
+    application/json; wildcards alone keep the JSON default.
+    """
+    if not accept:
+        return False
+    quality: Dict[str, float] = {}
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        quality[media_type.strip().lower()] = q
+    msgpack_q = max(quality.get(media_type, 0.0) for media_type in _MSGPACK_TYPES)
+    return msgpack_q > 0 and msgpack_q >= quality.get(JSON_MEDIA_TYPE, 0.0)
+
+
+def msgpack_requested() -> bool:
+    """Whether the current request negotiated MessagePack."""
+    return _msgpack_requested.get()
+
+
+def negotiated_media_type() -> str:
+    """Media type the current request's response is encoded with."""
+    return MSGPACK_MEDIA_TYPE if msgpack_requested() else JSON_MEDIA_TYPE
+
+
+def packb(content: Any) -> bytes:
+    """Encode JSON-compatible data as MessagePack."""
+    return msgpack.packb(content, use_bin_type=True)
+
+
+class NegotiatedResponse(JSONResponse):
+    """JSON response that is rendered as MessagePack when it was negotiated."""
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        """Pick the encoding before the body is rendered."""
+        if media_type is None and msgpack_requested():
+            media_type = MSGPACK_MEDIA_TYPE
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        """Render content in the negotiated encoding."""
+        if self.media_type == MSGPACK_MEDIA_TYPE:
+            return packb(content)
+        return super().render(content)
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    Route that records the request's encoding preference.
+
+    Use with NegotiatedResponse as the router's default response class;
+    endpoints that build their own Response check msgpack_requested().
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """Wrap the handler so the preference is visible while it runs."""
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            token = _msgpack_requested.set(
+                accepts_msgpack(request.headers.get("accept"))
+            )
+            try:
+                return await handler(request)
+            finally:
+                _msgpack_requested.reset(token)
+
+        return negotiated_handler
@@ -0,0 +1,79 @@
+"""Entity tags and cache headers for conditional GET requests."""
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+
+from app.core.config import settings
+from app.core.encoding import negotiated_media_type
+
+# Per-user data: clients keep a copy but revalidate it on every use
+PRIVATE_REVALIDATE = "private, no-cache"
+NO_STORE = "no-store"
+# Responses depend on who is asking and on the negotiated encoding
+VARY = "Authorization, Accept"
+
+
+def catalog_cache_control() -> str:
+    """Cache-Control for responses that only change with the catalog."""
+    return f"private, max-age={settings.CATALOG_CACHE_MAX_AGE_SECONDS}"
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Build a strong entity tag from the versions a response is derived from.
+
+    The application version and the negotiated media type are included, so
+    neither a deploy that changes the encoding nor a switch between JSON
+    and MessagePack revalidates a cached response.
+    """
+    prefix = (settings.VERSION, negotiated_media_type())
+    raw = "|".join(str(part) for part in (*prefix, *parts))
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an entity tag.
+
+    If-None-Match uses the weak comparison, so a W/ prefix is ignored.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def set_cache_headers(
+    response: Response, etag: str, cache_control: str, vary: str = VARY
+) -> None:
+    """Attach the entity tag and caching policy to a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = vary
+
+
+def catalog_response(
+    version: int, body: bytes, if_none_match: Optional[str]
+) -> Response:
+    """Serve catalog data in the negotiated encoding, or 304 if it is current."""
+    etag = make_etag("catalog", version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, catalog_cache_control())
+    response = Response(body, media_type=negotiated_media_type())
+    set_cache_headers(response, etag, catalog_cache_control())
+    return response
+
+
+def not_modified(etag: str, cache_control: str, vary: str = VARY) -> Response:
+    """Build a 304 response for a client whose copy is still current."""
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, cache_control, vary)
+    return response
@@ -0,0 +1,135 @@
+"""Prometheus metrics."""
+from typing import Dict, Iterator, List, Tuple
+
+import anyio.to_thread
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import REGISTRY, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy.pool import Pool
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled."
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements issued per HTTP request.",
+    ["route"],
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to check a connection out of the pool, including waiting for one.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_duration_seconds",
+    "LLM provider call latency by model and outcome.",
+    ["model", "outcome"],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 45, 60, 120),
+)
+AI_FEEDBACK_REQUESTS = Counter(
+    "ai_feedback_requests",
+    "AI feedback requests by cache result "
+    "(hit, miss, not_modified, regenerate or replayed).",
+    ["result"],
+)
+
+
+def _named_pools() -> List[Tuple[str, Pool]]:
+    # Imported here: database imports this module for the checkout histogram
+    from app.core import database
+
+    engines = [
+        ("primary", database.engine),
+        ("replica", database.replica_engine),
+        ("async_primary", database.async_engine.sync_engine),
+        ("async_replica", database.async_replica_engine.sync_engine),
+    ]
+    pools: List[Tuple[str, Pool]] = []
+    for name, engine in engines:
+        # Without a replica the replica engines are the primary ones
+        if all(engine.pool is not pool for _, pool in pools):
+            pools.append((name, engine.pool))
+    return pools
+
+
+class DatabasePoolCollector(Collector):
+    """Connection pool occupancy, read when scraped."""
+
+    def describe(self) -> Iterator[GaugeMetricFamily]:
+        """Describe the metrics without touching the engines at import time."""
+        yield from self._families().values()
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        """Yield size, checked out, overflow and idle counts per pool."""
+        families = self._families()
+        for name, pool in _named_pools():
+            if not hasattr(pool, "checkedout"):
+                continue  # NullPool and StaticPool keep no statistics
+            families["size"].add_metric([name], pool.size())
+            families["checked_out"].add_metric([name], pool.checkedout())
+            families["overflow"].add_metric([name], max(pool.overflow(), 0))
+            families["checked_in"].add_metric([name], pool.checkedin())
+        yield from families.values()
+
+    @staticmethod
+    def _families() -> Dict[str, GaugeMetricFamily]:
+        return {
+            "size": GaugeMetricFamily(
+                "db_pool_size", "Configured pool size.", labels=["pool"]
+            ),
+            "checked_out": GaugeMetricFamily(
+                "db_pool_checked_out", "Connections in use.", labels=["pool"]
+            ),
+            "overflow": GaugeMetricFamily(
+                "db_pool_overflow",
+                "Connections open beyond the pool size.",
+                labels=["pool"],
+            ),
+            "checked_in": GaugeMetricFamily(
+                "db_pool_checked_in", "Idle connections in the pool.", labels=["pool"]
+            ),
+        }
+
+
+class ThreadpoolCollector(Collector):
+    """Saturation of the threadpool that runs sync endpoints."""
+
+    def describe(self) -> Iterator[GaugeMetricFamily]:
+        """Describe the metrics; collect() only yields them inside the loop."""
+        for name in ("busy", "limit"):
+            yield GaugeMetricFamily(f"threadpool_threads_{name}", "")
+        yield GaugeMetricFamily("threadpool_tasks_waiting", "")
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        """Yield busy, limit and waiting counts; needs the event loop."""
+        try:
+            limiter = anyio.to_thread.current_default_thread_limiter()
+        except Exception:
+            return  # Scraped outside the event loop
+        statistics = limiter.statistics()
+        yield GaugeMetricFamily(
+            "threadpool_threads_busy",
+            "Worker threads running sync endpoints and dependencies.",
+            value=statistics.borrowed_tokens,
+        )
+        yield GaugeMetricFamily(
+            "threadpool_threads_limit",
+            "Maximum worker threads.",
+            value=statistics.total_tokens,
+        )
+        yield GaugeMetricFamily(
+            "threadpool_tasks_waiting",
+            "Calls queued for a free worker thread.",
+            value=statistics.tasks_waiting,
+        )
+
+
+REGISTRY.register(DatabasePoolCollector())
+REGISTRY.register(ThreadpoolCollector())
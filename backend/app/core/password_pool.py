@@ -0,0 +1,112 @@
+"""Dedicated process pool for bcrypt hashing and verification."""
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from typing import Any, Callable, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the password pool is already at its admission limit."""
+
+
+@lru_cache(maxsize=4)
+def get_crypt_context(rounds: int) -> CryptContext:
+    """Return the bcrypt context for a cost factor."""
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def _hash(password: str, rounds: int) -> str:
+    return get_crypt_context(rounds).hash(password)
+
+
+def _verify(password: str, hashed_password: str, rounds: int) -> bool:
+    return get_crypt_context(rounds).verify(password, hashed_password)
+
+
+def _verify_and_update(
+    password: str, hashed_password: str, rounds: int
+) -> Tuple[bool, Optional[str]]:
+    return get_crypt_context(rounds).verify_and_update(password, hashed_password)
+
+
+class PasswordHasherPool:
+    """
+    Runs bcrypt in worker processes so it neither holds the GIL nor ties up
+    the request threadpool for longer than a handful of in-flight calls.
+
+    At most workers + max_pending calls are admitted at once; anything
+    beyond that fails immediately with PasswordPoolBusy. With zero workers
+    calls run inline in the caller's thread.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        """Configure the pool; worker processes start on first use."""
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolBusy("Password hashing is at capacity")
+        if self.workers <= 0:
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+        try:
+            future: Future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the worker finishes, even if we time out
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordPoolBusy("Password hashing timed out")
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured cost."""
+        return self._run(_hash, password, settings.BCRYPT_ROUNDS)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash."""
+        return self._run(_verify, password, hashed_password, settings.BCRYPT_ROUNDS)
+
+    def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify a password and return a new hash if its cost is outdated."""
+        return self._run(
+            _verify_and_update, password, hashed_password, settings.BCRYPT_ROUNDS
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+password_pool = PasswordHasherPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,206 @@
+"""Opt-in sampling profiler for individual requests."""
+import os
+import random
+import re
+import secrets
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from jose import JWTError, jwt
+from pyinstrument import Profiler
+from pyinstrument.frame import AWAIT_FRAME_IDENTIFIER, SELF_TIME_FRAME_IDENTIFIER, Frame
+from pyinstrument.session import Session
+
+from app.core.config import settings
+from app.core.revocation import revocation_list
+
+
+def frame_label(frame: Frame) -> str:
+    """Name a frame as function (file:line)."""
+    if frame.is_synthetic:
+        return frame.identifier
+    return f"{frame.function} ({frame.file_path_short}:{frame.line_no})"
+
+
+def folded_stacks(root: Optional[Frame]) -> Dict[str, float]:
+    """
+    Collapse a frame tree into stack -> seconds.
+
+    Self time stays on the calling stack; time spent awaiting (including
+    sync endpoints running on the threadpool) ends in an [await] frame.
+    """
+    stacks: Dict[str, float] = Counter()
+
+    def walk(frame: Frame, prefix: str) -> None:
+        if frame.identifier == SELF_TIME_FRAME_IDENTIFIER:
+            stacks[prefix] += frame.time
+            return
+        stack = f"{prefix};{frame_label(frame)}" if prefix else frame_label(frame)
+        if not frame.children:
+            stacks[stack] += frame.time
+        for child in frame.children:
+            walk(child, stack)
+
+    if root is not None:
+        walk(root, "")
+    return stacks
+
+
+def self_times(root: Optional[Frame]) -> Dict[str, float]:
+    """Return the time each function spent running its own code."""
+    times: Dict[str, float] = Counter()
+
+    def walk(frame: Frame) -> None:
+        for child in frame.children:
+            if child.identifier == SELF_TIME_FRAME_IDENTIFIER:
+                times[frame_label(frame)] += child.time
+            elif child.identifier != AWAIT_FRAME_IDENTIFIER:
+                walk(child)
+        if not frame.children and not frame.is_synthetic:
+            times[frame_label(frame)] += frame.time
+
+    if root is not None:
+        walk(root)
+    return times
+
+
+@dataclass
+class RouteProfileTotals:
+    """Profiles aggregated for one route."""
+
+    profiles: int = 0
+    seconds: float = 0.0
+    self_times: Dict[str, float] = field(default_factory=Counter)
+
+
+class RequestProfiler:
+    """
+    Profiles a sample of requests with pyinstrument.
+
+    At most one request per process is profiled at a time; requests that
+    would overlap are served unprofiled. Each profile is written as folded
+    stacks (flamegraph.pl, speedscope) under output_dir/<route>/ and added
+    to per-route self-time totals.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        interval: float,
+        output_dir: str,
+        max_files_per_route: int,
+    ):
+        """Configure sampling and output; nothing runs until a request."""
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.output_dir = output_dir
+        self.max_files_per_route = max_files_per_route
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+        self._routes: Dict[str, RouteProfileTotals] = {}
+
+    def start(self, requested: bool) -> Optional[Profiler]:
+        """Start profiling when requested or sampled and no profile is running."""
+        if not requested and random.random() >= self.sample_rate:
+            return None
+        if not self._active.acquire(blocking=False):
+            return None
+        try:
+            profiler = Profiler(interval=self.interval, async_mode="enabled")
+            profiler.start()
+        except Exception:
+            self._active.release()
+            raise
+        return profiler
+
+    def stop(self, profiler: Profiler) -> Session:
+        """Stop a profile started by start()."""
+        try:
+            return profiler.stop()
+        finally:
+            self._active.release()
+
+    def record(self, route: str, session: Session) -> str:
+        """Aggregate a finished profile and write its folded stacks."""
+        root = session.root_frame()
+        with self._lock:
+            totals = self._routes.setdefault(route, RouteProfileTotals())
+            totals.profiles += 1
+            totals.seconds += session.duration
+            totals.self_times.update(self_times(root))
+        return self._write(route, folded_stacks(root))
+
+    def hot_functions(
+        self, limit: int
+    ) -> Dict[str, Tuple[RouteProfileTotals, List[Tuple[str, float]]]]:
+        """Return each route's totals with its top functions by self time."""
+        with self._lock:
+            return {
+                route: (
+                    RouteProfileTotals(totals.profiles, totals.seconds),
+                    Counter(totals.self_times).most_common(limit),
+                )
+                for route, totals in self._routes.items()
+            }
+
+    def reset(self) -> None:
+        """Forget the aggregated profiles."""
+        with self._lock:
+            self._routes.clear()
+
+    def _write(self, route: str, stacks: Dict[str, float]) -> str:
+        directory = os.path.join(self.output_dir, _route_directory(route))
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(directory, f"{timestamp}-{secrets.token_hex(3)}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, seconds in stacks.items():
+                samples = round(seconds * 1_000_000)
+                if samples:
+                    f.write(f"{stack} {samples}\n")
+        # Oldest first by timestamped name; keep the newest profiles only
+        for name in sorted(os.listdir(directory))[: -self.max_files_per_route]:
+            os.remove(os.path.join(directory, name))
+        return path
+
+
+def _route_directory(route: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+
+
+def is_profiling_requested(headers: Mapping[str, str]) -> bool:
+    """
+    Return True when the profiling header comes with an admin's token.
+
+    Checked from the signed claims alone so unprofiled requests never touch
+    the database; a token that may be revoked is refused.
+    """
+    if not headers.get(settings.PROFILE_HEADER):
+        return False
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+        user_id = int(payload["sub"])
+    except (JWTError, KeyError, ValueError):
+        return False
+    claims = payload.get("usr") or {}
+    return (
+        bool(claims.get("is_active"))
+        and bool(claims.get("is_superuser"))
+        and not revocation_list.might_be_revoked(payload.get("jti"), user_id)
+    )
+
+
+request_profiler = RequestProfiler(
+    sample_rate=settings.PROFILE_SAMPLE_RATE,
+    interval=settings.PROFILE_INTERVAL_SECONDS,
+    output_dir=settings.PROFILE_DIR,
+    max_files_per_route=settings.PROFILE_MAX_FILES_PER_ROUTE,
+)
@@ -0,0 +1,120 @@
+"""Per-request SQL statement counting and N+1 detection."""
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while tracking was active."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Return statements executed at least threshold times, most first."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Count the statements executed in the current context.
+
+    The stats object is shared with threads and tasks started from this
+    context, so statements from sync endpoints in the threadpool and from
+    AsyncSession.run_sync are included.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        context._query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    started_at = getattr(context, "_query_started_at", None)
+    if stats is None or started_at is None:
+        return
+    stats.count += 1
+    stats.duration += time.perf_counter() - started_at
+    stats.statements[statement] += 1
+
+
+@dataclass
+class RouteQueryTotals:
+    """Aggregated statement counts of one route."""
+
+    requests: int = 0
+    queries: int = 0
+    max_queries: int = 0
+    db_seconds: float = 0.0
+    n_plus_one_requests: int = 0
+
+
+class QueryMetrics:
+    """Process-wide statement totals per route."""
+
+    def __init__(self):
+        """Start with no recorded requests."""
+        self._routes: Dict[str, RouteQueryTotals] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, stats: QueryStats, n_plus_one: bool) -> None:
+        """Add one request's stats to its route."""
+        with self._lock:
+            totals = self._routes.setdefault(route, RouteQueryTotals())
+            totals.requests += 1
+            totals.queries += stats.count
+            totals.max_queries = max(totals.max_queries, stats.count)
+            totals.db_seconds += stats.duration
+            totals.n_plus_one_requests += n_plus_one
+
+    def snapshot(self) -> Dict[str, RouteQueryTotals]:
+        """Return a copy of the totals keyed by route."""
+        with self._lock:
+            return {
+                route: RouteQueryTotals(**vars(totals))
+                for route, totals in self._routes.items()
+            }
+
+    def reset(self) -> None:
+        """Forget all recorded requests."""
+        with self._lock:
+            self._routes.clear()
+
+
+query_metrics = QueryMetrics()
+
+
+def report_request(route: str, stats: QueryStats) -> None:
+    """Record a finished request and warn about repeated statements."""
+    repeated = stats.repeated(settings.QUERY_REPEAT_WARNING_THRESHOLD)
+    for statement, count in repeated:
+        print(
+            f"Possible N+1 in {route}: statement ran {count} times: "
+            f"{' '.join(statement.split())[:200]}"
+        )
+    query_metrics.record(route, stats, n_plus_one=bool(repeated))
@@ -0,0 +1,52 @@
+"""Read-your-writes guard for routing reads to the replica."""
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.cache import LRUTTLCache
+from app.core.config import settings
+
+_SESSION_USER = "read_routing_user_id"
+_SESSION_WROTE = "read_routing_wrote"
+
+# Users who committed a write recently. Per process, like the user cache:
+# with several workers a follow-up read may land on a worker that missed the
+# write, which is why the window should exceed the usual replication lag.
+recent_writers: LRUTTLCache[bool] = LRUTTLCache(
+    max_size=settings.READ_YOUR_WRITES_MAX_USERS,
+    ttl_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+def bind_session_user(db: Session, user_id: int) -> None:
+    """Attribute writes committed by this session to a user."""
+    db.info[_SESSION_USER] = user_id
+
+
+def is_pinned_to_primary(user_id: int) -> bool:
+    """Return True if the user wrote within the read-your-writes window."""
+    return recent_writers.get(user_id) is not None
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session: Session, flush_context) -> None:
+    session.info[_SESSION_WROTE] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_dml(state: ORMExecuteState) -> None:
+    # Bulk statements such as the answer upsert bypass the flush
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_SESSION_WROTE] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_writer(session: Session) -> None:
+    wrote = session.info.pop(_SESSION_WROTE, False)
+    user_id = session.info.get(_SESSION_USER)
+    if wrote and user_id is not None:
+        recent_writers.set(user_id, True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_writes(session: Session) -> None:
+    session.info.pop(_SESSION_WROTE, None)
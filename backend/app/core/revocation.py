@@ -0,0 +1,112 @@
+"""In-memory Bloom filter of revoked access tokens."""
+import hashlib
+import math
+import threading
+import time
+from typing import Iterable, Iterator, Optional
+
+from app.core.config import settings
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys.
+
+    Membership tests never give false negatives; false positives occur at
+    roughly error_rate while at most capacity keys are stored.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """Size the bit array and hash count for capacity and error rate."""
+        capacity = max(capacity, 1)
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterator[int]:
+        # Double hashing: two 64-bit halves of one digest give k positions
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        """Add a key."""
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key)
+        )
+
+
+def jti_key(jti: str) -> str:
+    """Filter key of a single revoked access token."""
+    return f"jti:{jti}"
+
+
+def user_key(user_id: int) -> str:
+    """Filter key of a user whose earlier tokens were all revoked."""
+    return f"user:{user_id}"
+
+
+class RevocationList:
+    """
+    Process-local view of the token_revocations table.
+
+    The filter is rebuilt from the table every sync interval and updated
+    immediately for revocations made by this process. A hit only means the
+    token may be revoked; callers confirm against the database.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, sync_seconds: float):
+        """Create an empty list that needs a sync before first use."""
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self._filter = BloomFilter(capacity, error_rate)
+        self._synced_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def needs_sync(self) -> bool:
+        """Return True when the filter is older than the sync interval."""
+        synced_at = self._synced_at
+        return synced_at is None or time.monotonic() - synced_at >= self.sync_seconds
+
+    def replace(self, keys: Iterable[str]) -> None:
+        """Rebuild the filter from the full set of revoked keys."""
+        keys = list(keys)
+        # Grow past the configured capacity rather than degrade the error rate
+        bloom = BloomFilter(max(self.capacity, 2 * len(keys)), self.error_rate)
+        for key in keys:
+            bloom.add(key)
+        with self._lock:
+            self._filter = bloom
+            self._synced_at = time.monotonic()
+
+    def add(self, key: str) -> None:
+        """Record a revocation made by this process."""
+        with self._lock:
+            self._filter.add(key)
+
+    def might_be_revoked(self, jti: Optional[str], user_id: int) -> bool:
+        """Return True if the token or its user may have been revoked."""
+        bloom = self._filter
+        return user_key(user_id) in bloom or (jti is not None and jti_key(jti) in bloom)
+
+    def reset(self) -> None:
+        """Forget every key and force a sync on next use."""
+        with self._lock:
+            self._filter = BloomFilter(self.capacity, self.error_rate)
+            self._synced_at = None
+
+
+revocation_list = RevocationList(
+    capacity=settings.REVOCATION_FILTER_CAPACITY,
+    error_rate=settings.REVOCATION_FILTER_ERROR_RATE,
+    sync_seconds=settings.REVOCATION_SYNC_SECONDS,
+)
@@ -1,37 +1,70 @@
 """Security utilities for authentication and authorization."""
+import hashlib
+import secrets
+import uuid
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 from jose import jwt
-from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.password_pool import get_crypt_context, password_pool
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = get_crypt_context(settings.BCRYPT_ROUNDS)
+
+EPOCH = datetime(1970, 1, 1)
 
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: Optional[timedelta] = None
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[Dict[str, Any]] = None,
 ) -> str:
-    """Create JWT access token."""
+    """Create JWT access token, optionally carrying extra signed claims."""
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(
+        expire = now + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {
+        "exp": expire,
+        # Sub-second, so a login right after revoke_user isn't revoked too
+        "iat": (now - EPOCH).total_seconds(),
+        "sub": str(subject),
+        "jti": uuid.uuid4().hex,
+    }
+    if claims:
+        to_encode["usr"] = claims
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
     return encoded_jwt
 
 
+def create_refresh_token() -> str:
+    """Generate an opaque refresh token."""
+    return secrets.token_urlsafe(32)
+
+
+def hash_token(token: str) -> str:
+    """Digest a refresh token for storage and lookup."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_pool.verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password, returning a new hash if the stored one is outdated."""
+    return password_pool.verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return password_pool.hash(password)
@@ -0,0 +1,214 @@
+"""Sampled log of slow SQL statements with their query plans."""
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CORE_DIR = os.path.join(_APP_DIR, "core")
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Describe bound parameters by type only, so no user data is logged."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            # executemany: one shape per batch is enough
+            return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def call_site() -> Optional[str]:
+    """Return the innermost application frame outside app/core."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and not filename.startswith(_CORE_DIR):
+            relative = os.path.relpath(filename, os.path.dirname(_APP_DIR))
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    """
+    Writes slow statements to a rotating JSON lines file.
+
+    Every statement is timed, but only a sample of the slow ones is
+    captured. EXPLAIN and file writes happen on a background thread with a
+    bounded queue; entries are dropped rather than slowing requests down.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: Optional[float],
+        sample_rate: float,
+        path: str,
+        max_bytes: int,
+        backup_count: int,
+        queue_size: int = 100,
+    ):
+        """Configure the log; the writer thread starts on first use."""
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(
+            maxsize=queue_size
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._logger: Optional[logging.Logger] = None
+        self._lock = threading.Lock()
+
+    def should_capture(self, duration_ms: float) -> bool:
+        """Return True for a sampled statement slower than the threshold."""
+        return (
+            self.threshold_ms is not None
+            and duration_ms >= self.threshold_ms
+            and random.random() < self.sample_rate
+        )
+
+    def capture(
+        self,
+        engine: Engine,
+        statement: str,
+        parameters: Any,
+        duration_ms: float,
+    ) -> None:
+        """Queue a slow statement for EXPLAIN and logging."""
+        self._start()
+        entry = {
+            "logged_at": datetime.utcnow().isoformat() + "Z",
+            "duration_ms": round(duration_ms, 1),
+            "statement": " ".join(statement.split()),
+            "parameters": parameter_shape(parameters),
+            "call_site": call_site(),
+            "_engine": engine,
+            "_statement": statement,
+            "_parameters": parameters,
+        }
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until queued entries have been written."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def shutdown(self) -> None:
+        """Write queued entries and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout=5)
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="slow-query-log", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            entry = self._queue.get()
+            try:
+                if entry is None:
+                    return
+                self._write(entry)
+            except Exception as e:
+                print(f"Failed to write slow query log entry: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        engine = entry.pop("_engine")
+        statement = entry.pop("_statement")
+        parameters = entry.pop("_parameters")
+        entry["explain"] = explain(engine, statement, parameters)
+        self._get_logger().info(json.dumps(entry, default=str, ensure_ascii=False))
+
+    def _get_logger(self) -> logging.Logger:
+        if self._logger is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(
+                self.path,
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                encoding="utf-8",
+            )
+            logger = logging.getLogger("app.slow_queries")
+            logger.handlers = [handler]
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            self._logger = logger
+        return self._logger
+
+
+def explain(engine: Engine, statement: str, parameters: Any) -> List[Any]:
+    """Return the query plan rows of a statement, or the error explaining it."""
+    if engine.dialect.is_async:
+        # Async engines need an event loop; plan on the sync equivalent
+        from app.core.database import engine as sync_engine
+
+        engine = sync_engine
+    prefix = "EXPLAIN QUERY PLAN" if engine.dialect.name == "sqlite" else "EXPLAIN"
+    if isinstance(parameters, list):
+        parameters = parameters[0] if parameters else ()
+    try:
+        with engine.connect() as conn:
+            result = conn.exec_driver_sql(f"{prefix} {statement}", parameters)
+            return [dict(row._mapping) for row in result]
+    except Exception as e:
+        return [{"error": str(e)}]
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    sample_rate=settings.SLOW_QUERY_SAMPLE_RATE,
+    path=settings.SLOW_QUERY_LOG_PATH,
+    max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+    backup_count=settings.SLOW_QUERY_LOG_BACKUP_COUNT,
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    if slow_query_log.threshold_ms is not None:
+        context._slow_query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _check_duration(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = getattr(context, "_slow_query_started_at", None)
+    # Plans fetched by the writer thread must not be logged themselves
+    if started_at is None or statement.startswith("EXPLAIN"):
+        return
+    duration_ms = (time.perf_counter() - started_at) * 1000
+    if slow_query_log.should_capture(duration_ms):
+        slow_query_log.capture(conn.engine, statement, parameters, duration_ms)
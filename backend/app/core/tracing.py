@@ -0,0 +1,425 @@
+"""Sampled request tracing with nested spans and pluggable exporters."""
+import json
+import logging
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    sampled = True
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """Span duration, once it has ended."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the JSON lines exporter."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stands in for a span when the request is not sampled."""
+
+    name = ""
+    sampled = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Discard the attribute."""
+
+
+NOOP_SPAN = _NoopSpan()
+AnySpan = Union[Span, _NoopSpan]
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Return the active span, or None outside a sampled trace."""
+    return _current_span.get()
+
+
+class JsonLinesExporter:
+    """Writes one JSON object per span to a rotating file."""
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        """Configure the file; it is created on first export."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._logger: Optional[logging.Logger] = None
+
+    def export(self, spans: List[Span]) -> None:
+        """Append the spans to the file."""
+        logger = self._get_logger()
+        for span in spans:
+            logger.info(json.dumps(span.to_dict(), default=str, ensure_ascii=False))
+
+    def _get_logger(self) -> logging.Logger:
+        if self._logger is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(
+                self.path,
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                encoding="utf-8",
+            )
+            logger = logging.getLogger("app.traces")
+            logger.handlers = [handler]
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            self._logger = logger
+        return self._logger
+
+
+class OTLPHttpExporter:
+    """Posts spans to an OpenTelemetry collector as OTLP/HTTP JSON."""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        """Configure the collector URL, e.g. http://localhost:4318/v1/traces."""
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]) -> None:
+        """Send the spans in a single request."""
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(self.payload(spans)).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+    def payload(self, spans: List[Span]) -> Dict[str, Any]:
+        """Build an ExportTraceServiceRequest body."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes(
+                            {"service.name": self.service_name}
+                        )
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [_otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    body = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        # SPAN_KIND_SERVER for request roots, SPAN_KIND_INTERNAL otherwise
+        "kind": 2 if span.parent_id is None else 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        body["parentSpanId"] = span.parent_id
+    return body
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    values = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        values.append({"key": key, "value": typed})
+    return values
+
+
+class Tracer:
+    """
+    Creates spans for sampled requests and exports them in batches.
+
+    The sampling decision is made once per request, so a trace is either
+    complete or absent. Finished spans go through a bounded queue to a
+    background thread; spans are dropped rather than slowing requests down.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        exporters: List[Any],
+        queue_size: int = 2048,
+        batch_size: int = 256,
+    ):
+        """Configure sampling and exporters; the thread starts on first use."""
+        self.sample_rate = sample_rate
+        self.exporters = exporters
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def start_trace(
+        self, name: str, traceparent: Optional[str] = None, **attributes: Any
+    ) -> Iterator[AnySpan]:
+        """
+        Open the root span of a request.
+
+        A valid W3C traceparent header continues the caller's trace and
+        follows its sampling flag; otherwise the sample rate decides.
+        """
+        match = _TRACEPARENT.match(traceparent or "")
+        if match:
+            trace_id, parent_id = match.group(1), match.group(2)
+            sampled = int(match.group(3), 16) & 1 == 1
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+            sampled = random.random() < self.sample_rate
+        if not sampled or not self.exporters:
+            yield NOOP_SPAN
+            return
+        root = self._start(name, trace_id, parent_id, attributes)
+        token = _current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.error = repr(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end(root)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[AnySpan]:
+        """Open a child of the active span; a no-op outside a sampled trace."""
+        parent = _current_span.get()
+        if parent is None:
+            yield NOOP_SPAN
+            return
+        child = self.start_child(name, parent, attributes)
+        token = _current_span.set(child)
+        try:
+            yield child
+        except BaseException as e:
+            child.error = repr(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end(child)
+
+    def start_child(
+        self, name: str, parent: Span, attributes: Optional[Dict[str, Any]] = None
+    ) -> Span:
+        """Start a span that is ended explicitly, e.g. from event hooks."""
+        return self._start(name, parent.trace_id, parent.span_id, attributes or {})
+
+    def end(self, span: Span) -> None:
+        """Finish a span and queue it for export."""
+        span.end_ns = time.time_ns()
+        self._start_thread()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until queued spans have been exported."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def shutdown(self) -> None:
+        """Export queued spans and stop the exporter thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout=5)
+
+    @staticmethod
+    def _start(
+        name: str, trace_id: str, parent_id: Optional[str], attributes: Dict
+    ) -> Span:
+        return Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent_id,
+            start_ns=time.time_ns(),
+            attributes=dict(attributes),
+        )
+
+    def _start_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trace-exporter", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            spans = [span for span in batch if span is not None]
+            try:
+                for exporter in self.exporters:
+                    try:
+                        exporter.export(spans)
+                    except Exception as e:
+                        print(f"Failed to export {len(spans)} spans: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(spans) < len(batch):
+                return
+
+
+def configured_exporters() -> List[Any]:
+    """Build the exporters named in TRACE_EXPORTERS."""
+    exporters: List[Any] = []
+    for name in filter(None, (n.strip() for n in settings.TRACE_EXPORTERS.split(","))):
+        if name == "jsonl":
+            exporters.append(
+                JsonLinesExporter(
+                    settings.TRACE_LOG_PATH,
+                    settings.TRACE_LOG_MAX_BYTES,
+                    settings.TRACE_LOG_BACKUP_COUNT,
+                )
+            )
+        elif name == "otlp" and settings.TRACE_OTLP_ENDPOINT:
+            exporters.append(
+                OTLPHttpExporter(
+                    settings.TRACE_OTLP_ENDPOINT, settings.TRACE_SERVICE_NAME
+                )
+            )
+        else:
+            print(f"Ignoring trace exporter {name!r}")
+    return exporters
+
+
+tracer = Tracer(
+    sample_rate=settings.TRACE_SAMPLE_RATE, exporters=configured_exporters()
+)
+span = tracer.span
+start_trace = tracer.start_trace
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorate a function to run inside a span named after it."""
+
+    def decorate(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_span(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    parent = _current_span.get()
+    if parent is not None:
+        context._trace_span = tracer.start_child(
+            "db.query",
+            parent,
+            {
+                "db.system": conn.dialect.name,
+                "db.operation": statement.lstrip()[:6].upper(),
+                "db.statement": " ".join(statement.split())[:500],
+            },
+        )
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query_span(conn, cursor, statement, parameters, context, executemany) -> None:
+    query_span = getattr(context, "_trace_span", None)
+    if query_span is not None:
+        context._trace_span = None
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            query_span.set_attribute("db.rowcount", cursor.rowcount)
+        tracer.end(query_span)
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_query_span(exception_context) -> None:
+    context = exception_context.execution_context
+    query_span = getattr(context, "_trace_span", None)
+    if query_span is not None:
+        context._trace_span = None
+        query_span.error = repr(exception_context.original_exception)
+        tracer.end(query_span)
@@ -0,0 +1,76 @@
+"""In-process cache of authenticated user principals."""
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.cache import LRUTTLCache
+from app.core.config import settings
+from app.models import User
+
+_PENDING_INVALIDATIONS = "user_cache_invalidations"
+
+# User columns carried in the signed claim set of an access token. Only
+# authorization state is included so profile data is never served stale.
+PRINCIPAL_CLAIMS: Tuple[str, ...] = ("is_active", "is_superuser")
+
+
+def snapshot_user(user: User) -> User:
+    """
+    Copy a user's column values into a detached instance.
+
+    The snapshot is never attached to a session itself; callers merge it
+    with load=False so each request gets its own session-bound copy.
+    """
+    copy = User(
+        **{attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    )
+    make_transient_to_detached(copy)
+    return copy
+
+
+def user_claims(user: User) -> Dict[str, Any]:
+    """Return the principal claims embedded in an access token."""
+    return {claim: getattr(user, claim) for claim in PRINCIPAL_CLAIMS}
+
+
+def user_from_claims(user_id: int, claims: Mapping[str, Any]) -> Optional[User]:
+    """
+    Build a detached user from token claims.
+
+    Columns not carried in the claims are loaded lazily on first access.
+    Returns None when the claim set is incomplete.
+    """
+    if not all(claim in claims for claim in PRINCIPAL_CLAIMS):
+        return None
+    user = User(id=user_id, **{claim: claims[claim] for claim in PRINCIPAL_CLAIMS})
+    make_transient_to_detached(user)
+    return user
+
+
+user_cache: LRUTTLCache[User] = LRUTTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user(db: Session, user_id: int) -> None:
+    """
+    Drop a cached user now and again once the session commits.
+
+    The second invalidation discards snapshots that concurrent requests
+    cached from the old row while the transaction was still open.
+    """
+    user_cache.invalidate(user_id)
+    db.info.setdefault(_PENDING_INVALIDATIONS, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
@@ -1,7 +1,23 @@
 """CRUD operations."""
+from .async_crud import (  # noqa
+    AsyncCRUD,
+    async_crud_ai_feedback,
+    async_crud_answer,
+    async_crud_competency_item,
+    async_crud_data_version,
+    async_crud_llm_usage,
+    async_crud_question,
+    async_crud_user,
+    async_crud_user_career_plan,
+)
 from .crud_ai_feedback import crud_ai_feedback  # noqa
+from .crud_auth_token import crud_refresh_token, crud_token_revocation  # noqa
 from .crud_competency import crud_answer, crud_competency_item, crud_question  # noqa
+from .crud_data_version import crud_data_version  # noqa
+from .crud_feedback_blob import crud_feedback_blob  # noqa
+from .crud_idempotency_key import crud_idempotency_key  # noqa
+from .crud_llm_usage import crud_llm_usage  # noqa
 from .crud_user import crud_user  # noqa
 from .crud_user_career_plan import crud_user_career_plan  # noqa
 
-__all__ = ["crud_user", "crud_competency_item", "crud_question", "crud_answer", "crud_user_career_plan", "crud_ai_feedback"]
\ No newline at end of file
+__all__ = ["crud_user", "crud_competency_item", "crud_question", "crud_answer", "crud_user_career_plan", "crud_ai_feedback", "crud_feedback_blob", "crud_llm_usage", "crud_refresh_token", "crud_token_revocation", "crud_data_version", "crud_idempotency_key", "AsyncCRUD", "async_crud_user", "async_crud_competency_item", "async_crud_question", "async_crud_answer", "async_crud_user_career_plan", "async_crud_ai_feedback", "async_crud_llm_usage", "async_crud_data_version"]
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""Async variants of the CRUD objects."""
+from functools import wraps
+from typing import Any, Callable, Generic, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.crud_ai_feedback import CRUDAIFeedback, crud_ai_feedback
+from app.crud.crud_competency import (
+    CRUDAnswer,
+    CRUDCompetencyItem,
+    CRUDQuestion,
+    crud_answer,
+    crud_competency_item,
+    crud_question,
+)
+from app.crud.crud_data_version import CRUDDataVersion, crud_data_version
+from app.crud.crud_llm_usage import CRUDLLMUsage, crud_llm_usage
+from app.crud.crud_user import CRUDUser, crud_user
+from app.crud.crud_user_career_plan import CRUDUserCareerPlan, crud_user_career_plan
+
+CRUDType = TypeVar("CRUDType")
+
+
+class AsyncCRUD(Generic[CRUDType]):
+    """
+    Async facade over a sync CRUD object.
+
+    Every public method takes an AsyncSession in place of a Session and runs
+    the sync implementation through AsyncSession.run_sync, so the queries
+    execute on the async driver without blocking the event loop. Sync and
+    async endpoints share one implementation while endpoints are migrated.
+
+    Returned objects belong to the async session: attributes that were not
+    loaded inside the call cannot be lazy-loaded afterwards.
+    """
+
+    def __init__(self, crud: CRUDType):
+        """Wrap a sync CRUD object."""
+        self.sync = crud
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.sync, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @wraps(attr)
+        async def call(db: AsyncSession, *args: Any, **kwargs: Any) -> Any:
+            return await db.run_sync(_bind(attr, args, kwargs))
+
+        return call
+
+
+def _bind(method: Callable[..., Any], args: tuple, kwargs: dict) -> Callable:
+    def run(session: Any) -> Any:
+        return method(session, *args, **kwargs)
+
+    return run
+
+
+async_crud_user: AsyncCRUD[CRUDUser] = AsyncCRUD(crud_user)
+async_crud_competency_item: AsyncCRUD[CRUDCompetencyItem] = AsyncCRUD(
+    crud_competency_item
+)
+async_crud_question: AsyncCRUD[CRUDQuestion] = AsyncCRUD(crud_question)
+async_crud_answer: AsyncCRUD[CRUDAnswer] = AsyncCRUD(crud_answer)
+async_crud_user_career_plan: AsyncCRUD[CRUDUserCareerPlan] = AsyncCRUD(
+    crud_user_career_plan
+)
+async_crud_ai_feedback: AsyncCRUD[CRUDAIFeedback] = AsyncCRUD(crud_ai_feedback)
+async_crud_llm_usage: AsyncCRUD[CRUDLLMUsage] = AsyncCRUD(crud_llm_usage)
+async_crud_data_version: AsyncCRUD[CRUDDataVersion] = AsyncCRUD(crud_data_version)
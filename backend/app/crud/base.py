@@ -1,11 +1,14 @@
 """Base CRUD class."""
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import inspect
+from functools import wraps
+from typing import Any, Callable, Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.core.database import Base
+from app.core.tracing import current_span, span
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -13,7 +16,19 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    """Base CRUD operations."""
+    """
+    Base CRUD operations.
+
+    Writes are only flushed; the request's unit of work (deps.get_db)
+    commits once at the end or rolls everything back on error.
+
+    Public methods taking a session are traced as crud.<Class>.<method>.
+    """
+
+    def __init_subclass__(cls, **kwargs: Any):
+        """Trace the session methods a subclass defines."""
+        super().__init_subclass__(**kwargs)
+        _trace_methods(cls)
 
     def __init__(self, model: Type[ModelType]):
         """Initialize CRUD object with model."""
@@ -34,8 +49,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def update(
@@ -55,13 +69,35 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> ModelType:
         """Remove an object."""
         obj = db.query(self.model).get(id)
         db.delete(obj)
-        db.commit()
-        return obj
\ No newline at end of file
+        db.flush()
+        return obj
+
+
+def _trace_methods(cls: type) -> None:
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(attr):
+            continue
+        parameters = list(inspect.signature(attr).parameters)
+        if parameters[1:2] == ["db"]:
+            setattr(cls, name, _traced(attr))
+
+
+def _traced(method: Callable) -> Callable:
+    @wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if current_span() is None:
+            return method(self, *args, **kwargs)
+        with span(f"crud.{type(self).__name__}.{method.__name__}"):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+_trace_methods(CRUDBase)
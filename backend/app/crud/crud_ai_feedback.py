@@ -1,11 +1,13 @@
 """CRUD operations for AI feedback."""
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
-from app.models.ai_feedback import AIFeedback
+from app.crud.crud_data_version import crud_data_version, feedback_key
+from app.crud.crud_feedback_blob import crud_feedback_blob
+from app.models.ai_feedback import AIFeedback, AIFeedbackVersion
 from app.schemas.ai_feedback import AIFeedbackCreate, AIFeedbackUpdate
 
 
@@ -47,6 +49,9 @@ class CRUDAIFeedback(CRUDBase[AIFeedback, AIFeedbackCreate, AIFeedbackUpdate]):
         """
         Create new AI feedback or update existing one for a user.
         
+        Payloads are stored once in the blob table; the user's row and the
+        appended version entry only reference them by content hash.
+        
         Args:
             db: Database session
             user_id: User ID
@@ -55,25 +60,53 @@ class CRUDAIFeedback(CRUDBase[AIFeedback, AIFeedbackCreate, AIFeedbackUpdate]):
         Returns:
             Created or updated AIFeedback object
         """
+        now = datetime.utcnow()
+        hashes = {
+            "feedback_hash": crud_feedback_blob.put(db, payload=obj_in.feedback_content),
+            "suggestions_hash": crud_feedback_blob.put(db, payload=obj_in.career_suggestions),
+            "books_hash": crud_feedback_blob.put(db, payload=obj_in.book_recommendations),
+        }
+        db.add(AIFeedbackVersion(user_id=user_id, generated_at=now, **hashes))
+        
         # Check if feedback already exists for this user
         existing = db.query(self.model).filter(self.model.user_id == user_id).first()
         
         if existing:
-            # Update existing feedback
-            update_data = obj_in.dict()
-            update_data["updated_at"] = datetime.utcnow()
-            for field, value in update_data.items():
+            # Point the existing row at the new version
+            for field, value in hashes.items():
                 setattr(existing, field, value)
-            db.commit()
-            db.refresh(existing)
-            return existing
+            existing.generated_at = now
+            existing.updated_at = now
+            db_obj = existing
         else:
             # Create new feedback
-            db_obj = self.model(user_id=user_id, **obj_in.dict())
+            db_obj = self.model(user_id=user_id, generated_at=now, **hashes)
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
-            return db_obj
+        db.flush()
+        crud_data_version.bump(db, name=feedback_key(user_id))
+        return db_obj
+
+    def get_history(
+        self, db: Session, *, user_id: int, limit: int = 20
+    ) -> List[AIFeedbackVersion]:
+        """
+        Get previously generated feedback versions for a user, newest first.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            limit: Maximum number of versions to return
+            
+        Returns:
+            List of AIFeedbackVersion objects
+        """
+        return (
+            db.query(AIFeedbackVersion)
+            .filter(AIFeedbackVersion.user_id == user_id)
+            .order_by(AIFeedbackVersion.generated_at.desc(), AIFeedbackVersion.id.desc())
+            .limit(limit)
+            .all()
+        )
 
     def invalidate_user_feedback(self, db: Session, *, user_id: int) -> None:
         """
@@ -85,7 +118,7 @@ class CRUDAIFeedback(CRUDBase[AIFeedback, AIFeedbackCreate, AIFeedbackUpdate]):
             user_id: User ID
         """
         db.query(self.model).filter(self.model.user_id == user_id).delete()
-        db.commit()
+        crud_data_version.bump(db, name=feedback_key(user_id))
 
 
 crud_ai_feedback = CRUDAIFeedback(AIFeedback)
\ No newline at end of file
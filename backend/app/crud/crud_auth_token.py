@@ -0,0 +1,165 @@
+"""CRUD operations for refresh tokens and access token revocations."""
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.revocation import jti_key, revocation_list, user_key
+from app.core.security import create_refresh_token, hash_token
+from app.crud.base import CRUDBase
+from app.models.auth_token import RefreshToken, TokenRevocation
+
+
+class CRUDRefreshToken(CRUDBase[RefreshToken, None, None]):
+    """CRUD operations for RefreshToken model."""
+
+    def issue(
+        self, db: Session, *, user_id: int, family_id: Optional[str] = None
+    ) -> str:
+        """Store a new refresh token and return its plaintext value."""
+        token = create_refresh_token()
+        db.add(
+            RefreshToken(
+                user_id=user_id,
+                token_hash=hash_token(token),
+                family_id=family_id or uuid.uuid4().hex,
+                expires_at=datetime.utcnow()
+                + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+        db.flush()
+        return token
+
+    def rotate(self, db: Session, *, token: str) -> Optional[Tuple[int, str]]:
+        """
+        Exchange a refresh token for a new one in the same family.
+
+        Args:
+            db: Database session
+            token: Plaintext refresh token presented by the client
+
+        Returns:
+            (user_id, new refresh token), or None if the token is unknown,
+            expired, revoked or has already been used
+        """
+        row = (
+            db.query(RefreshToken)
+            .filter(RefreshToken.token_hash == hash_token(token))
+            .with_for_update()
+            .first()
+        )
+        now = datetime.utcnow()
+        if row is None or row.revoked_at is not None or row.expires_at <= now:
+            return None
+        if row.used_at is not None:
+            # A rotated token came back: assume it was stolen and end the session.
+            # Committed here because the request itself fails and rolls back.
+            print(f"Refresh token reuse detected for user {row.user_id}")
+            self.revoke_family(db, family_id=row.family_id)
+            db.commit()
+            return None
+        row.used_at = now
+        return row.user_id, self.issue(db, user_id=row.user_id, family_id=row.family_id)
+
+    def revoke_family(self, db: Session, *, family_id: str) -> None:
+        """Revoke every refresh token of a login session."""
+        db.query(RefreshToken).filter(
+            RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)
+        ).update(
+            {RefreshToken.revoked_at: datetime.utcnow()}, synchronize_session=False
+        )
+
+    def revoke_token(self, db: Session, *, token: str) -> None:
+        """Revoke the login session a refresh token belongs to."""
+        row = (
+            db.query(RefreshToken)
+            .filter(RefreshToken.token_hash == hash_token(token))
+            .first()
+        )
+        if row is not None:
+            self.revoke_family(db, family_id=row.family_id)
+
+    def revoke_for_user(self, db: Session, *, user_id: int) -> None:
+        """Revoke every refresh token of a user."""
+        db.query(RefreshToken).filter(
+            RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None)
+        ).update(
+            {RefreshToken.revoked_at: datetime.utcnow()}, synchronize_session=False
+        )
+
+
+class CRUDTokenRevocation(CRUDBase[TokenRevocation, None, None]):
+    """CRUD operations for TokenRevocation model."""
+
+    def revoke_access_token(
+        self, db: Session, *, jti: str, expires_at: datetime
+    ) -> None:
+        """Revoke a single access token until it expires."""
+        self.prune(db)
+        db.add(TokenRevocation(jti=jti, expires_at=expires_at))
+        revocation_list.add(jti_key(jti))
+
+    def revoke_user(self, db: Session, *, user_id: int) -> None:
+        """
+        Revoke every token issued to a user so far.
+
+        Access tokens are covered until the longest of them expires;
+        refresh tokens are revoked outright.
+        """
+        self.prune(db)
+        now = datetime.utcnow()
+        db.add(
+            TokenRevocation(
+                user_id=user_id,
+                revoked_at=now,
+                expires_at=now
+                + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+            )
+        )
+        crud_refresh_token.revoke_for_user(db, user_id=user_id)
+        revocation_list.add(user_key(user_id))
+
+    def is_revoked(
+        self, db: Session, *, jti: Optional[str], user_id: int, issued_at: datetime
+    ) -> bool:
+        """Confirm a possible revocation reported by the filter."""
+        conditions = [
+            (TokenRevocation.user_id == user_id)
+            & (TokenRevocation.revoked_at > issued_at)
+        ]
+        if jti is not None:
+            conditions.append(TokenRevocation.jti == jti)
+        return (
+            db.query(TokenRevocation.id)
+            .filter(or_(*conditions), TokenRevocation.expires_at > datetime.utcnow())
+            .first()
+            is not None
+        )
+
+    def active_keys(self, db: Session) -> List[str]:
+        """Return the filter keys of every unexpired revocation."""
+        rows = (
+            db.query(TokenRevocation.jti, TokenRevocation.user_id)
+            .filter(TokenRevocation.expires_at > datetime.utcnow())
+            .all()
+        )
+        return [jti_key(jti) if jti else user_key(user_id) for jti, user_id in rows]
+
+    def sync(self, db: Session) -> None:
+        """Rebuild the process-local revocation filter from the table."""
+        revocation_list.replace(self.active_keys(db))
+
+    def prune(self, db: Session) -> int:
+        """Delete revocations whose tokens have all expired."""
+        return (
+            db.query(TokenRevocation)
+            .filter(TokenRevocation.expires_at <= datetime.utcnow())
+            .delete(synchronize_session=False)
+        )
+
+
+crud_refresh_token = CRUDRefreshToken(RefreshToken)
+crud_token_revocation = CRUDTokenRevocation(TokenRevocation)
@@ -1,9 +1,16 @@
 """CRUD operations for competency-related models."""
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Collection, Dict, FrozenSet, List, Mapping, Optional
 
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.cache import LRUTTLCache
+from app.core.config import settings
 from app.crud.base import CRUDBase
+from app.crud.crud_data_version import answers_key, crud_data_version
 from app.models import Answer, CompetencyItem, Question
 from app.schemas.competency import AnswerCreate, QuestionCreate, QuestionUpdate
 
@@ -33,25 +40,28 @@ class CRUDQuestion(CRUDBase[Question, QuestionCreate, QuestionUpdate]):
             .all()
         )
 
-    def get_questions_with_user_answers(
-        self, db: Session, user_id: int
-    ) -> List[Question]:
-        """Get all questions with user's answers if they exist."""
-        questions = self.get_all_with_competency(db)
-        
-        # Get user's answers
-        user_answers = (
-            db.query(Answer)
-            .filter(Answer.user_id == user_id)
-            .all()
+    def get_with_competency(self, db: Session, id: int) -> Optional[Question]:
+        """Get a question with its competency item loaded."""
+        return (
+            db.query(Question)
+            .options(joinedload(Question.competency_item))
+            .filter(Question.id == id)
+            .first()
         )
-        answer_dict = {ans.question_id: ans.score for ans in user_answers}
-        
-        # Add user answers to questions
-        for question in questions:
-            question.user_answer = answer_dict.get(question.id)
-        
-        return questions
+
+
+# Valid question ids, refreshed on expiry or when an unknown id shows up
+question_ids_cache: LRUTTLCache[FrozenSet[int]] = LRUTTLCache(
+    max_size=1, ttl_seconds=settings.QUESTION_IDS_CACHE_TTL_SECONDS
+)
+
+
+class UnknownQuestionError(ValueError):
+    """Raised when answers reference questions that do not exist."""
+
+    def __init__(self, question_ids: List[int]):
+        self.question_ids = question_ids
+        super().__init__(f"Unknown question ids: {question_ids}")
 
 
 class CRUDAnswer(CRUDBase[Answer, AnswerCreate, None]):
@@ -80,8 +90,8 @@ class CRUDAnswer(CRUDBase[Answer, AnswerCreate, None]):
             # Update existing answer
             existing.score = obj_in.score
             db.add(existing)
-            db.commit()
-            db.refresh(existing)
+            db.flush()
+            crud_data_version.bump(db, name=answers_key(user_id))
             return existing
         else:
             # Create new answer
@@ -91,24 +101,124 @@ class CRUDAnswer(CRUDBase[Answer, AnswerCreate, None]):
                 score=obj_in.score
             )
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            db.flush()
+            crud_data_version.bump(db, name=answers_key(user_id))
             return db_obj
 
     def bulk_create_or_update(
         self, db: Session, *, user_id: int, answers: List[AnswerCreate]
     ) -> List[Answer]:
-        """Bulk create or update answers."""
-        created_answers = []
+        """
+        Bulk create or update answers in a single upsert statement.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            answers: Answers to store; a later answer to the same question wins
+
+        Returns:
+            The stored answers, one per question in submission order
+
+        Raises:
+            UnknownQuestionError: If any question id does not exist
+        """
+        scores: Dict[int, int] = {}
         for answer_in in answers:
-            answer = self.create_or_update(db, user_id=user_id, obj_in=answer_in)
-            created_answers.append(answer)
-        return created_answers
+            scores[answer_in.question_id] = answer_in.score
+        if not scores:
+            return []
+        self._validate_question_ids(db, scores)
+
+        self._upsert(db, {user_id: scores})
+
+        # The upsert bypasses the ORM, so overwrite any rows already loaded
+        rows = (
+            db.query(Answer)
+            .filter(Answer.user_id == user_id, Answer.question_id.in_(list(scores)))
+            .populate_existing()
+            .all()
+        )
+        by_question = {row.question_id: row for row in rows}
+        return [by_question[question_id] for question_id in scores]
+
+    def upsert_scores(
+        self, db: Session, *, scores: Mapping[int, Mapping[int, int]]
+    ) -> None:
+        """
+        Store scores of several users in a single upsert statement.
+
+        Args:
+            db: Database session
+            scores: Score by question id, by user id
+
+        Raises:
+            UnknownQuestionError: If any question id does not exist
+        """
+        question_ids = {
+            question_id
+            for user_scores in scores.values()
+            for question_id in user_scores
+        }
+        if not question_ids:
+            return
+        self._validate_question_ids(db, question_ids)
+        self._upsert(db, scores)
+
+    def _upsert(self, db: Session, scores: Mapping[int, Mapping[int, int]]) -> None:
+        now = datetime.utcnow()
+        values: List[Dict[str, Any]] = [
+            {
+                "user_id": user_id,
+                "question_id": question_id,
+                "score": score,
+                "submitted_at": now,
+            }
+            for user_id, user_scores in scores.items()
+            for question_id, score in user_scores.items()
+        ]
+        if db.get_bind().dialect.name == "mysql":
+            stmt = mysql.insert(Answer).values(values)
+            stmt = stmt.on_duplicate_key_update(score=stmt.inserted.score)
+        else:
+            stmt = sqlite.insert(Answer).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Answer.user_id, Answer.question_id],
+                set_={"score": stmt.excluded.score},
+            )
+        try:
+            db.execute(stmt)
+        except IntegrityError:
+            # The cached ids can predate a question's deletion; recheck them
+            question_ids_cache.invalidate("all")
+            self._validate_question_ids(
+                db, {question_id for s in scores.values() for question_id in s}
+            )
+            raise
+        for user_id in scores:
+            crud_data_version.bump(db, name=answers_key(user_id))
+
+    def _validate_question_ids(
+        self, db: Session, question_ids: Collection[int]
+    ) -> None:
+        known = question_ids_cache.get("all")
+        if known is None or not known.issuperset(question_ids):
+            known = frozenset(question_id for (question_id,) in db.query(Question.id))
+            question_ids_cache.set("all", known)
+        unknown = sorted(set(question_ids) - known)
+        if unknown:
+            raise UnknownQuestionError(unknown)
 
     def get_user_answers(self, db: Session, *, user_id: int) -> List[Answer]:
         """Get all answers for a user."""
         return db.query(Answer).filter(Answer.user_id == user_id).all()
 
+    def get_user_scores(self, db: Session, *, user_id: int) -> Dict[int, int]:
+        """Get a user's scores by question id as plain rows, without ORM objects."""
+        rows = db.execute(
+            select(Answer.question_id, Answer.score).where(Answer.user_id == user_id)
+        )
+        return {question_id: score for question_id, score in rows}
+
 
 crud_competency_item = CRUDCompetencyItem(CompetencyItem)
 crud_question = CRUDQuestion(Question)
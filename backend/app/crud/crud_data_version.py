@@ -0,0 +1,76 @@
+"""CRUD operations for data version counters."""
+from datetime import datetime
+from typing import Any, Dict, Iterable, Mapping
+
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models import DataVersion
+
+CATALOG = "catalog"
+# Bumped when any user's competency scores change, i.e. the inputs of the
+# company averages
+COMPANY_COMPETENCIES = "company_competencies"
+
+
+def answers_key(user_id: int) -> str:
+    """Version of one user's answers."""
+    return f"answers:{user_id}"
+
+
+def feedback_key(user_id: int) -> str:
+    """Version of one user's stored AI feedback."""
+    return f"feedback:{user_id}"
+
+
+def version_number(versions: Mapping[str, Any], name: str) -> int:
+    """Version of a counter read by get_versions, 0 if it was never bumped."""
+    row = versions.get(name)
+    return row.version if row is not None else 0
+
+
+class CRUDDataVersion(CRUDBase[DataVersion, None, None]):
+    """
+    Version counters bumped in the same transaction as the data they cover.
+
+    Statements go through the session's connection without the ORM, so a
+    bump is safe from inside flush events.
+    """
+
+    def bump(self, db: Session, *, name: str) -> None:
+        """Increment a counter, creating it at version 1."""
+        now = datetime.utcnow()
+        table = DataVersion.__table__
+        values = {"name": name, "version": 1, "updated_at": now}
+        if db.get_bind().dialect.name == "mysql":
+            stmt = mysql.insert(table).values(values)
+            stmt = stmt.on_duplicate_key_update(
+                version=table.c.version + 1, updated_at=now
+            )
+        else:
+            stmt = sqlite.insert(table).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.name],
+                set_={"version": table.c.version + 1, "updated_at": now},
+            )
+        db.connection().execute(stmt)
+
+    def get_versions(self, db: Session, *, names: Iterable[str]) -> Dict[str, Any]:
+        """
+        Read several counters in one query.
+
+        Returns rows with version and updated_at by name; counters that were
+        never bumped are left out.
+        """
+        table = DataVersion.__table__
+        rows = db.connection().execute(
+            select(table.c.name, table.c.version, table.c.updated_at).where(
+                table.c.name.in_(list(names))
+            )
+        )
+        return {row.name: row for row in rows}
+
+
+crud_data_version = CRUDDataVersion(DataVersion)
@@ -0,0 +1,40 @@
+"""CRUD operations for content-addressed feedback blobs."""
+from typing import Any, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models.feedback_blob import FeedbackBlob
+
+
+class CRUDFeedbackBlob(CRUDBase[FeedbackBlob, None, None]):
+    """CRUD operations for FeedbackBlob model."""
+
+    def put(self, db: Session, *, payload: Any) -> Optional[str]:
+        """
+        Store a payload once and return its content hash.
+
+        Args:
+            db: Database session
+            payload: JSON-serializable payload, or None
+
+        Returns:
+            Content hash of the stored blob, or None when payload is None
+        """
+        if payload is None:
+            return None
+        blob = FeedbackBlob.from_payload(payload)
+        if db.get(self.model, blob.hash) is None:
+            # Identical payloads may be written concurrently by other users,
+            # so let the database ignore the duplicate instead of failing.
+            ignore = "IGNORE" if db.get_bind().dialect.name == "mysql" else "OR IGNORE"
+            db.execute(
+                insert(self.model)
+                .prefix_with(ignore)
+                .values(hash=blob.hash, raw_size=blob.raw_size, data=blob.data)
+            )
+        return blob.hash
+
+
+crud_feedback_blob = CRUDFeedbackBlob(FeedbackBlob)
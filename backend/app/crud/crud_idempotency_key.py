@@ -0,0 +1,113 @@
+"""CRUD operations for idempotency keys."""
+from datetime import datetime, timedelta
+from typing import Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import hash_token
+from app.crud.base import CRUDBase
+from app.models.idempotency_key import IdempotencyKey
+
+
+class CRUDIdempotencyKey(CRUDBase[IdempotencyKey, None, None]):
+    """CRUD operations for IdempotencyKey model."""
+
+    def claim(
+        self, db: Session, *, user_id: int, key: str, request_hash: str
+    ) -> Tuple[IdempotencyKey, bool]:
+        """
+        Claim a key for a request, unless an earlier request holds it.
+
+        A concurrent request claiming the same key waits for this
+        transaction, so the claim should share the transaction of the
+        request's writes.
+
+        Args:
+            db: Database session
+            user_id: User making the request
+            key: Idempotency-Key header value
+            request_hash: Digest of the request the key is used for
+
+        Returns:
+            (row, True) when claimed, or (earlier request's row, False)
+        """
+        key_hash = hash_token(key)
+        query = db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id, IdempotencyKey.key_hash == key_hash
+        )
+        row = query.first()
+        now = datetime.utcnow()
+        if row is not None and row.expires_at <= now:
+            # Not pruned yet; a point delete locks only this key
+            db.delete(row)
+            db.flush()
+            row = None
+        if row is not None:
+            abandoned_before = now - timedelta(
+                seconds=settings.IDEMPOTENCY_KEY_ABANDON_SECONDS
+            )
+            if (
+                row.status_code is None
+                and row.created_at <= abandoned_before
+                and row.request_hash == request_hash
+            ):
+                return row, self._take_over(db, row=row)
+            return row, False
+        row = IdempotencyKey(
+            user_id=user_id,
+            key_hash=key_hash,
+            request_hash=request_hash,
+            created_at=now,
+            expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+        )
+        try:
+            with db.begin_nested():
+                db.add(row)
+        except IntegrityError:
+            # Claimed concurrently; a locking read sees the committed claim
+            return query.with_for_update().populate_existing().one(), False
+        return row, True
+
+    def _take_over(self, db: Session, *, row: IdempotencyKey) -> bool:
+        # The request holding the key died without storing a response or
+        # releasing it. Only one retry may win the conditional update.
+        taken = (
+            db.query(IdempotencyKey)
+            .filter(
+                IdempotencyKey.id == row.id,
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.created_at == row.created_at,
+            )
+            .update(
+                {IdempotencyKey.created_at: datetime.utcnow()},
+                synchronize_session=False,
+            )
+        )
+        db.refresh(row, with_for_update=True)
+        return taken == 1
+
+    def release(self, db: Session, *, row: IdempotencyKey) -> None:
+        """Give up a claim so the request can be retried with the same key."""
+        db.delete(row)
+        db.flush()
+
+    def prune(self, db: Session, *, limit: int) -> int:
+        """Delete up to limit keys past their expiry."""
+        ids = [
+            id
+            for (id,) in db.query(IdempotencyKey.id)
+            .filter(IdempotencyKey.expires_at <= datetime.utcnow())
+            .limit(limit)
+        ]
+        if not ids:
+            return 0
+        return (
+            db.query(IdempotencyKey)
+            .filter(IdempotencyKey.id.in_(ids))
+            .delete(synchronize_session=False)
+        )
+
+
+crud_idempotency_key = CRUDIdempotencyKey(IdempotencyKey)
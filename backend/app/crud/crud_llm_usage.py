@@ -0,0 +1,185 @@
+"""CRUD operations for the LLM usage ledger."""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Integer, cast, func
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.base import CRUDBase
+from app.models.llm_usage import LLMUsage, LLMUsageDaily
+from app.schemas.llm_usage import LLMUsageCreate, LLMUsageSummary
+
+# Upper bounds (ms) of the latency histogram kept in each daily rollup.
+# The last histogram slot counts calls slower than the largest bound.
+LATENCY_BUCKETS_MS: Sequence[int] = (
+    250,
+    500,
+    1000,
+    2000,
+    5000,
+    10000,
+    20000,
+    30000,
+    45000,
+    60000,
+    120000,
+)
+
+
+def _bucket_index(latency_ms: int) -> int:
+    for i, bound in enumerate(LATENCY_BUCKETS_MS):
+        if latency_ms <= bound:
+            return i
+    return len(LATENCY_BUCKETS_MS)
+
+
+def _percentile(histogram: List[int], q: float) -> Optional[int]:
+    """Estimate a latency percentile as the upper bound of its bucket."""
+    total = sum(histogram)
+    if total == 0:
+        return None
+    rank = q * total
+    cumulative = 0
+    for i, count in enumerate(histogram):
+        cumulative += count
+        if cumulative >= rank:
+            return LATENCY_BUCKETS_MS[min(i, len(LATENCY_BUCKETS_MS) - 1)]
+    return LATENCY_BUCKETS_MS[-1]
+
+
+def estimate_cost(input_tokens: int, output_tokens: int) -> float:
+    """Estimate the provider cost of a call in USD."""
+    return (
+        input_tokens * settings.LLM_INPUT_COST_PER_1K_TOKENS
+        + output_tokens * settings.LLM_OUTPUT_COST_PER_1K_TOKENS
+    ) / 1000
+
+
+def _rollup_increments(new: Any, obj_in: LLMUsageCreate) -> Dict[str, Any]:
+    """Add a new rollup row's values to the existing row's."""
+    increments: Dict[str, Any] = {
+        "department": new.department,
+        "updated_at": new.updated_at,
+    }
+    for name in (
+        "call_count",
+        "error_count",
+        "input_tokens",
+        "output_tokens",
+        "cost_usd",
+    ):
+        increments[name] = getattr(LLMUsageDaily, name) + getattr(new, name)
+    path = f"$[{_bucket_index(obj_in.latency_ms)}]"
+    histogram = LLMUsageDaily.latency_histogram
+    increments["latency_histogram"] = func.json_set(
+        histogram, path, cast(func.json_extract(histogram, path), Integer) + 1
+    )
+    return increments
+
+
+class CRUDLLMUsage(CRUDBase[LLMUsage, LLMUsageCreate, LLMUsageCreate]):
+    """CRUD operations for the LLM usage ledger and its daily rollups."""
+
+    def record(self, db: Session, *, obj_in: LLMUsageCreate) -> LLMUsage:
+        """Append a ledger entry and fold it into the daily rollup."""
+        entry = LLMUsage(
+            **obj_in.model_dump(),
+            cost_usd=estimate_cost(obj_in.input_tokens, obj_in.output_tokens),
+        )
+        db.add(entry)
+
+        self._fold_into_rollup(db, obj_in=obj_in, cost_usd=entry.cost_usd)
+        db.flush()
+        return entry
+
+    def _fold_into_rollup(
+        self, db: Session, *, obj_in: LLMUsageCreate, cost_usd: float
+    ) -> None:
+        # One upsert, so concurrent first calls of a day can't both insert
+        histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        histogram[_bucket_index(obj_in.latency_ms)] = 1
+        now = datetime.utcnow()
+        values = {
+            "day": now.date(),
+            "user_id": obj_in.user_id,
+            "department": obj_in.department,
+            "call_count": 1,
+            "error_count": int(obj_in.outcome == "error"),
+            "input_tokens": obj_in.input_tokens,
+            "output_tokens": obj_in.output_tokens,
+            "cost_usd": cost_usd,
+            "latency_histogram": histogram,
+            "updated_at": now,
+        }
+        if db.get_bind().dialect.name == "mysql":
+            stmt = mysql.insert(LLMUsageDaily).values(values)
+            stmt = stmt.on_duplicate_key_update(
+                _rollup_increments(stmt.inserted, obj_in)
+            )
+        else:
+            stmt = sqlite.insert(LLMUsageDaily).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LLMUsageDaily.day, LLMUsageDaily.user_id],
+                set_=_rollup_increments(stmt.excluded, obj_in),
+            )
+        db.execute(stmt)
+
+    def get_summary(
+        self,
+        db: Session,
+        *,
+        start: date,
+        end: date,
+        group_by: str = "day",
+    ) -> List[LLMUsageSummary]:
+        """
+        Summarize spend and latency from the daily rollups.
+
+        Args:
+            db: Database session
+            start: First day included
+            end: Last day included
+            group_by: "day" or "department"
+
+        Returns:
+            One summary per day or department, sorted by key
+        """
+        rollups = (
+            db.query(LLMUsageDaily)
+            .filter(LLMUsageDaily.day >= start, LLMUsageDaily.day <= end)
+            .all()
+        )
+
+        groups: Dict[Optional[str], List[LLMUsageDaily]] = defaultdict(list)
+        for rollup in rollups:
+            if group_by == "department":
+                key = rollup.department
+            else:
+                key = rollup.day.isoformat()
+            groups[key].append(rollup)
+
+        summaries = []
+        for key, rows in groups.items():
+            histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+            for row in rows:
+                for i, count in enumerate(row.latency_histogram):
+                    histogram[i] += count
+            summaries.append(
+                LLMUsageSummary(
+                    key=key,
+                    calls=sum(row.call_count for row in rows),
+                    errors=sum(row.error_count for row in rows),
+                    input_tokens=sum(row.input_tokens for row in rows),
+                    output_tokens=sum(row.output_tokens for row in rows),
+                    cost_usd=round(sum(row.cost_usd for row in rows), 6),
+                    latency_p50_ms=_percentile(histogram, 0.50),
+                    latency_p95_ms=_percentile(histogram, 0.95),
+                )
+            )
+        return sorted(summaries, key=lambda s: s.key or "")
+
+
+crud_llm_usage = CRUDLLMUsage(LLMUsage)
@@ -3,8 +3,10 @@ from typing import Any, Dict, Optional, Union
 
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, verify_and_update_password
+from app.core.user_cache import invalidate_user
 from app.crud.base import CRUDBase
+from app.crud.crud_auth_token import crud_token_revocation
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
@@ -25,8 +27,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             is_superuser=obj_in.is_superuser,
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def update(
@@ -41,15 +42,37 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        if "hashed_password" in update_data or any(
+            field in update_data and update_data[field] != getattr(db_obj, field)
+            for field in ("is_active", "is_superuser")
+        ):
+            # Tokens carry these claims, so outstanding ones must be revoked
+            crud_token_revocation.revoke_user(db, user_id=db_obj.id)
+        user = super().update(db, db_obj=db_obj, obj_in=update_data)
+        invalidate_user(db, user.id)
+        return user
+
+    def remove(self, db: Session, *, id: int) -> User:
+        """Remove user."""
+        crud_token_revocation.revoke_user(db, user_id=id)
+        user = super().remove(db, id=id)
+        invalidate_user(db, id)
+        return user
 
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         """Authenticate user."""
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = verify_and_update_password(password, user.hashed_password)
+        if not verified:
             return None
+        if new_hash:
+            # The bcrypt cost changed since this hash was stored
+            user.hashed_password = new_hash
+            db.add(user)
+            db.flush()
+            invalidate_user(db, user.id)
         return user
 
     def is_active(self, user: User) -> bool:
@@ -22,8 +22,7 @@ class CRUDUserCareerPlan(CRUDBase[UserCareerPlan, UserCareerPlanCreate, UserCare
             **obj_in.model_dump()
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
     
     def update_for_user(
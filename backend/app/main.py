@@ -1,14 +1,49 @@
 """Main application entry point."""
-from fastapi import FastAPI
+import os
+import time
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.database import async_engine, async_replica_engine
+from app.core.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+)
+from app.core.password_pool import PasswordPoolBusy, password_pool
+from app.core.profiling import is_profiling_requested, request_profiler
+from app.core.query_stats import report_request, track_queries
+from app.core.slow_query_log import slow_query_log
+from app.core.tracing import start_trace, tracer
+from app.services.answer_buffer import answer_buffer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop process-wide resources."""
+    yield
+    # Drain autosaved answers while the database is still reachable
+    answer_buffer.shutdown()
+    password_pool.shutdown()
+    slow_query_log.shutdown()
+    tracer.shutdown()
+    await async_engine.dispose()
+    if async_replica_engine is not async_engine:
+        await async_replica_engine.dispose()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -23,7 +58,92 @@ app.add_middleware(
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    """
+    Profile sampled requests, or admin requests carrying the profile header.
+
+    The folded stack file of a requested profile is named in X-Profile-File.
+    """
+    requested = is_profiling_requested(request.headers)
+    profiler = request_profiler.start(requested)
+    if profiler is None:
+        return await call_next(request)
+    try:
+        response = await call_next(request)
+    finally:
+        session = request_profiler.stop(profiler)
+    route = request.scope.get("route")
+    path = f"{request.method} {route.path if route else 'unmatched'}"
+    try:
+        written = await anyio.to_thread.run_sync(request_profiler.record, path, session)
+    except Exception as e:
+        print(f"Failed to record profile for {path}: {e}")
+    else:
+        if requested:
+            response.headers["X-Profile-File"] = os.path.basename(written)
+    return response
+
+
+@app.middleware("http")
+async def instrument_request(request: Request, call_next):
+    """
+    Record latency, in-flight requests and SQL statements per route.
+
+    Statement counts are also exposed as headers in debug mode. Sampled
+    requests are traced, and the trace id is returned in X-Trace-Id.
+    """
+    started_at = time.perf_counter()
+    status = 500
+    REQUESTS_IN_FLIGHT.inc()
+    with start_trace(
+        f"{request.method} {request.url.path}",
+        traceparent=request.headers.get("traceparent"),
+        **{"http.method": request.method, "http.target": request.url.path},
+    ) as root:
+        try:
+            with track_queries() as stats:
+                response = await call_next(request)
+            status = response.status_code
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # Label by route template so ids in the path don't split the series
+            route = request.scope.get("route")
+            path = route.path if route else "unmatched"
+            REQUEST_LATENCY.labels(request.method, path, status).observe(
+                time.perf_counter() - started_at
+            )
+            root.name = f"{request.method} {path}"
+            root.set_attribute("http.route", path)
+            root.set_attribute("http.status_code", status)
+            root.set_attribute("db.statement_count", stats.count)
+    if root.sampled:
+        response.headers["X-Trace-Id"] = root.trace_id
+    DB_QUERIES_PER_REQUEST.labels(path).observe(stats.count)
+    report_request(path, stats)
+    if settings.DEBUG:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.duration * 1000:.1f}"
+    return response
+
+
+@app.exception_handler(PasswordPoolBusy)
+async def password_pool_busy_handler(request: Request, exc: PasswordPoolBusy):
+    """Shed login and registration load instead of queueing it."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many concurrent sign-ins, please retry shortly"},
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "version": settings.VERSION} 
\ No newline at end of file
+    return {"status": "healthy", "version": settings.VERSION} 
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics; collected on the event loop for threadpool stats."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,8 +1,13 @@
 """Database models."""
-from .ai_feedback import AIFeedback  # noqa
+from .ai_feedback import AIFeedback, AIFeedbackVersion  # noqa
 from .answer import Answer  # noqa
+from .auth_token import RefreshToken, TokenRevocation  # noqa
 from .company_average_competency import CompanyAverageCompetency  # noqa
 from .competency_item import CompetencyItem  # noqa
+from .data_version import DataVersion  # noqa
+from .feedback_blob import FeedbackBlob  # noqa
+from .idempotency_key import IdempotencyKey  # noqa
+from .llm_usage import LLMUsage, LLMUsageDaily  # noqa
 from .question import Question  # noqa
 from .user import User  # noqa
 from .user_career_plan import UserCareerPlan  # noqa
@@ -17,4 +22,12 @@ __all__ = [
     "CompanyAverageCompetency",
     "UserCareerPlan",
     "AIFeedback",
+    "AIFeedbackVersion",
+    "FeedbackBlob",
+    "LLMUsage",
+    "LLMUsageDaily",
+    "RefreshToken",
+    "TokenRevocation",
+    "DataVersion",
+    "IdempotencyKey",
 ]
\ No newline at end of file
@@ -1,7 +1,8 @@
 """AI Feedback model."""
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -11,18 +12,65 @@ class AIFeedback(Base):
     """Model for storing AI-generated feedback."""
     
     __tablename__ = "ai_feedback"
+    __table_args__ = (
+        Index("ix_ai_feedback_user_id_generated_at", "user_id", "generated_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
-    # Feedback content stored as JSON
-    feedback_content = Column(JSON, nullable=False)
-    career_suggestions = Column(JSON, nullable=True)
-    book_recommendations = Column(JSON, nullable=True)
+    # Feedback content is stored once in feedback_blobs and referenced by hash,
+    # keeping these rows small for the per-user cache lookup.
+    feedback_hash = Column(String(64), ForeignKey("feedback_blobs.hash"), nullable=False)
+    suggestions_hash = Column(String(64), ForeignKey("feedback_blobs.hash"), nullable=True)
+    books_hash = Column(String(64), ForeignKey("feedback_blobs.hash"), nullable=True)
     
     # Metadata
     generated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="ai_feedback")
\ No newline at end of file
+    user = relationship("User", back_populates="ai_feedback")
+    feedback_blob = relationship("FeedbackBlob", foreign_keys=[feedback_hash])
+    suggestions_blob = relationship("FeedbackBlob", foreign_keys=[suggestions_hash])
+    books_blob = relationship("FeedbackBlob", foreign_keys=[books_hash])
+
+    @property
+    def feedback_content(self) -> Dict[str, str]:
+        """Feedback sections keyed by section name."""
+        return self.feedback_blob.payload
+
+    @property
+    def career_suggestions(self) -> Optional[List[str]]:
+        """Career suggestions, if any were generated."""
+        return self.suggestions_blob.payload if self.suggestions_blob else None
+
+    @property
+    def book_recommendations(self) -> Optional[List[Dict[str, Any]]]:
+        """Book recommendations, if any were generated."""
+        return self.books_blob.payload if self.books_blob else None
+
+
+class AIFeedbackVersion(Base):
+    """One generated feedback version; only references blobs by hash."""
+
+    __tablename__ = "ai_feedback_versions"
+    __table_args__ = (
+        Index("ix_ai_feedback_versions_user_id_generated_at", "user_id", "generated_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    feedback_hash = Column(String(64), ForeignKey("feedback_blobs.hash"), nullable=False)
+    suggestions_hash = Column(String(64), ForeignKey("feedback_blobs.hash"), nullable=True)
+    books_hash = Column(String(64), ForeignKey("feedback_blobs.hash"), nullable=True)
+    generated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    user = relationship("User", back_populates="ai_feedback_versions")
+    feedback_blob = relationship("FeedbackBlob", foreign_keys=[feedback_hash])
+
+    @property
+    def feedback_content(self) -> Dict[str, str]:
+        """Feedback sections keyed by section name."""
+        return self.feedback_blob.payload
@@ -0,0 +1,54 @@
+"""Refresh token and token revocation models."""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects import mysql
+
+from app.core.database import Base
+
+
+class RefreshToken(Base):
+    """
+    A server-side refresh token.
+
+    Only a SHA-256 digest of the token is stored. Every refresh rotates the
+    token within its family; presenting an already used token revokes the
+    whole family.
+    """
+
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (Index("ix_refresh_tokens_family_id", "family_id"),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    token_hash = Column(String(64), unique=True, nullable=False)
+    family_id = Column(String(32), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+
+
+class TokenRevocation(Base):
+    """
+    A revoked access token (by jti) or every token of a user issued up to
+    revoked_at (by user_id).
+
+    Rows are only needed until the tokens they cover have expired.
+    """
+
+    __tablename__ = "token_revocations"
+    __table_args__ = (Index("ix_token_revocations_expires_at", "expires_at"),)
+
+    id = Column(Integer, primary_key=True)
+    jti = Column(String(32), unique=True, nullable=True)
+    user_id = Column(Integer, nullable=True, index=True)
+    # Microseconds, compared with the sub-second iat of access tokens
+    revoked_at = Column(
+        DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        default=datetime.utcnow,
+        nullable=False,
+    )
+    expires_at = Column(DateTime, nullable=False)
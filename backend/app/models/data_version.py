@@ -0,0 +1,23 @@
+"""Version counters for slowly changing reference data."""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.core.database import Base
+
+
+class DataVersion(Base):
+    """
+    A counter bumped in the same transaction as any change to a data set.
+
+    Processes compare it with the version of their in-memory copy to find
+    out whether the copy is stale.
+    """
+
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
@@ -0,0 +1,51 @@
+"""Content-addressed storage for AI feedback payloads."""
+import hashlib
+import json
+import zlib
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from app.core.database import Base
+
+# MEDIUMBLOB on MySQL; compressed payloads are typically a few KB
+MAX_BLOB_BYTES = 2**24 - 1
+
+
+def canonical_json(payload: Any) -> bytes:
+    """Serialize a payload so that equal payloads produce equal bytes."""
+    return json.dumps(
+        payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FeedbackBlob(Base):
+    """A zlib-compressed JSON payload keyed by the SHA-256 of its content."""
+
+    __tablename__ = "feedback_blobs"
+
+    hash = Column(String(64), primary_key=True)
+    raw_size = Column(Integer, nullable=False)
+    data = Column(LargeBinary(length=MAX_BLOB_BYTES), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> "FeedbackBlob":
+        """Build a blob for payload; identical payloads get identical hashes."""
+        raw = canonical_json(payload)
+        return cls(
+            hash=hashlib.sha256(raw).hexdigest(),
+            raw_size=len(raw),
+            data=zlib.compress(raw, 6),
+        )
+
+    @property
+    def payload(self) -> Any:
+        """Decompressed payload, decoded once per loaded instance."""
+        cached = self.__dict__.get("_payload")
+        if cached is None:
+            cached = json.loads(zlib.decompress(self.data))
+            # Blobs are immutable, so the decoded value can be kept on the instance
+            self.__dict__["_payload"] = cached
+        return cached
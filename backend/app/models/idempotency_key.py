@@ -0,0 +1,61 @@
+"""Idempotency key model."""
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    String,
+    UniqueConstraint,
+)
+
+from app.core.database import Base
+from app.models.feedback_blob import MAX_BLOB_BYTES, canonical_json
+
+
+class IdempotencyKey(Base):
+    """
+    A request made with an Idempotency-Key header and the response it got.
+
+    The key is claimed in the transaction that performs the request's
+    writes, and the response is stored before that transaction commits.
+    A row without a response belongs to a request still in progress.
+    Rows are only needed until expires_at.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "key_hash", name="uq_idempotency_keys_user_key"),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    # SHA-256 digests, so client keys of any length take the same space
+    key_hash = Column(String(64), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(SmallInteger, nullable=True)
+    response = Column(LargeBinary(length=MAX_BLOB_BYTES), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    def set_response(self, status_code: int, content: Any) -> None:
+        """Store a JSON-compatible response body, compressed."""
+        self.status_code = status_code
+        self.response = zlib.compress(canonical_json(content), 6)
+
+    @property
+    def content(self) -> Optional[Any]:
+        """Decompressed response body, or None while in progress."""
+        if self.response is None:
+            return None
+        return json.loads(zlib.decompress(self.response))
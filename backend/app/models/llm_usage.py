@@ -0,0 +1,69 @@
+"""LLM usage ledger and daily rollup models."""
+from datetime import datetime
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+
+from app.core.database import Base
+
+
+class LLMUsage(Base):
+    """Append-only record of a single LLM provider call."""
+
+    __tablename__ = "llm_usage_ledger"
+    __table_args__ = (Index("ix_llm_usage_ledger_created_at", "created_at"),)
+
+    id = Column(Integer, primary_key=True)
+    # Kept after the user is deleted so historical spend stays accurate
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    department = Column(String(100), nullable=True)
+    prompt_version = Column(String(32), nullable=False)
+    model = Column(String(64), nullable=False)
+    # Prompt size as estimated before the call, to compare against usage
+    estimated_input_tokens = Column(Integer, default=0, nullable=False)
+    # Career plan fields shortened to fit the input token budget
+    truncated_fields = Column(JSON, default=list, nullable=False)
+    input_tokens = Column(Integer, default=0, nullable=False)
+    output_tokens = Column(Integer, default=0, nullable=False)
+    latency_ms = Column(Integer, default=0, nullable=False)
+    outcome = Column(String(16), nullable=False)
+    cost_usd = Column(Float, default=0.0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class LLMUsageDaily(Base):
+    """Per-user, per-day rollup of the LLM usage ledger."""
+
+    __tablename__ = "llm_usage_daily"
+    __table_args__ = (
+        UniqueConstraint("day", "user_id", name="uq_llm_usage_daily_day_user"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    department = Column(String(100), nullable=True)
+    call_count = Column(Integer, default=0, nullable=False)
+    error_count = Column(Integer, default=0, nullable=False)
+    input_tokens = Column(Integer, default=0, nullable=False)
+    output_tokens = Column(Integer, default=0, nullable=False)
+    cost_usd = Column(Float, default=0.0, nullable=False)
+    # Counts per latency bucket of provider calls (see crud_llm_usage)
+    latency_histogram = Column(JSON, nullable=False)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
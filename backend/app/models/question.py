@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -16,6 +16,9 @@ class Question(Base):
     """Question model."""
 
     __tablename__ = "questions"
+    __table_args__ = (
+        Index("ix_questions_competency_item_id_order", "competency_item_id", "order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     text = Column(Text, nullable=False)
@@ -41,4 +41,7 @@ class User(Base):
     )
     ai_feedback = relationship(
         "AIFeedback", back_populates="user", cascade="all, delete-orphan"
+    )
+    ai_feedback_versions = relationship(
+        "AIFeedbackVersion", back_populates="user", cascade="all, delete-orphan"
     )
\ No newline at end of file
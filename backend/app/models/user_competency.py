@@ -2,7 +2,15 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -16,6 +24,18 @@ class UserCompetency(Base):
     """User competency score model."""
 
     __tablename__ = "user_competencies"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "competency_item_id", name="uq_user_competencies_user_item"
+        ),
+        # Covers the per-item company average without touching the rows
+        Index(
+            "ix_user_competencies_item_user_score",
+            "competency_item_id",
+            "user_id",
+            "score",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,9 +1,12 @@
 """Pydantic schemas."""
-from .auth import Token, TokenPayload  # noqa
+from .auth import Logout, Token, TokenPayload, TokenRefresh  # noqa
 from .competency import (  # noqa
     Answer,
+    AnswerAutosave,
     AnswerBulkCreate,
     AnswerCreate,
+    CompactCompetencyItem,
+    CompactCompetencyResult,
     CompanyAverageCompetency,
     CompetencyItem,
     CompetencyResult,
@@ -13,11 +16,19 @@ from .competency import (  # noqa
 )
 from .user import User, UserCreate, UserInDB, UserUpdate  # noqa
 from .user_career_plan import UserCareerPlan, UserCareerPlanCreate, UserCareerPlanUpdate  # noqa
-from .ai_feedback import AIFeedback, AIFeedbackCreate, AIFeedbackUpdate  # noqa
+from .ai_feedback import AIFeedback, AIFeedbackCreate, AIFeedbackUpdate, AIFeedbackVersion  # noqa
+from .llm_usage import LLMUsageCreate, LLMUsageSummary  # noqa
+from .recommendation import UserRecommendations  # noqa
+from .cache import CacheStats  # noqa
+from .query_stats import RouteQueryStats  # noqa
+from .profiling import HotFunction, RouteProfile  # noqa
+from .bootstrap import Bootstrap  # noqa
 
 __all__ = [
     "Token",
     "TokenPayload",
+    "TokenRefresh",
+    "Logout",
     "User",
     "UserCreate",
     "UserUpdate",
@@ -28,13 +39,25 @@ __all__ = [
     "Answer",
     "AnswerCreate",
     "AnswerBulkCreate",
+    "AnswerAutosave",
     "UserCompetency",
     "CompanyAverageCompetency",
     "CompetencyResult",
+    "CompactCompetencyItem",
+    "CompactCompetencyResult",
     "UserCareerPlan",
     "UserCareerPlanCreate",
     "UserCareerPlanUpdate",
     "AIFeedback",
     "AIFeedbackCreate",
     "AIFeedbackUpdate",
+    "AIFeedbackVersion",
+    "LLMUsageCreate",
+    "LLMUsageSummary",
+    "UserRecommendations",
+    "CacheStats",
+    "RouteQueryStats",
+    "HotFunction",
+    "RouteProfile",
+    "Bootstrap",
 ]
\ No newline at end of file
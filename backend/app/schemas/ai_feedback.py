@@ -46,4 +46,15 @@ class AIFeedback(AIFeedbackInDBBase):
 class AIFeedbackInDB(AIFeedbackInDBBase):
     """Schema for AI feedback in database with all fields."""
     
-    pass
\ No newline at end of file
+    pass
+
+
+class AIFeedbackVersion(BaseModel):
+    """Schema for a previously generated feedback version."""
+    
+    id: int
+    generated_at: datetime
+    feedback_content: Dict[str, str]
+    
+    class Config:
+        from_attributes = True
@@ -9,6 +9,20 @@ class Token(BaseModel):
 
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+
+class TokenRefresh(BaseModel):
+    """Refresh token request schema."""
+
+    refresh_token: str
+
+
+class Logout(BaseModel):
+    """Logout request schema."""
+
+    refresh_token: Optional[str] = None
 
 
 class TokenPayload(BaseModel):
@@ -0,0 +1,19 @@
+"""Dashboard bootstrap schemas."""
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from .competency import CompetencyResult, QuestionWithAnswer
+from .user import User
+from .user_career_plan import UserCareerPlan
+
+
+class Bootstrap(BaseModel):
+    """Everything the dashboard shows after login, in one response."""
+
+    user: User
+    questions: List[QuestionWithAnswer]
+    career_plan: Optional[UserCareerPlan] = None
+    results: CompetencyResult
+    # Same body as GET /competencies/feedback
+    feedback: Dict[str, Any]
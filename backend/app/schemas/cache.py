@@ -0,0 +1,15 @@
+"""Cache statistics schemas."""
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    """Size, hit rate and eviction counters of an in-process cache."""
+
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    expirations: int
@@ -1,6 +1,6 @@
 """Competency related schemas."""
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -95,6 +95,12 @@ class AnswerCreate(AnswerBase):
     pass
 
 
+class AnswerAutosave(BaseModel):
+    """Schema for autosaving one answer."""
+
+    score: int
+
+
 class AnswerBulkCreate(BaseModel):
     """Schema for bulk answer submission."""
 
@@ -155,4 +161,28 @@ class CompetencyResult(BaseModel):
     """Schema for competency evaluation result."""
 
     user_competencies: List[UserCompetency]
-    company_averages: List[CompanyAverageCompetency]
\ No newline at end of file
+    company_averages: List[CompanyAverageCompetency]
+
+
+class CompactCompetencyItem(BaseModel):
+    """Competency item as listed once in a compact result."""
+
+    name: str
+    description: Optional[str] = None
+    order: int = 0
+
+
+class CompactCompetencyResult(BaseModel):
+    """
+    Competency evaluation result without repeated competency items.
+
+    Items are listed once keyed by id; the score lists run parallel to
+    item_ids and hold null where there is no score.
+    """
+
+    items: Dict[int, CompactCompetencyItem]
+    item_ids: List[int]
+    user_scores: List[Optional[float]]
+    company_averages: List[Optional[float]]
+    company_total_users: List[Optional[int]]
+    calculated_at: Optional[datetime] = None
@@ -0,0 +1,32 @@
+"""LLM usage schemas."""
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class LLMUsageCreate(BaseModel):
+    """Schema for recording one LLM provider call."""
+
+    user_id: Optional[int] = None
+    department: Optional[str] = None
+    prompt_version: str
+    model: str
+    estimated_input_tokens: int = 0
+    truncated_fields: List[str] = []
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: int = 0
+    outcome: str
+
+
+class LLMUsageSummary(BaseModel):
+    """Aggregated LLM usage for one day or one department."""
+
+    key: Optional[str] = None
+    calls: int
+    errors: int
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float
+    latency_p50_ms: Optional[int] = None
+    latency_p95_ms: Optional[int] = None
@@ -0,0 +1,21 @@
+"""Request profiling schemas."""
+from typing import List
+
+from pydantic import BaseModel
+
+
+class HotFunction(BaseModel):
+    """A function's own running time across a route's profiles."""
+
+    function: str
+    self_ms: float
+    share: float
+
+
+class RouteProfile(BaseModel):
+    """Profiles recorded for one route since the process started."""
+
+    route: str
+    profiles: int
+    avg_duration_ms: float
+    hot_functions: List[HotFunction]
@@ -0,0 +1,14 @@
+"""SQL statement statistics schemas."""
+from pydantic import BaseModel
+
+
+class RouteQueryStats(BaseModel):
+    """Statements issued by one route since the process started."""
+
+    route: str
+    requests: int
+    queries: int
+    avg_queries: float
+    max_queries: int
+    avg_db_time_ms: float
+    n_plus_one_requests: int
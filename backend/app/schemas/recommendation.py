@@ -0,0 +1,15 @@
+"""Recommendation schemas."""
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class UserRecommendations(BaseModel):
+    """Catalog recommendations evaluated for one user."""
+
+    user_id: int
+    name: str
+    department: Optional[str] = None
+    career_suggestions: List[str]
+    trainings: List[str]
+    book_recommendations: List[Dict[str, str]]
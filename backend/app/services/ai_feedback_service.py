@@ -1,12 +1,40 @@
 """AI feedback service for competency evaluation."""
-import json
-from typing import Dict, List, Optional
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
 from openai import OpenAI
-from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models import CompanyAverageCompetency, CompetencyItem, UserCompetency, UserCareerPlan
+from app.core.metrics import LLM_CALL_SECONDS
+from app.core.tracing import span, traced
+from app.models import CompanyAverageCompetency, UserCompetency, UserCareerPlan
+from app.services.prompt_builder import (
+    PROMPT_VERSION,
+    build_enhanced_feedback_prompt,
+    build_feedback_prompt,
+)
+from app.services.recommendation_engine import (
+    build_context,
+    get_recommendation_engine,
+)
+
+
+@dataclass
+class LLMCallStats:
+    """Prompt size and provider usage recorded for a single LLM call."""
+
+    prompt_version: str
+    model: str
+    prompt_chars: int
+    estimated_input_tokens: int
+    truncated_fields: Tuple[str, ...] = ()
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    latency_ms: Optional[float] = None
+    outcome: str = "pending"
+    created_at: datetime = field(default_factory=datetime.utcnow)
 
 
 class AIFeedbackService:
@@ -31,9 +59,28 @@ class AIFeedbackService:
         """
         Generate enhanced personalized feedback with career plan consideration.
         """
+        feedback, _ = self.generate_enhanced_competency_feedback_with_stats(
+            user_competencies, company_averages, career_plan, user_name
+        )
+        return feedback
+
+    @traced("ai_feedback.generate")
+    def generate_enhanced_competency_feedback_with_stats(
+        self,
+        user_competencies: List[UserCompetency],
+        company_averages: List[CompanyAverageCompetency],
+        career_plan: Optional[UserCareerPlan] = None,
+        user_name: str = "あなた",
+    ) -> Tuple[Dict[str, str], Optional[LLMCallStats]]:
+        """
+        Generate enhanced feedback and return the stats of the provider call.
+
+        Stats are None when no provider call was made (no API key configured).
+        """
         if not hasattr(self, 'api_key') or not self.api_key:
-            return self._generate_enhanced_default_feedback(user_competencies, company_averages, career_plan)
+            return self._generate_enhanced_default_feedback(user_competencies, company_averages, career_plan), None
 
+        stats: Optional[LLMCallStats] = None
         try:
             # Prepare comprehensive competency data
             competency_data = []
@@ -44,7 +91,6 @@ class AIFeedbackService:
                 )
                 competency_data.append({
                     "name": uc.competency_item.name,
-                    "description": uc.competency_item.description,
                     "user_score": uc.score,
                     "company_average": company_avg.average_score if company_avg else None,
                     "difference": uc.score - company_avg.average_score if company_avg else None,
@@ -52,39 +98,75 @@ class AIFeedbackService:
                 })
 
             # Generate enhanced feedback using OpenAI
-            prompt = self._create_enhanced_feedback_prompt(competency_data, career_plan, user_name)
+            system_prompt = self._get_hr_consultant_system_prompt()
+            with span("ai_feedback.build_prompt") as prompt_span:
+                built = build_enhanced_feedback_prompt(
+                    competency_data,
+                    career_plan,
+                    user_name,
+                    max_input_tokens=settings.AI_FEEDBACK_MAX_INPUT_TOKENS,
+                    system_prompt=system_prompt,
+                )
+                prompt_span.set_attribute("prompt.chars", len(built.text))
+                prompt_span.set_attribute("prompt.estimated_tokens", built.estimated_tokens)
+            stats = LLMCallStats(
+                prompt_version=PROMPT_VERSION,
+                model=settings.AI_FEEDBACK_MODEL,
+                prompt_chars=len(built.text),
+                estimated_input_tokens=built.estimated_tokens,
+                truncated_fields=built.truncated_fields,
+            )
             
-            print(f"🤖 [AI FEEDBACK] Starting OpenAI GPT-4 request for user: {user_name}")
-            print(f"🤖 [AI FEEDBACK] Model: gpt-4, Max tokens: 2500, Temperature: 0.7")
-            print(f"🤖 [AI FEEDBACK] Prompt length: {len(prompt)} characters")
+            print(f"🤖 [AI FEEDBACK] Starting OpenAI request for user: {user_name}")
+            print(
+                f"🤖 [AI FEEDBACK] Model: {stats.model}, "
+                f"estimated input tokens: {stats.estimated_input_tokens}, "
+                f"truncated fields: {', '.join(stats.truncated_fields) or 'none'}"
+            )
             
             # Create a new OpenAI client for each request
-            from openai import OpenAI
             temp_client = OpenAI(api_key=self.api_key)
             
-            import time
-            start_time = time.time()
-            response = temp_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": self._get_hr_consultant_system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2500,
-                temperature=0.7,
+            start_time = time.perf_counter()
+            with span("llm.chat_completion", **{"llm.model": stats.model}) as llm_span:
+                try:
+                    response = temp_client.chat.completions.create(
+                        model=stats.model,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": built.text}
+                        ],
+                        max_tokens=settings.AI_FEEDBACK_MAX_OUTPUT_TOKENS,
+                        temperature=0.7,
+                    )
+                finally:
+                    stats.latency_ms = (time.perf_counter() - start_time) * 1000
+                
+                if response.usage:
+                    stats.input_tokens = response.usage.prompt_tokens
+                    stats.output_tokens = response.usage.completion_tokens
+                    llm_span.set_attribute("llm.input_tokens", stats.input_tokens)
+                    llm_span.set_attribute("llm.output_tokens", stats.output_tokens)
+            stats.outcome = "success"
+            print(
+                f"🤖 [AI FEEDBACK] OpenAI response received in {stats.latency_ms / 1000:.2f} seconds "
+                f"(input tokens: {stats.input_tokens}, output tokens: {stats.output_tokens})"
             )
-            end_time = time.time()
-            
-            print(f"🤖 [AI FEEDBACK] OpenAI response received in {end_time - start_time:.2f} seconds")
-            print(f"🤖 [AI FEEDBACK] Response tokens: {response.usage.total_tokens if response.usage else 'unknown'}")
-            print(f"🤖 [AI FEEDBACK] Processing AI response...")
             
             feedback_text = response.choices[0].message.content
-            return self._parse_enhanced_feedback(feedback_text)
+            with span("ai_feedback.parse_response"):
+                return self._parse_enhanced_feedback(feedback_text), stats
             
         except Exception as e:
             print(f"Enhanced AI feedback generation failed: {e}")
-            return self._generate_enhanced_default_feedback(user_competencies, company_averages, career_plan)
+            if stats is not None:
+                stats.outcome = "error"
+            return self._generate_enhanced_default_feedback(user_competencies, company_averages, career_plan), stats
+        finally:
+            if stats is not None and stats.latency_ms is not None:
+                LLM_CALL_SECONDS.labels(stats.model, stats.outcome).observe(
+                    stats.latency_ms / 1000
+                )
 
     def generate_competency_feedback(
         self,
@@ -147,39 +229,7 @@ class AIFeedbackService:
 
     def _create_feedback_prompt(self, competency_data: List[Dict], user_name: str) -> str:
         """Create prompt for AI feedback generation."""
-        data_str = json.dumps(competency_data, ensure_ascii=False, indent=2)
-        
-        return f"""
-以下は{user_name}のコンピテンシー評価結果です：
-
-{data_str}
-
-各コンピテンシーについて、以下の形式で簡潔で具体的なフィードバックを提供してください：
-
-1. **強み（3点以上のコンピテンシー）**: 
-   - 何が優れているか
-   - どのように活かせるか
-
-2. **改善点（3点未満のコンピテンシー）**:
-   - 具体的な改善方法
-   - 取り組むべき行動
-
-3. **総合評価**:
-   - 全体的な傾向
-   - 優先すべき成長領域
-
-以下のフォーマットで回答してください：
-STRENGTHS:
-[強みの内容]
-
-IMPROVEMENTS:
-[改善点の内容]
-
-OVERALL:
-[総合評価]
-
-各項目は200文字以内で、実用的で理解しやすい日本語で記述してください。
-"""
+        return build_feedback_prompt(competency_data, user_name)
 
     def _parse_ai_feedback(self, feedback_text: str, user_competencies: List[UserCompetency]) -> Dict[str, str]:
         """Parse AI feedback response into structured format."""
@@ -247,37 +297,12 @@ OVERALL:
         user_competencies: List[UserCompetency],
         user_department: Optional[str] = None,
         user_position: Optional[str] = None,
+        career_plan: Optional[UserCareerPlan] = None,
     ) -> List[str]:
-        """Generate career development suggestions."""
-        suggestions = []
-        
-        # Analyze top competencies
-        top_competencies = sorted(user_competencies, key=lambda x: x.score, reverse=True)[:3]
-        weak_competencies = sorted(user_competencies, key=lambda x: x.score)[:2]
-        
-        # Generate suggestions based on strengths
-        for comp in top_competencies:
-            if comp.competency_item.name == "リーダーシップ" and comp.score >= 4.0:
-                suggestions.append("チームリーダーやプロジェクトマネージャーの役割にチャレンジしてみましょう")
-            elif comp.competency_item.name == "コミュニケーション" and comp.score >= 4.0:
-                suggestions.append("メンター役や新人教育担当として活躍できる可能性があります")
-            elif comp.competency_item.name == "イノベーション" and comp.score >= 4.0:
-                suggestions.append("新規事業開発や改善提案のプロジェクトに参加してみましょう")
-        
-        # Generate suggestions based on weaknesses
-        for comp in weak_competencies:
-            if comp.competency_item.name == "時間管理" and comp.score < 3.0:
-                suggestions.append("タスク管理ツールの活用や時間管理研修の受講をおすすめします")
-            elif comp.competency_item.name == "専門知識" and comp.score < 3.0:
-                suggestions.append("業界の最新動向を学ぶための勉強会や研修への参加を検討しましょう")
-        
-        # Add general suggestions
-        if not suggestions:
-            suggestions.append("現在の強みを活かしつつ、新しい挑戦にも取り組んでみましょう")
-        
-        suggestions.append("定期的な振り返りと目標設定を行い、継続的な成長を目指しましょう")
-        
-        return suggestions[:5]  # Return top 5 suggestions
+        """Generate career development suggestions from the recommendation catalog."""
+        scores = {uc.competency_item.name: uc.score for uc in user_competencies}
+        context = build_context(career_plan, user_department, user_position)
+        return get_recommendation_engine().recommend(scores, context).career_suggestions
 
     def _get_hr_consultant_system_prompt(self) -> str:
         """Get system prompt for HR consultant persona."""
@@ -310,84 +335,13 @@ OVERALL:
         self, competency_data: List[Dict], career_plan: Optional[UserCareerPlan], user_name: str
     ) -> str:
         """Create enhanced prompt for AI feedback generation."""
-        data_str = json.dumps(competency_data, ensure_ascii=False, indent=2)
-        
-        career_info = ""
-        if career_plan:
-            career_info = f"""
-【キャリアプラン情報】
-- 目指す方向性: {career_plan.career_direction or "未設定"}
-- 目標ポジション: {career_plan.target_position or "未設定"}
-- 達成時期: {career_plan.target_timeframe or "未設定"}
-- 活かしたい強み: {career_plan.strengths_to_enhance or "未設定"}
-- 克服したい弱み: {career_plan.weaknesses_to_overcome or "未設定"}
-- 具体的な目標: {career_plan.specific_goals or "未設定"}
-- 性格特性: {career_plan.personality_traits or "未設定"}
-- 学習スタイル: {career_plan.preferred_learning_style or "未設定"}
-- 現在の課題: {career_plan.challenges_faced or "未設定"}
-- モチベーション要因: {career_plan.motivation_factors or "未設定"}
-"""
-        
-        return f"""
-【対象者】: {user_name}
-
-【コンピテンシー評価結果】
-{data_str}
-
-{career_info}
-
-【依頼内容】
-上記の評価結果とキャリアプランを踏まえ、HRプロフェッショナルとして以下の観点から厳格かつ実践的なフィードバックを提供してください：
-
-1. **現状分析**: 
-   - 強みと弱みの客観的な分析
-   - 目標達成に向けた現在地の評価
-   - 会社平均との比較から見える課題
-
-2. **戦略的アドバイス**:
-   - 強みを最大限活用する具体的方法
-   - 弱みを補強する実践的アプローチ
-   - 他者との協働による弱み対策
-
-3. **実行計画**:
-   - 短期（3ヶ月）・中期（1年）・長期（3年）の目標設定
-   - 具体的な行動ステップ
-   - 進捗測定方法
-
-4. **学習リソース**:
-   - 推奨書籍（3冊程度）
-   - 具体的な学習・トレーニング方法
-   - 実践的なスキル習得方法
-
-5. **厳格な評価**:
-   - 現実的な課題と障害
-   - 本人が向き合うべき厳しい現実
-   - 成長に必要な意識改革
-
-【出力フォーマット】
-以下の形式で日本語で回答してください。セクションヘッダーは必ず英語で記述し、【】は使用しないでください：
-
-STRENGTH_ANALYSIS:
-[強みの分析と活用戦略]
-
-WEAKNESS_STRATEGY:
-[弱みの克服戦略と実践方法]
-
-ACTION_PLAN:
-[具体的な行動計画]
-
-LEARNING_RESOURCES:
-[学習リソースと推奨書籍]
-
-REALITY_CHECK:
-[厳格な現実評価と必要な意識改革]
-
-OVERALL_STRATEGY:
-[総合的な成長戦略]
-
-重要: セクションヘッダーは必ず「STRENGTH_ANALYSIS:」「WEAKNESS_STRATEGY:」などの英語形式で記述してください。
-各セクションは300文字以内で、具体的で実践的な内容にしてください。
-"""
+        return build_enhanced_feedback_prompt(
+            competency_data,
+            career_plan,
+            user_name,
+            max_input_tokens=settings.AI_FEEDBACK_MAX_INPUT_TOKENS,
+            system_prompt=self._get_hr_consultant_system_prompt(),
+        ).text
 
     def _parse_enhanced_feedback(self, feedback_text: str) -> Dict[str, str]:
         """Parse enhanced AI feedback response."""
@@ -532,29 +486,8 @@ OVERALL_STRATEGY:
 
     def generate_book_recommendations(self, competency_data: List[Dict], career_plan: Optional[UserCareerPlan] = None) -> List[Dict[str, str]]:
         """Generate book recommendations based on competency gaps and career goals."""
-        # Default recommendations based on common business competencies
-        recommendations = [
-            {
-                "title": "7つの習慣",
-                "author": "スティーブン・R・コヴィー",
-                "reason": "個人の効果性を高める基本的な原則を学べる必読書",
-                "category": "自己啓発・リーダーシップ"
-            },
-            {
-                "title": "人を動かす",
-                "author": "デール・カーネギー",
-                "reason": "対人関係とコミュニケーションスキルの向上に最適",
-                "category": "コミュニケーション"
-            },
-            {
-                "title": "エッセンシャル思考",
-                "author": "グレッグ・マキューン",
-                "reason": "重要なことに集中し、生産性を向上させる思考法",
-                "category": "時間管理・生産性"
-            }
-        ]
-        
-        return recommendations
+        scores = {row["name"]: row["score"] for row in competency_data}
+        return get_recommendation_engine().recommend(scores, build_context(career_plan)).books
 
 
 ai_feedback_service = AIFeedbackService()
\ No newline at end of file
@@ -0,0 +1,225 @@
+"""Write-behind buffer for autosaved answers."""
+import threading
+from typing import Callable, Dict, Mapping, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.read_routing import recent_writers
+from app.crud.crud_competency import UnknownQuestionError
+
+# Score by question id, by user id
+Batch = Dict[int, Dict[int, int]]
+
+_SESSION_TAKEN = "autosaves_taken"
+
+
+class AnswerWriteBuffer:
+    """
+    Coalesces autosaved answers in memory and writes them in batches.
+
+    Only the latest score per user and question is kept. A background thread
+    writes everything pending every flush_seconds, or sooner once
+    max_pending answers are waiting, in one multi-row upsert.
+
+    Durability: an autosave is acknowledged before it is written, so it
+    lives only in this process until the next flush. Submitting answers
+    takes the user's pending autosaves out of the buffer and writes them in
+    the same transaction, putting them back if it rolls back; reads of a
+    user's answers write theirs first; shutdown drains the buffer. A crash
+    can lose at most the last flush_seconds of autosaves, and a failed
+    flush keeps its answers for the next one. Buffers are per process, so
+    with several workers the final state is the one the client submits.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        flush_seconds: float,
+        max_pending: int,
+    ):
+        """Start empty; the flush thread starts with the first autosave."""
+        self.session_factory = session_factory
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending: Batch = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        # Serializes writes so a flush never overtakes an earlier one
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def put(self, user_id: int, question_id: int, score: int) -> None:
+        """Buffer a score, replacing any pending score for the question."""
+        self._start()
+        with self._lock:
+            user_scores = self._pending.setdefault(user_id, {})
+            if question_id not in user_scores:
+                self._size += 1
+            user_scores[question_id] = score
+            full = self._size >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def pending(self, user_id: int) -> Dict[int, int]:
+        """Copy a user's pending scores."""
+        with self._lock:
+            return dict(self._pending.get(user_id, {}))
+
+    def has_pending(self, user_id: int) -> bool:
+        """Whether any of the user's autosaves are not yet written."""
+        return user_id in self._pending
+
+    def take(self, user_id: int) -> Dict[int, int]:
+        """
+        Remove a user's pending scores so the caller can write them.
+
+        Waits for a flush in progress, so none of the user's earlier
+        autosaves can be written after the caller's transaction.
+        """
+        with self._write_lock:
+            with self._lock:
+                user_scores = self._pending.pop(user_id, {})
+                self._size -= len(user_scores)
+        return user_scores
+
+    def restore_on_rollback(
+        self, db: Session, user_id: int, taken: Mapping[int, int]
+    ) -> None:
+        """Put taken scores back if the session's transaction rolls back."""
+        if taken:
+            db.info.setdefault(_SESSION_TAKEN, []).append((self, {user_id: taken}))
+
+    def flush(self) -> int:
+        """Write every pending score; returns the number of answers written."""
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending, self._size = self._pending, {}, 0
+            return self._write(batch)
+
+    def flush_user(self, user_id: int) -> int:
+        """Write one user's pending scores now."""
+        with self._write_lock:
+            with self._lock:
+                user_scores = self._pending.pop(user_id, None)
+                if user_scores is None:
+                    return 0
+                self._size -= len(user_scores)
+            return self._write({user_id: user_scores})
+
+    def shutdown(self) -> None:
+        """Stop the flush thread and write everything still pending."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join(timeout=10)
+            self._stop.clear()
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Failed to drain autosaved answers: {e}")
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="answer-autosave", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Failed to flush autosaved answers: {e}")
+
+    def _write(self, batch: Batch) -> int:
+        if not batch:
+            return 0
+        try:
+            self._upsert(batch)
+        except UnknownQuestionError as e:
+            # Questions deleted since the autosave; drop them and retry
+            print(f"Dropping autosaved answers to unknown questions: {e}")
+            for user_scores in batch.values():
+                for question_id in e.question_ids:
+                    user_scores.pop(question_id, None)
+            return self._write({user_id: s for user_id, s in batch.items() if s})
+        except IntegrityError as e:
+            if len(batch) == 1:
+                # Rejected for another reason, e.g. the user was deleted
+                print(f"Dropping autosaved answers of user {next(iter(batch))}: {e}")
+                return 0
+            # Write users one by one so a bad answer only costs its owner
+            return self._write_each(batch)
+        except Exception:
+            self._restore(batch)
+            raise
+        for user_id in batch:
+            recent_writers.set(user_id, True)
+        return sum(len(user_scores) for user_scores in batch.values())
+
+    def _write_each(self, batch: Batch) -> int:
+        written = 0
+        users = list(batch.items())
+        for i, (user_id, user_scores) in enumerate(users):
+            try:
+                written += self._write({user_id: user_scores})
+            except Exception:
+                self._restore(dict(users[i + 1 :]))
+                raise
+        return written
+
+    def _upsert(self, batch: Batch) -> None:
+        db = self.session_factory()
+        try:
+            crud.crud_answer.upsert_scores(db, scores=batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _restore(self, batch: Batch) -> None:
+        # Scores autosaved while the write was failing are newer; keep them
+        with self._lock:
+            for user_id, user_scores in batch.items():
+                pending = self._pending.setdefault(user_id, {})
+                for question_id, score in user_scores.items():
+                    if question_id not in pending:
+                        pending[question_id] = score
+                        self._size += 1
+
+
+answer_buffer = AnswerWriteBuffer(
+    SessionLocal,
+    flush_seconds=settings.ANSWER_AUTOSAVE_FLUSH_SECONDS,
+    max_pending=settings.ANSWER_AUTOSAVE_MAX_PENDING,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_taken_autosaves(session: Session) -> None:
+    session.info.pop(_SESSION_TAKEN, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _restore_taken_autosaves(session: Session) -> None:
+    for buffer, batch in session.info.pop(_SESSION_TAKEN, ()):
+        buffer._restore(batch)
@@ -0,0 +1,257 @@
+"""Versioned in-memory snapshot of the questionnaire catalog."""
+import time
+from dataclasses import dataclass
+from itertools import chain
+from types import MappingProxyType
+from typing import Callable, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+import msgpack
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app import crud, schemas
+from app.core.config import settings
+from app.core.encoding import packb
+from app.crud.crud_data_version import CATALOG, version_number
+from app.models import CompetencyItem, Question
+
+_CATALOG_MODELS = (CompetencyItem, Question)
+_SESSION_BUMPED = "catalog_version_bumped"
+
+_items_adapter = TypeAdapter(List[schemas.CompetencyItem])
+_questions_adapter = TypeAdapter(List[schemas.Question])
+
+M = TypeVar("M", bound=BaseModel)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Competency items and questions as of one catalog version.
+
+    Responses are encoded as JSON and as MessagePack once when the snapshot
+    is built, so serving the catalog is a copy of bytes. Shared between
+    threads; never mutated.
+    """
+
+    version: int
+    items: Tuple[schemas.CompetencyItem, ...]
+    questions: Tuple[schemas.Question, ...]
+    # question id -> competency item id
+    question_items: Mapping[int, int]
+    items_json: bytes
+    questions_json: bytes
+    question_json: Mapping[int, bytes]
+    # Each question's encoding, open for its user_answer value
+    answer_prefixes: Tuple[Tuple[int, bytes], ...]
+    items_msgpack: bytes
+    questions_msgpack: bytes
+    question_msgpack: Mapping[int, bytes]
+    answer_prefixes_msgpack: Tuple[Tuple[int, bytes], ...]
+
+    @classmethod
+    def build(
+        cls, version: int, items: List[CompetencyItem], questions: List[Question]
+    ) -> "CatalogSnapshot":
+        """Copy loaded rows into response models and encode them."""
+        item_models = [schemas.CompetencyItem.model_validate(i) for i in items]
+        question_models = [schemas.Question.model_validate(q) for q in questions]
+        question_json = {q.id: q.model_dump_json().encode() for q in question_models}
+        question_data = {q.id: q.model_dump(mode="json") for q in question_models}
+        return cls(
+            version=version,
+            items=tuple(item_models),
+            questions=tuple(question_models),
+            question_items=MappingProxyType(
+                {q.id: q.competency_item_id for q in question_models}
+            ),
+            items_json=_items_adapter.dump_json(item_models),
+            questions_json=_questions_adapter.dump_json(question_models),
+            question_json=MappingProxyType(question_json),
+            # user_answer is the last field of QuestionWithAnswer
+            answer_prefixes=tuple(
+                (q.id, question_json[q.id][:-1] + b',"user_answer":')
+                for q in question_models
+            ),
+            items_msgpack=_msgpack_list(item_models),
+            questions_msgpack=_msgpack_list(question_models),
+            question_msgpack=MappingProxyType(
+                {qid: packb(data) for qid, data in question_data.items()}
+            ),
+            # Packed with a nil user_answer as the last entry, then cut before it
+            answer_prefixes_msgpack=tuple(
+                (q.id, packb({**question_data[q.id], "user_answer": None})[:-1])
+                for q in question_models
+            ),
+        )
+
+    def items_page_json(self, skip: int, limit: int) -> bytes:
+        """Encoded competency items, pre-encoded unless a real page is asked."""
+        return _page(self.items_json, _items_adapter.dump_json, self.items, skip, limit)
+
+    def questions_page_json(self, skip: int, limit: int) -> bytes:
+        """Encoded questions, pre-encoded unless a real page is asked."""
+        return _page(
+            self.questions_json,
+            _questions_adapter.dump_json,
+            self.questions,
+            skip,
+            limit,
+        )
+
+    def items_page_msgpack(self, skip: int, limit: int) -> bytes:
+        """MessagePack variant of items_page_json."""
+        return _page(self.items_msgpack, _msgpack_list, self.items, skip, limit)
+
+    def questions_page_msgpack(self, skip: int, limit: int) -> bytes:
+        """MessagePack variant of questions_page_json."""
+        return _page(self.questions_msgpack, _msgpack_list, self.questions, skip, limit)
+
+    def questions_with_answers_json(self, answers: Mapping[int, int]) -> bytes:
+        """Encode every question with the user's score spliced in."""
+        parts = []
+        for question_id, prefix in self.answer_prefixes:
+            score = answers.get(question_id)
+            parts.append(prefix)
+            parts.append(b"null}," if score is None else b"%d}," % score)
+        if not parts:
+            return b"[]"
+        # Drop the comma after the last question
+        return b"[" + b"".join(parts)[:-1] + b"]"
+
+    def questions_with_answers_msgpack(self, answers: Mapping[int, int]) -> bytes:
+        """MessagePack variant of questions_with_answers_json."""
+        packer = msgpack.Packer()
+        parts = [packer.pack_array_header(len(self.answer_prefixes_msgpack))]
+        for question_id, prefix in self.answer_prefixes_msgpack:
+            parts.append(prefix)
+            parts.append(packer.pack(answers.get(question_id)))
+        return b"".join(parts)
+
+
+def _msgpack_list(models: Sequence[BaseModel]) -> bytes:
+    return packb([model.model_dump(mode="json") for model in models])
+
+
+def _page(
+    encoded: bytes,
+    encode: Callable[[List[M]], bytes],
+    models: Sequence[M],
+    skip: int,
+    limit: int,
+) -> bytes:
+    if skip <= 0 and limit >= len(models):
+        return encoded
+    return encode(list(models[skip : skip + limit]))
+
+
+class CatalogService:
+    """
+    Serves the catalog from a snapshot kept current by its version number.
+
+    The version row is read at most every check_seconds, so changes made by
+    other processes show up within that window; changes committed through
+    an ORM session of this process drop the snapshot immediately.
+    """
+
+    def __init__(self, check_seconds: float):
+        """Start without a snapshot; the first request loads it."""
+        self.check_seconds = check_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at = 0.0
+
+    def peek(self) -> Optional[CatalogSnapshot]:
+        """Return the snapshot if its version was checked recently enough."""
+        snapshot = self._snapshot
+        if (
+            snapshot is not None
+            and time.monotonic() - self._checked_at < self.check_seconds
+        ):
+            return snapshot
+        return None
+
+    def get(self, db: Session) -> CatalogSnapshot:
+        """Return a current snapshot, reloading it if the version moved."""
+        snapshot = self.peek()
+        if snapshot is not None:
+            return snapshot
+        # No lock: async callers run this on the event loop, and concurrent
+        # loads of the same version produce equal snapshots anyway
+        checked_at = time.monotonic()
+        version = catalog_version(db)
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != version:
+            snapshot = CatalogSnapshot.build(
+                version,
+                crud.crud_competency_item.get_all_with_questions(db),
+                crud.crud_question.get_all_with_competency(db),
+            )
+        self._snapshot = snapshot
+        self._checked_at = checked_at
+        return snapshot
+
+    async def get_async(self, db: AsyncSession) -> CatalogSnapshot:
+        """Async variant of get; no database round trip while fresh."""
+        return self.peek() or await db.run_sync(self.get)
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next request reloads it."""
+        self._snapshot = None
+
+
+catalog = CatalogService(check_seconds=settings.CATALOG_VERSION_CHECK_SECONDS)
+
+
+def catalog_version(db: Session) -> int:
+    """Read the committed catalog version (0 before the first change)."""
+    versions = crud.crud_data_version.get_versions(db, names=[CATALOG])
+    return version_number(versions, CATALOG)
+
+
+def bump_catalog_version(db: Session) -> None:
+    """
+    Increment the catalog version in the session's transaction.
+
+    ORM changes to competency items and questions do this automatically;
+    scripts that change the catalog with raw SQL must call it themselves.
+    """
+    crud.crud_data_version.bump(db, name=CATALOG)
+
+
+def _bump_once(session: Session) -> None:
+    if not session.info.get(_SESSION_BUMPED):
+        session.info[_SESSION_BUMPED] = True
+        bump_catalog_version(session)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_on_catalog_flush(session: Session, flush_context, instances) -> None:
+    changed = chain(
+        session.new,
+        session.deleted,
+        (obj for obj in session.dirty if session.is_modified(obj)),
+    )
+    if any(isinstance(obj, _CATALOG_MODELS) for obj in changed):
+        _bump_once(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_on_catalog_dml(state: ORMExecuteState) -> None:
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    mapper = state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _CATALOG_MODELS):
+        _bump_once(state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_catalog(session: Session) -> None:
+    if session.info.pop(_SESSION_BUMPED, False):
+        catalog.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_bump(session: Session) -> None:
+    session.info.pop(_SESSION_BUMPED, None)
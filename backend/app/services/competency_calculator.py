@@ -1,11 +1,16 @@
 """Competency calculation service."""
+import math
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import func, inspect
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app import crud
+from app.core.tracing import traced
+from app.crud.crud_data_version import COMPANY_COMPETENCIES
 from app.models import (
     Answer,
     CompanyAverageCompetency,
@@ -13,53 +18,61 @@ from app.models import (
     Question,
     UserCompetency,
 )
+from app.services.catalog import catalog
+
+
+def _same_score(stored: float, calculated: float) -> bool:
+    # MySQL FLOAT columns keep single precision, so compare loosely
+    return math.isclose(stored, calculated, rel_tol=1e-6)
 
 
 class CompetencyCalculator:
     """Service for calculating competency scores."""
 
     @staticmethod
+    @traced()
     def calculate_user_competencies(db: Session, user_id: int) -> List[UserCompetency]:
         """
         Calculate competency scores for a user based on their answers.
         
         Returns list of UserCompetency objects (not saved to DB).
         """
-        # Get all competency items with their questions
-        competency_items = crud.crud_competency_item.get_all_with_questions(db)
+        snapshot = catalog.get(db)
+        competency_items = {item.id: item for item in db.query(CompetencyItem)}
         
-        # Get user's answers
+        # Get user's answers, grouped by competency through the catalog
         user_answers = crud.crud_answer.get_user_answers(db, user_id=user_id)
-        answer_dict = {ans.question_id: ans.score for ans in user_answers}
+        scores_by_item: Dict[int, List[int]] = defaultdict(list)
+        for answer in user_answers:
+            competency_item_id = snapshot.question_items.get(answer.question_id)
+            if competency_item_id is not None:
+                scores_by_item[competency_item_id].append(answer.score)
+        
+        # Get user's previously calculated scores in one query
+        existing_scores = {
+            uc.competency_item_id: uc
+            for uc in db.query(UserCompetency).filter(UserCompetency.user_id == user_id)
+        }
         
         user_competencies = []
         
-        for competency_item in competency_items:
-            # Calculate average score for this competency
-            scores = []
-            for question in competency_item.questions:
-                if question.id in answer_dict:
-                    scores.append(answer_dict[question.id])
+        for item in snapshot.items:
+            scores = scores_by_item.get(item.id)
+            competency_item = competency_items.get(item.id)
             
-            if scores:
+            if scores and competency_item is not None:
                 # Calculate average score
                 avg_score = sum(scores) / len(scores)
                 
                 # Check if user competency already exists
-                existing = (
-                    db.query(UserCompetency)
-                    .filter(
-                        UserCompetency.user_id == user_id,
-                        UserCompetency.competency_item_id == competency_item.id
-                    )
-                    .first()
-                )
+                existing = existing_scores.get(competency_item.id)
                 
                 if existing:
-                    # Update existing
-                    existing.score = avg_score
-                    existing.calculated_at = datetime.utcnow()
-                    user_competencies.append(existing)
+                    # Update existing; an unchanged score keeps its timestamp
+                    if not _same_score(existing.score, avg_score):
+                        existing.score = avg_score
+                        existing.calculated_at = datetime.utcnow()
+                    user_competency = existing
                 else:
                     # Create new
                     user_competency = UserCompetency(
@@ -68,30 +81,37 @@ class CompetencyCalculator:
                         score=avg_score,
                         calculated_at=datetime.utcnow()
                     )
-                    user_competencies.append(user_competency)
+                # Attach the loaded item so serializing doesn't lazy-load it
+                set_committed_value(user_competency, "competency_item", competency_item)
+                user_competencies.append(user_competency)
         
         return user_competencies
 
     @staticmethod
+    @traced()
     def save_user_competencies(
         db: Session, user_competencies: List[UserCompetency]
     ) -> List[UserCompetency]:
         """Save calculated user competencies to database."""
+        # Scores feed the company averages, so changing any bumps their version
+        changed = any(
+            uc.id is None or inspect(uc).attrs.score.history.has_changes()
+            for uc in user_competencies
+        )
         for uc in user_competencies:
             if uc.id is None:
                 db.add(uc)
             else:
                 db.merge(uc)
         
-        db.commit()
-        
-        # Refresh all objects
-        for uc in user_competencies:
-            db.refresh(uc)
+        db.flush()
+        if changed:
+            crud.crud_data_version.bump(db, name=COMPANY_COMPETENCIES)
         
         return user_competencies
 
     @staticmethod
+    @traced()
     def calculate_company_averages(db: Session) -> List[CompanyAverageCompetency]:
         """
         Calculate company-wide average competency scores.
@@ -101,35 +121,37 @@ class CompetencyCalculator:
         # Get all competency items
         competency_items = db.query(CompetencyItem).all()
         
+        # Calculate averages across all users for every item in one query
+        results = {
+            row.competency_item_id: row
+            for row in db.query(
+                UserCompetency.competency_item_id,
+                func.avg(UserCompetency.score).label("avg_score"),
+                func.count(UserCompetency.user_id.distinct()).label("user_count")
+            ).group_by(UserCompetency.competency_item_id)
+        }
+        existing_averages = {
+            ca.competency_item_id: ca for ca in db.query(CompanyAverageCompetency)
+        }
+        
         company_averages = []
         
         for competency_item in competency_items:
-            # Calculate average across all users
-            result = (
-                db.query(
-                    func.avg(UserCompetency.score).label("avg_score"),
-                    func.count(UserCompetency.user_id.distinct()).label("user_count")
-                )
-                .filter(UserCompetency.competency_item_id == competency_item.id)
-                .first()
-            )
+            result = results.get(competency_item.id)
             
-            if result.avg_score is not None:
+            if result is not None and result.avg_score is not None:
                 # Check if company average already exists
-                existing = (
-                    db.query(CompanyAverageCompetency)
-                    .filter(
-                        CompanyAverageCompetency.competency_item_id == competency_item.id
-                    )
-                    .first()
-                )
+                existing = existing_averages.get(competency_item.id)
                 
                 if existing:
-                    # Update existing
-                    existing.average_score = float(result.avg_score)
-                    existing.total_users = result.user_count
-                    existing.calculated_at = datetime.utcnow()
-                    company_averages.append(existing)
+                    # Update existing; an unchanged average keeps its timestamp
+                    if not _same_score(
+                        existing.average_score, float(result.avg_score)
+                    ) or existing.total_users != result.user_count:
+                        existing.average_score = float(result.avg_score)
+                        existing.total_users = result.user_count
+                        existing.calculated_at = datetime.utcnow()
+                    company_avg = existing
                 else:
                     # Create new
                     company_avg = CompanyAverageCompetency(
@@ -138,11 +160,13 @@ class CompetencyCalculator:
                         total_users=result.user_count,
                         calculated_at=datetime.utcnow()
                     )
-                    company_averages.append(company_avg)
+                set_committed_value(company_avg, "competency_item", competency_item)
+                company_averages.append(company_avg)
         
         return company_averages
 
     @staticmethod
+    @traced()
     def save_company_averages(
         db: Session, company_averages: List[CompanyAverageCompetency]
     ) -> List[CompanyAverageCompetency]:
@@ -153,15 +177,12 @@ class CompetencyCalculator:
             else:
                 db.merge(ca)
         
-        db.commit()
-        
-        # Refresh all objects
-        for ca in company_averages:
-            db.refresh(ca)
+        db.flush()
         
         return company_averages
 
     @staticmethod
+    @traced()
     def get_competency_results(
         db: Session, user_id: int
     ) -> Tuple[List[UserCompetency], List[CompanyAverageCompetency]]:
@@ -184,11 +205,4 @@ class CompetencyCalculator:
             db, company_averages
         )
         
-        # Load relationships
-        for uc in user_competencies:
-            db.refresh(uc, ["competency_item"])
-        
-        for ca in company_averages:
-            db.refresh(ca, ["competency_item"])
-        
         return user_competencies, company_averages
\ No newline at end of file
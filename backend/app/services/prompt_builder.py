@@ -0,0 +1,225 @@
+"""Compact, token-budgeted prompt construction for AI feedback."""
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.models import UserCareerPlan
+
+# Bump whenever the prompt layout changes so usage can be compared per version.
+PROMPT_VERSION = "enhanced-v2"
+
+# Career plan fields in prompt order, with the label shown to the model.
+CAREER_PLAN_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("career_direction", "目指す方向性"),
+    ("target_position", "目標ポジション"),
+    ("target_timeframe", "達成時期"),
+    ("strengths_to_enhance", "活かしたい強み"),
+    ("weaknesses_to_overcome", "克服したい弱み"),
+    ("specific_goals", "具体的な目標"),
+    ("personality_traits", "性格特性"),
+    ("preferred_learning_style", "学習スタイル"),
+    ("challenges_faced", "現在の課題"),
+    ("motivation_factors", "モチベーション要因"),
+)
+
+# Free-text fields are never cut below this many characters.
+MIN_FIELD_CHARS = 40
+TRUNCATION_MARK = "…"
+
+
+@dataclass(frozen=True)
+class BuiltPrompt:
+    """A rendered prompt together with its size estimate."""
+
+    text: str
+    estimated_tokens: int
+    truncated_fields: Tuple[str, ...] = ()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheaply estimate the number of tokens in text.
+
+    Japanese characters are close to one token each in the GPT-4 tokenizer,
+    while ASCII averages about four characters per token.
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_chars) + math.ceil(ascii_chars / 4)
+
+
+def _fmt(value: Optional[float], signed: bool = False) -> str:
+    if value is None:
+        return "-"
+    return f"{value:+.1f}" if signed else f"{value:.1f}"
+
+
+def encode_competency_table(competency_data: List[Dict]) -> str:
+    """Encode competency rows as a pipe-separated table, one line per item."""
+    lines = ["項目|本人|全社平均|差分|判定"]
+    for row in competency_data:
+        line = "|".join(
+            [
+                row["name"],
+                _fmt(row.get("user_score")),
+                _fmt(row.get("company_average")),
+                _fmt(row.get("difference"), signed=True),
+            ]
+        )
+        if row.get("gap_analysis"):
+            line += f"|{row['gap_analysis']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _career_plan_fields(career_plan: Optional[UserCareerPlan]) -> Dict[str, str]:
+    """Return only the career plan fields the user actually filled in."""
+    if career_plan is None:
+        return {}
+    fields = {}
+    for attr, _label in CAREER_PLAN_FIELDS:
+        value = getattr(career_plan, attr, None)
+        if value and value.strip():
+            fields[attr] = value.strip()
+    return fields
+
+
+def _render_career_plan(fields: Dict[str, str]) -> str:
+    if not fields:
+        return ""
+    lines = ["【キャリアプラン情報】"]
+    for attr, label in CAREER_PLAN_FIELDS:
+        if attr in fields:
+            lines.append(f"- {label}: {fields[attr]}")
+    return "\n".join(lines) + "\n"
+
+
+def _fit_to_budget(
+    fields: Dict[str, str], excess_tokens: int
+) -> Tuple[Dict[str, str], Tuple[str, ...]]:
+    """Shorten the longest free-text fields until excess_tokens are removed."""
+    fields = dict(fields)
+    truncated: List[str] = []
+    # A field cut to the floor still carries the mark, so it is done
+    floor = MIN_FIELD_CHARS + len(TRUNCATION_MARK)
+    exhausted: Set[str] = set()
+    while excess_tokens > 0:
+        candidates = [
+            attr
+            for attr, value in fields.items()
+            if len(value) > floor and attr not in exhausted
+        ]
+        if not candidates:
+            break
+        longest = max(candidates, key=lambda attr: len(fields[attr]))
+        value = fields[longest]
+        before = estimate_tokens(value)
+        # Tokens per character is roughly 1 for Japanese, so cutting the excess
+        # in characters converges quickly; the floor keeps each field readable.
+        new_len = max(MIN_FIELD_CHARS, len(value) - excess_tokens - 1)
+        fields[longest] = value[:new_len] + TRUNCATION_MARK
+        saved = before - estimate_tokens(fields[longest])
+        if saved <= 0:
+            # ASCII text can round to the same token count; don't cut it again
+            fields[longest] = value
+            exhausted.add(longest)
+            continue
+        excess_tokens -= saved
+        if longest not in truncated:
+            truncated.append(longest)
+    return fields, tuple(truncated)
+
+
+def build_enhanced_feedback_prompt(
+    competency_data: List[Dict],
+    career_plan: Optional[UserCareerPlan],
+    user_name: str,
+    *,
+    max_input_tokens: int,
+    system_prompt: str = "",
+) -> BuiltPrompt:
+    """
+    Build the enhanced feedback prompt within an input-token budget.
+
+    The budget covers the system prompt as well. When it is exceeded, the
+    longest career plan fields are truncated first; the competency table and
+    the output instructions are never cut.
+    """
+    table = encode_competency_table(competency_data)
+    fields = _career_plan_fields(career_plan)
+
+    prompt = _render_enhanced_prompt(table, _render_career_plan(fields), user_name)
+    estimated = estimate_tokens(system_prompt) + estimate_tokens(prompt)
+    truncated: Tuple[str, ...] = ()
+
+    if estimated > max_input_tokens and fields:
+        fields, truncated = _fit_to_budget(fields, estimated - max_input_tokens)
+        prompt = _render_enhanced_prompt(table, _render_career_plan(fields), user_name)
+        estimated = estimate_tokens(system_prompt) + estimate_tokens(prompt)
+
+    return BuiltPrompt(
+        text=prompt, estimated_tokens=estimated, truncated_fields=truncated
+    )
+
+
+def build_feedback_prompt(competency_data: List[Dict], user_name: str) -> str:
+    """Build the basic (non career-aware) feedback prompt."""
+    table = encode_competency_table(competency_data)
+    return f"""以下は{user_name}のコンピテンシー評価結果です（5点満点）：
+{table}
+
+各コンピテンシーについて、以下の形式で簡潔で具体的なフィードバックを提供してください：
+1. 強み（3点以上）: 何が優れているか、どのように活かせるか
+2. 改善点（3点未満）: 具体的な改善方法、取り組むべき行動
+3. 総合評価: 全体的な傾向、優先すべき成長領域
+
+以下のフォーマットで回答してください：
+STRENGTHS:
+[強みの内容]
+
+IMPROVEMENTS:
+[改善点の内容]
+
+OVERALL:
+[総合評価]
+
+各項目は200文字以内で、実用的で理解しやすい日本語で記述してください。
+"""
+
+
+def _render_enhanced_prompt(table: str, career_info: str, user_name: str) -> str:
+    return f"""【対象者】: {user_name}
+
+【コンピテンシー評価結果】（5点満点）
+{table}
+
+{career_info}
+【依頼内容】
+上記の評価結果とキャリアプランを踏まえ、HRプロフェッショナルとして以下の観点から厳格かつ実践的なフィードバックを提供してください：
+1. 現状分析: 強みと弱みの客観的な分析、目標達成に向けた現在地、会社平均との比較から見える課題
+2. 戦略的アドバイス: 強みを最大限活用する方法、弱みを補強する実践的アプローチ、他者との協働による弱み対策
+3. 実行計画: 短期（3ヶ月）・中期（1年）・長期（3年）の目標、具体的な行動ステップ、進捗測定方法
+4. 学習リソース: 推奨書籍（3冊程度）、具体的な学習・トレーニング方法
+5. 厳格な評価: 現実的な課題と障害、本人が向き合うべき現実、成長に必要な意識改革
+
+【出力フォーマット】
+以下の形式で日本語で回答してください。セクションヘッダーは必ず英語で記述し、【】は使用しないでください：
+STRENGTH_ANALYSIS:
+[強みの分析と活用戦略]
+
+WEAKNESS_STRATEGY:
+[弱みの克服戦略と実践方法]
+
+ACTION_PLAN:
+[具体的な行動計画]
+
+LEARNING_RESOURCES:
+[学習リソースと推奨書籍]
+
+REALITY_CHECK:
+[厳格な現実評価と必要な意識改革]
+
+OVERALL_STRATEGY:
+[総合的な成長戦略]
+
+各セクションは300文字以内で、具体的で実践的な内容にしてください。
+"""
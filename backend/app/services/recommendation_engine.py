@@ -0,0 +1,224 @@
+"""Rule-based recommendation engine backed by an in-memory inverted index."""
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import CompetencyItem, User, UserCareerPlan, UserCompetency
+
+_DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+DEFAULT_CATALOG_PATH = _DATA_DIR / "recommendation_catalog.json"
+
+# Score bands on the 5-point scale, matching the thresholds used in feedback.
+HIGH_SCORE = 4.0
+LOW_SCORE = 3.0
+
+# Bonus added to an entry for each career keyword found in the user's context.
+KEYWORD_BONUS = 0.5
+
+CAREER_PLAN_CONTEXT_FIELDS = (
+    "career_direction",
+    "target_position",
+    "specific_goals",
+    "strengths_to_enhance",
+    "weaknesses_to_overcome",
+)
+
+
+def score_band(score: float) -> str:
+    """Return the band ("low", "mid" or "high") of a competency score."""
+    if score >= HIGH_SCORE:
+        return "high"
+    if score < LOW_SCORE:
+        return "low"
+    return "mid"
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """A single suggestion, training or book from the catalog."""
+
+    id: str
+    kind: str
+    payload: Mapping[str, str]
+    competencies: Tuple[str, ...] = ()
+    bands: Tuple[str, ...] = ()
+    keywords: Tuple[str, ...] = ()
+    weight: float = 1.0
+
+
+@dataclass
+class RecommendationSet:
+    """Ranked recommendations for one user."""
+
+    suggestions: List[str] = field(default_factory=list)
+    trainings: List[str] = field(default_factory=list)
+    books: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def career_suggestions(self) -> List[str]:
+        """Suggestions and trainings in the shape stored with AI feedback."""
+        return self.suggestions + self.trainings
+
+
+class RecommendationEngine:
+    """
+    Scores catalog entries for a user's competency profile.
+
+    Entries are indexed once by (competency, score band) and by career
+    keyword, so scoring a user only touches the entries that can match.
+    """
+
+    def __init__(self, entries: Sequence[CatalogEntry]):
+        """Build the inverted indexes over the catalog entries."""
+        self.entries: Tuple[CatalogEntry, ...] = tuple(entries)
+        self._by_band: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._by_keyword: Dict[str, List[int]] = defaultdict(list)
+        self._general: List[int] = []
+
+        for idx, entry in enumerate(self.entries):
+            if not entry.competencies and not entry.keywords:
+                self._general.append(idx)
+            for competency in entry.competencies:
+                for band in entry.bands or ("low", "mid", "high"):
+                    self._by_band[(competency, band)].append(idx)
+            for keyword in entry.keywords:
+                self._by_keyword[keyword].append(idx)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "RecommendationEngine":
+        """Load the engine from a JSON catalog file."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        entries = []
+        for raw in data["entries"]:
+            raw = dict(raw)
+            entries.append(
+                CatalogEntry(
+                    id=raw.pop("id"),
+                    kind=raw.pop("kind"),
+                    competencies=tuple(raw.pop("competencies", ())),
+                    bands=tuple(raw.pop("bands", ())),
+                    keywords=tuple(raw.pop("keywords", ())),
+                    weight=float(raw.pop("weight", 1.0)),
+                    payload=raw,
+                )
+            )
+        return cls(entries)
+
+    def score(self, scores: Mapping[str, float], context: str = "") -> Dict[int, float]:
+        """
+        Score the catalog entries that match a competency profile.
+
+        Args:
+            scores: Competency name to score (1-5)
+            context: Free text describing the user's career direction
+
+        Returns:
+            Entry index to relevance score, only for matching entries
+        """
+        ranked: Dict[int, float] = {
+            idx: self.entries[idx].weight for idx in self._general
+        }
+        for competency, value in scores.items():
+            # Entries grow more relevant the further the score is from average
+            severity = 1.0 + abs(value - LOW_SCORE) / 2
+            for idx in self._by_band.get((competency, score_band(value)), ()):
+                ranked[idx] = ranked.get(idx, 0.0) + self.entries[idx].weight * severity
+        if context:
+            for keyword, indexes in self._by_keyword.items():
+                if keyword in context:
+                    for idx in indexes:
+                        ranked[idx] = ranked.get(idx, 0.0) + KEYWORD_BONUS
+        return ranked
+
+    def recommend(
+        self,
+        scores: Mapping[str, float],
+        context: str = "",
+        *,
+        max_suggestions: int = 5,
+        max_books: int = 3,
+    ) -> RecommendationSet:
+        """Return the top-ranked suggestions, trainings and books."""
+        ranked = self.score(scores, context)
+        # Ties keep catalog order so results are stable between calls
+        order = sorted(ranked, key=lambda idx: (-ranked[idx], idx))
+
+        result = RecommendationSet()
+        seen_titles = set()
+        for idx in order:
+            entry = self.entries[idx]
+            if entry.kind == "book":
+                title = entry.payload["title"]
+                if len(result.books) < max_books and title not in seen_titles:
+                    seen_titles.add(title)
+                    result.books.append(dict(entry.payload))
+            elif len(result.suggestions) + len(result.trainings) < max_suggestions:
+                if entry.kind == "training":
+                    result.trainings.append(entry.payload["text"])
+                else:
+                    result.suggestions.append(entry.payload["text"])
+        return result
+
+    def recommend_batch(
+        self, profiles: Mapping[int, Tuple[Mapping[str, float], str]]
+    ) -> Dict[int, RecommendationSet]:
+        """Evaluate recommendations for many users at once."""
+        return {
+            user_id: self.recommend(scores, context)
+            for user_id, (scores, context) in profiles.items()
+        }
+
+
+def build_context(
+    career_plan: Optional[UserCareerPlan] = None, *extra: Optional[str]
+) -> str:
+    """Join career plan text, department and position into a keyword context."""
+    parts: List[Optional[str]] = list(extra)
+    if career_plan is not None:
+        parts.extend(
+            getattr(career_plan, attr, None) for attr in CAREER_PLAN_CONTEXT_FIELDS
+        )
+    return " ".join(part for part in parts if part)
+
+
+@lru_cache(maxsize=1)
+def get_recommendation_engine() -> RecommendationEngine:
+    """Return the process-wide engine, loading the catalog on first use."""
+    path = settings.RECOMMENDATION_CATALOG_PATH or DEFAULT_CATALOG_PATH
+    return RecommendationEngine.from_file(Path(path))
+
+
+def evaluate_all_users(db: Session) -> List[Tuple[User, RecommendationSet]]:
+    """Batch-evaluate recommendations for every active user."""
+    users = db.query(User).filter(User.is_active.is_(True)).order_by(User.id).all()
+    career_plans = {plan.user_id: plan for plan in db.query(UserCareerPlan).all()}
+
+    scores: Dict[int, Dict[str, float]] = defaultdict(dict)
+    rows: Iterable[Tuple[int, str, float]] = (
+        db.query(UserCompetency.user_id, CompetencyItem.name, UserCompetency.score)
+        .join(CompetencyItem, UserCompetency.competency_item_id == CompetencyItem.id)
+        .all()
+    )
+    for user_id, name, score in rows:
+        scores[user_id][name] = score
+
+    engine = get_recommendation_engine()
+    results = engine.recommend_batch(
+        {
+            user.id: (
+                scores.get(user.id, {}),
+                build_context(
+                    career_plans.get(user.id), user.department, user.position
+                ),
+            )
+            for user in users
+        }
+    )
+    return [(user, results[user.id]) for user in users]
@@ -0,0 +1,118 @@
+"""Benchmark JSON against MessagePack encoding of dashboard responses.
+
+Encodes a synthetic results payload (full and compact) and a stored AI
+feedback payload in Japanese the way the API renders them, and reports
+encode time and payload size per format, e.g.:
+
+    DATABASE_URL=sqlite:// python scripts/benchmark_encoding.py --items 12
+"""
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app import schemas  # noqa: E402
+from app.core.encoding import packb  # noqa: E402
+
+
+def build_payloads(item_count: int) -> Dict[str, Any]:
+    """Build JSON-compatible content of each benchmarked response."""
+    now = datetime.utcnow()
+    items = [
+        schemas.CompetencyItem(
+            id=i,
+            name=f"コミュニケーション能力 {i}",
+            description="チーム内外の関係者と円滑に意思疎通し、合意形成を図る力。" * 3,
+            order=i,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, item_count + 1)
+    ]
+    full = schemas.CompetencyResult(
+        user_competencies=[
+            schemas.UserCompetency(
+                id=i.id,
+                user_id=1,
+                competency_item_id=i.id,
+                score=3 + i.id / 7,
+                calculated_at=now,
+                competency_item=i,
+            )
+            for i in items
+        ],
+        company_averages=[
+            schemas.CompanyAverageCompetency(
+                id=i.id,
+                competency_item_id=i.id,
+                average_score=3 + i.id / 9,
+                total_users=120,
+                calculated_at=now,
+                competency_item=i,
+            )
+            for i in items
+        ],
+    )
+    compact = schemas.CompactCompetencyResult(
+        items={
+            i.id: schemas.CompactCompetencyItem(
+                name=i.name, description=i.description, order=i.order
+            )
+            for i in items
+        },
+        item_ids=[i.id for i in items],
+        user_scores=[3 + i.id / 7 for i in items],
+        company_averages=[3 + i.id / 9 for i in items],
+        company_total_users=[120 for _ in items],
+        calculated_at=now,
+    )
+    feedback = {
+        "feedback": {
+            "summary": "全体として安定した評価です。特に対人関係の項目で高い水準にあります。" * 8,
+            "strengths": "傾聴と調整の力が強みです。" * 10,
+            "improvements": "計画立案の精度を高めると、さらに成果につながります。" * 10,
+        },
+        "career_suggestions": ["プロジェクトリーダー", "スクラムマスター"],
+        "book_recommendations": [
+            {"title": "人を動かす", "author": "D・カーネギー", "reason": "対人関係"}
+        ]
+        * 5,
+        "generated_at": now.isoformat() + "Z",
+        "from_cache": True,
+    }
+    return {
+        "results": jsonable_encoder(full),
+        "results (compact)": jsonable_encoder(compact),
+        "feedback": feedback,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    render_json = JSONResponse(None).render
+    print(f"{'payload':<20}{'format':<10}{'us/encode':>12}{'bytes':>10}")
+    for name, content in build_payloads(args.items).items():
+        assert json.loads(render_json(content)) == content
+        for format_name, encode in [("json", render_json), ("msgpack", packb)]:
+            seconds = timeit.timeit(lambda: encode(content), number=args.repeat)
+            size = len(encode(content))
+            print(
+                f"{name:<20}{format_name:<10}"
+                f"{seconds / args.repeat * 1e6:>12.1f}{size:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark encoding of /questions/with-answers in process.
+
+Compares the per-question path the endpoint used to take (one
+QuestionWithAnswer model per question, then FastAPI's jsonable_encoder and
+json.dumps) with splicing scores into the catalog snapshot's pre-encoded
+questions, e.g.:
+
+    DATABASE_URL=sqlite:// python scripts/benchmark_questions_with_answers.py \
+        --questions 200 --answered 0.5
+
+No database is needed: the catalog is built from transient rows.
+"""
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app import schemas  # noqa: E402
+from app.models import CompetencyItem, Question  # noqa: E402
+from app.services.catalog import CatalogSnapshot  # noqa: E402
+
+
+def build_catalog(question_count: int) -> CatalogSnapshot:
+    """Build a snapshot of question_count questions over ten items."""
+    now = datetime.utcnow()
+    items = [
+        CompetencyItem(id=i, name=f"item {i}", order=i, created_at=now, updated_at=now)
+        for i in range(1, 11)
+    ]
+    questions = [
+        Question(
+            id=n,
+            text=f"question {n}",
+            competency_item_id=items[n % 10].id,
+            competency_item=items[n % 10],
+            order=n,
+            max_score=5,
+            created_at=now,
+            updated_at=now,
+        )
+        for n in range(1, question_count + 1)
+    ]
+    return CatalogSnapshot.build(1, items, questions)
+
+
+def per_question_models(snapshot: CatalogSnapshot, scores: Dict[int, int]) -> bytes:
+    """Encode the way the endpoint did before the snapshot."""
+    response: List[schemas.QuestionWithAnswer] = []
+    for question in snapshot.questions:
+        data = question.model_dump()
+        data["user_answer"] = scores.get(question.id)
+        response.append(schemas.QuestionWithAnswer(**data))
+    return json.dumps(jsonable_encoder(response)).encode()
+
+
+def spliced(snapshot: CatalogSnapshot, scores: Dict[int, int]) -> bytes:
+    """Encode the way the endpoint does now."""
+    return snapshot.questions_with_answers_json(scores)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--answered", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    snapshot = build_catalog(args.questions)
+    answered = int(args.questions * args.answered)
+    scores = {q.id: q.id % 5 + 1 for q in snapshot.questions[:answered]}
+    assert json.loads(per_question_models(snapshot, scores)) == json.loads(
+        spliced(snapshot, scores)
+    )
+
+    print(f"{'path':<24}{'ms/request':>12}{'bytes':>10}")
+    for name, encode in [
+        ("per-question models", per_question_models),
+        ("snapshot splice", spliced),
+    ]:
+        seconds = timeit.timeit(lambda: encode(snapshot, scores), number=args.repeat)
+        size = len(encode(snapshot, scores))
+        print(f"{name:<24}{seconds / args.repeat * 1000:>12.3f}{size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,7 @@ def create_superuser():
     )
     
     user = crud_user.create(db, obj_in=user_in)
+    db.commit()
     print(f"Superuser created: {user.email}")
     
     db.close()
@@ -7,6 +7,7 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from app.core.database import SessionLocal
 from app.models import CompetencyItem, Question
+from app.services import catalog  # noqa: F401  bumps the catalog version on commit
 
 
 def seed_competency_items_and_questions():
@@ -0,0 +1,64 @@
+"""Test admin API endpoints."""
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.core.config import settings
+
+
+def test_read_llm_usage_by_day(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test LLM spend and latency are served from the daily rollups."""
+    user = crud.crud_user.get_by_email(db, email="test@example.com")
+    for latency_ms in (800, 1500, 9000):
+        crud.crud_llm_usage.record(
+            db,
+            obj_in=schemas.LLMUsageCreate(
+                user_id=user.id,
+                department="Engineering",
+                prompt_version="enhanced-v2",
+                model="gpt-4",
+                input_tokens=1000,
+                output_tokens=500,
+                latency_ms=latency_ms,
+                outcome="success",
+            ),
+        )
+    db.commit()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/admin/llm-usage",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert len(content) == 1
+    summary = content[0]
+    assert summary["calls"] == 3
+    assert summary["input_tokens"] == 3000
+    assert summary["latency_p50_ms"] == 2000
+    assert summary["latency_p95_ms"] == 10000
+    assert summary["cost_usd"] > 0
+
+    response = client.get(
+        f"{settings.API_V1_STR}/admin/llm-usage",
+        headers=superuser_token_headers,
+        params={"group_by": "department"},
+    )
+    assert response.status_code == 200
+    assert [s["key"] for s in response.json()] == ["Engineering"]
+
+
+def test_read_all_recommendations(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test recommendations are batch-evaluated for every employee."""
+    response = client.get(
+        f"{settings.API_V1_STR}/admin/recommendations",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [r["name"] for r in content] == ["Test User"]
+    assert content[0]["career_suggestions"]
+    assert content[0]["book_recommendations"]
@@ -1,5 +1,6 @@
 """Test answers API endpoints."""
 import pytest
+from sqlalchemy import delete, event
 from sqlalchemy.orm import Session
 
 from app import crud
@@ -111,6 +112,82 @@ def test_update_existing_answers(
     assert updated_answer["score"] == 5
 
 
+def test_submit_answers_commits_once(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test a full submission is written in a single transaction."""
+    competency_item = CompetencyItem(
+        name="Test Competency",
+        description="Test Description",
+        order=1
+    )
+    db.add(competency_item)
+    db.flush()
+    questions = [
+        Question(
+            text=f"Test Question {i+1}",
+            competency_item_id=competency_item.id,
+            order=i+1,
+            max_score=5
+        )
+        for i in range(30)
+    ]
+    db.add_all(questions)
+    db.commit()
+
+    commits = []
+    listener = lambda session: commits.append(session)  # noqa: E731
+    event.listen(Session, "after_commit", listener)
+    try:
+        response = client.post(
+            f"{settings.API_V1_STR}/answers/",
+            headers=superuser_token_headers,
+            json={"answers": [{"question_id": q.id, "score": 4} for q in questions]},
+        )
+    finally:
+        event.remove(Session, "after_commit", listener)
+    assert response.status_code == 200
+    assert len(response.json()) == 30
+    assert len(commits) == 1
+
+
+def test_submit_answers_rejects_unknown_questions(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test answers to unknown questions are rejected without writing."""
+    response = client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=superuser_token_headers,
+        json={"answers": [{"question_id": 999, "score": 3}]},
+    )
+    assert response.status_code == 400
+    assert db.query(Answer).count() == 0
+
+
+def test_submit_answers_to_question_deleted_after_caching(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test a question deleted while its id is cached is rejected, not a 500."""
+    item = CompetencyItem(name="Test Item", order=1)
+    db.add(item)
+    db.flush()
+    question = Question(text="Q", competency_item_id=item.id, order=1)
+    db.add(question)
+    db.commit()
+    question_id = question.id
+    crud.crud_answer._validate_question_ids(db, [question_id])
+    db.execute(delete(Question).where(Question.id == question_id))
+    db.commit()
+
+    response = client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=superuser_token_headers,
+        json={"answers": [{"question_id": question_id, "score": 3}]},
+    )
+    assert response.status_code == 400
+    assert db.query(Answer).count() == 0
+
+
 def test_read_user_answers(
     client, superuser_token_headers, db: Session
 ) -> None:
@@ -0,0 +1,149 @@
+"""Test authentication API endpoints."""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.revocation import BloomFilter
+from app.core.security import create_access_token
+
+
+def _login(client) -> dict:
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        data={"username": "test@example.com", "password": "testpassword"},
+    )
+    assert r.status_code == 200
+    return r.json()
+
+
+def test_authorized_request_runs_no_queries(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test fresh token claims authorize a request without touching the DB."""
+    client.get(
+        f"{settings.API_V1_STR}/admin/user-cache", headers=superuser_token_headers
+    )
+    statements = []
+
+    def count(*args) -> None:
+        statements.append(args[2])
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        r = client.get(
+            f"{settings.API_V1_STR}/admin/user-cache", headers=superuser_token_headers
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert r.status_code == 200
+    assert statements == []
+
+
+def test_refresh_rotates_and_detects_reuse(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test refresh tokens rotate and a reused token ends the session."""
+    tokens = _login(client)
+    assert tokens["expires_in"] == settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert r.status_code == 200
+    rotated = r.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert r.status_code == 401
+    # The whole family is revoked, including the newest token
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/refresh",
+        json={"refresh_token": rotated["refresh_token"]},
+    )
+    assert r.status_code == 401
+
+
+def test_logout_revokes_access_token(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test a logged out access token is rejected immediately."""
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/logout",
+        headers=headers,
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert r.status_code == 204
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 401
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert r.status_code == 401
+    # Other sessions are unaffected
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    assert r.status_code == 200
+
+
+def test_deactivated_user_is_rejected(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test deactivation revokes tokens whose claims still say active."""
+    user = crud.crud_user.get_by_email(db, email="test@example.com")
+    crud.crud_user.update(db, db_obj=user, obj_in={"is_active": False})
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    assert r.status_code == 401
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    """Test every added key is reported and unrelated keys mostly are not."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"jti:{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"jti:other-{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+def test_login_right_after_password_change(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test tokens issued after a revocation work, even in the same second."""
+    r = client.put(
+        f"{settings.API_V1_STR}/users/me",
+        headers=superuser_token_headers,
+        json={"password": "newpassword"},
+    )
+    assert r.status_code == 200
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    assert r.status_code == 401
+
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        data={"username": "test@example.com", "password": "newpassword"},
+    )
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 200
+
+    # Without password hashing in between, revocation and token share a second
+    user = crud.crud_user.get_by_email(db, email="test@example.com")
+    crud.crud_token_revocation.revoke_user(db, user_id=user.id)
+    db.commit()
+    token = create_access_token(user.id)
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 200
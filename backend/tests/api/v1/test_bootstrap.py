@@ -0,0 +1,68 @@
+"""Test the dashboard bootstrap endpoint."""
+import msgpack
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import CompetencyItem, Question
+
+
+def _seed(client, headers, db: Session) -> None:
+    item = CompetencyItem(name="Leadership", order=1)
+    db.add(item)
+    db.flush()
+    questions = [
+        Question(text=f"q{n}", competency_item_id=item.id, order=n) for n in range(2)
+    ]
+    db.add_all(questions)
+    db.commit()
+    client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=headers,
+        json={"answers": [{"question_id": questions[0].id, "score": 4}]},
+    )
+
+
+def test_bootstrap_matches_separate_endpoints(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test each part equals what its own endpoint returns."""
+    _seed(client, superuser_token_headers, db)
+    client.post(
+        f"{settings.API_V1_STR}/career-plans/",
+        headers=superuser_token_headers,
+        json={"career_direction": "management"},
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/bootstrap/", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    content = response.json()
+
+    def separate(path: str):
+        return client.get(
+            f"{settings.API_V1_STR}{path}", headers=superuser_token_headers
+        ).json()
+
+    assert content["user"] == separate("/users/me")
+    assert content["questions"] == separate("/questions/with-answers")
+    assert content["career_plan"] == separate("/career-plans/")
+    assert content["results"] == separate("/competencies/results")
+    assert content["feedback"] == separate("/competencies/feedback")
+
+
+def test_bootstrap_without_career_plan_as_msgpack(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test a missing career plan is null and MessagePack decodes the same."""
+    _seed(client, superuser_token_headers, db)
+    as_json = client.get(
+        f"{settings.API_V1_STR}/bootstrap/", headers=superuser_token_headers
+    )
+    as_msgpack = client.get(
+        f"{settings.API_V1_STR}/bootstrap/",
+        headers={**superuser_token_headers, "Accept": "application/msgpack"},
+    )
+    assert as_json.json()["career_plan"] is None
+    assert as_msgpack.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(as_msgpack.content) == as_json.json()
@@ -4,7 +4,8 @@ from sqlalchemy.orm import Session
 
 from app import crud
 from app.core.config import settings
-from app.models import Answer, CompetencyItem, Question, UserCompetency
+from app.models import Answer, CompetencyItem, LLMUsage, Question, UserCompetency
+from app.services.ai_feedback_service import LLMCallStats, ai_feedback_service
 
 
 def test_read_competency_items(
@@ -99,4 +100,106 @@ def test_get_competency_results(
         company_avg = content["company_averages"][0]
         assert "average_score" in company_avg
         assert "total_users" in company_avg
-        assert "competency_item_id" in company_avg
\ No newline at end of file
+        assert "competency_item_id" in company_avg
+
+
+@pytest.mark.parametrize(
+    "params, headers",
+    [
+        ({"format": "compact"}, {}),
+        ({}, {"Accept": "application/vnd.competency.compact+json"}),
+    ],
+)
+def test_get_compact_competency_results(
+    client, superuser_token_headers, db: Session, params, headers
+) -> None:
+    """Test the compact results list each item once with parallel scores."""
+    items = [
+        CompetencyItem(name=f"Competency {i}", description="x" * 200, order=i)
+        for i in range(3)
+    ]
+    db.add_all(items)
+    db.flush()
+    questions = [
+        Question(text=f"Question {item.id}", competency_item_id=item.id, order=1)
+        for item in items[:2]
+    ]
+    db.add_all(questions)
+    db.commit()
+    client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=superuser_token_headers,
+        json={"answers": [{"question_id": q.id, "score": 3} for q in questions]},
+    )
+    
+    full = client.get(
+        f"{settings.API_V1_STR}/competencies/results",
+        headers=superuser_token_headers,
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/competencies/results",
+        headers={**superuser_token_headers, **headers},
+        params=params,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(
+        "application/vnd.competency.compact+json"
+    )
+    assert response.headers["ETag"] != full.headers["ETag"]
+    assert "Accept" in response.headers["Vary"]
+    content = response.json()
+    
+    assert content["item_ids"] == [item.id for item in items]
+    assert content["items"][str(items[0].id)]["name"] == "Competency 0"
+    assert content["user_scores"] == [3.0, 3.0, None]
+    assert content["company_averages"] == [3.0, 3.0, None]
+    assert content["company_total_users"] == [1, 1, None]
+    assert len(response.content) < len(full.content) / 2
+
+
+def test_regeneration_records_prompt_size(
+    client, superuser_token_headers, db: Session, monkeypatch
+) -> None:
+    """Test the ledger keeps the estimated prompt size next to actual usage."""
+    competency_item = CompetencyItem(name="Planning", order=1)
+    db.add(competency_item)
+    db.flush()
+    question = Question(text="q", competency_item_id=competency_item.id, order=1)
+    db.add(question)
+    db.commit()
+    client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=superuser_token_headers,
+        json={"answers": [{"question_id": question.id, "score": 4}]},
+    )
+
+    def generate(*args):
+        stats = LLMCallStats(
+            prompt_version="enhanced-v2",
+            model="gpt-4",
+            prompt_chars=2400,
+            estimated_input_tokens=1200,
+            truncated_fields=("specific_goals",),
+            input_tokens=1350,
+            output_tokens=700,
+            latency_ms=4200.0,
+            outcome="success",
+        )
+        return {"summary": "ok"}, stats
+
+    monkeypatch.setattr(
+        ai_feedback_service,
+        "generate_enhanced_competency_feedback_with_stats",
+        generate,
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/competencies/feedback",
+        headers=superuser_token_headers,
+        params={"force_regenerate": True},
+    )
+    assert response.status_code == 200
+
+    entry = db.query(LLMUsage).one()
+    assert (entry.estimated_input_tokens, entry.input_tokens) == (1200, 1350)
+    assert entry.truncated_fields == ["specific_goals"]
+    assert entry.latency_ms == 4200
@@ -0,0 +1,114 @@
+"""Test JSON and MessagePack response negotiation."""
+from typing import Dict, List
+
+import msgpack
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.encoding import accepts_msgpack
+from app.models import CompetencyItem, Question
+
+MSGPACK = {"Accept": "application/msgpack"}
+
+
+@pytest.fixture
+def questions(db: Session) -> List[Question]:
+    """Seed one item with Japanese questions."""
+    item = CompetencyItem(name="コミュニケーション", description="説明", order=1)
+    db.add(item)
+    db.flush()
+    questions = [
+        Question(text=f"質問 {n}", competency_item_id=item.id, order=n) for n in range(3)
+    ]
+    db.add_all(questions)
+    db.commit()
+    return questions
+
+
+def _both(client, path: str, headers: Dict[str, str]):
+    url = f"{settings.API_V1_STR}{path}"
+    as_json = client.get(url, headers=headers)
+    as_msgpack = client.get(url, headers={**headers, **MSGPACK})
+    assert as_msgpack.headers["content-type"] == "application/msgpack"
+    if "ETag" in as_json.headers:
+        assert as_msgpack.headers["ETag"] != as_json.headers["ETag"]
+    return as_json, msgpack.unpackb(as_msgpack.content)
+
+
+def test_accept_header_negotiation() -> None:
+    """Test MessagePack is chosen only when explicitly preferred."""
+    assert accepts_msgpack("application/msgpack")
+    assert accepts_msgpack("application/x-msgpack, application/json;q=0.5")
+    assert not accepts_msgpack("application/json, application/msgpack;q=0.5")
+    assert not accepts_msgpack("*/*")
+    assert not accepts_msgpack("application/msgpack;q=0")
+    assert not accepts_msgpack(None)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/questions/",
+        "/questions/with-answers",
+        "/questions/{id}",
+        "/competencies/items",
+    ],
+)
+def test_catalog_msgpack_matches_json(
+    client, superuser_token_headers, questions, path
+) -> None:
+    """Test pre-encoded catalog responses decode to the JSON content."""
+    client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=superuser_token_headers,
+        json={"answers": [{"question_id": questions[1].id, "score": 2}]},
+    )
+    as_json, decoded = _both(
+        client, path.format(id=questions[0].id), superuser_token_headers
+    )
+    assert decoded == as_json.json()
+
+
+def test_results_msgpack_matches_json(
+    client, superuser_token_headers, questions
+) -> None:
+    """Test full and compact results in both encodings."""
+    client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=superuser_token_headers,
+        json={"answers": [{"question_id": q.id, "score": 4} for q in questions]},
+    )
+    as_json, decoded = _both(client, "/competencies/results", superuser_token_headers)
+    assert decoded == as_json.json()
+
+    as_json, decoded = _both(
+        client, "/competencies/results?format=compact", superuser_token_headers
+    )
+    assert decoded == as_json.json()
+    assert decoded["user_scores"] == [4.0]
+
+
+def test_admin_and_feedback_msgpack(client, superuser_token_headers) -> None:
+    """Test model and dict responses are re-encoded by the route."""
+    # Each request adds to the stats, so compare their shape
+    as_json, decoded = _both(client, "/admin/query-stats", superuser_token_headers)
+    assert decoded and decoded[0].keys() == as_json.json()[0].keys()
+
+    as_json, decoded = _both(client, "/competencies/feedback", superuser_token_headers)
+    assert decoded == as_json.json()
+    assert decoded["from_cache"] is False
+
+
+def test_json_stays_the_default(client, superuser_token_headers, questions) -> None:
+    """Test clients that do not ask for MessagePack still get JSON."""
+    response = client.get(
+        f"{settings.API_V1_STR}/questions/",
+        headers={**superuser_token_headers, "Accept": "*/*"},
+    )
+    assert response.headers["content-type"] == "application/json"
+    response = client.get(
+        f"{settings.API_V1_STR}/answers/",
+        headers={**superuser_token_headers, **MSGPACK},
+    )
+    assert response.headers["content-type"] == "application/json"
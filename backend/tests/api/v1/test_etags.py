@@ -0,0 +1,178 @@
+"""Test conditional GET support on read endpoints."""
+from typing import Dict, List
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.core.config import settings
+from app.core.http_cache import etag_matches
+from app.models import CompetencyItem, Question
+from app.schemas.user import UserCreate
+from tests.utils.query_budget import assert_max_queries
+
+
+@pytest.fixture
+def questions(db: Session) -> List[Question]:
+    """Seed one item with two questions."""
+    item = CompetencyItem(name="Communication", order=1)
+    db.add(item)
+    db.flush()
+    questions = [
+        Question(text=f"q{n}", competency_item_id=item.id, order=n) for n in range(2)
+    ]
+    db.add_all(questions)
+    db.commit()
+    return questions
+
+
+@pytest.fixture
+def other_user_headers(client, db: Session) -> Dict[str, str]:
+    """Log in a second, regular user."""
+    user_in = UserCreate(
+        email="other@example.com", password="otherpassword", name="Other"
+    )
+    crud.crud_user.create(db, obj_in=user_in)
+    db.commit()
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        data={"username": user_in.email, "password": user_in.password},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _get(client, path: str, headers: Dict[str, str], etag: str = None):
+    if etag is not None:
+        headers = {**headers, "If-None-Match": etag}
+    return client.get(f"{settings.API_V1_STR}{path}", headers=headers)
+
+
+def _answer(client, headers: Dict[str, str], question: Question, score: int) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=headers,
+        json={"answers": [{"question_id": question.id, "score": score}]},
+    )
+    assert response.status_code == 200
+
+
+def test_etag_matching() -> None:
+    """Test If-None-Match lists, weak tags and the wildcard."""
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+@pytest.mark.parametrize(
+    "path", ["/questions/", "/competencies/items", "/questions/{id}"]
+)
+def test_catalog_revalidation(
+    client, superuser_token_headers, db: Session, questions, path
+) -> None:
+    """Test catalog responses are cacheable and revalidate without queries."""
+    path = path.format(id=questions[0].id)
+    response = _get(client, path, superuser_token_headers)
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == (
+        f"private, max-age={settings.CATALOG_CACHE_MAX_AGE_SECONDS}"
+    )
+
+    with assert_max_queries(0):
+        response = _get(client, path, superuser_token_headers, etag)
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    questions[0].text = "reworded"
+    db.commit()
+    response = _get(client, path, superuser_token_headers, etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_questions_with_answers_follow_the_users_answers(
+    client, superuser_token_headers, db: Session, questions
+) -> None:
+    """Test the ETag changes when the user answers and only then."""
+    path = "/questions/with-answers"
+    response = _get(client, path, superuser_token_headers)
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert response.headers["Vary"] == "Authorization, Accept"
+
+    with assert_max_queries(1):
+        response = _get(client, path, superuser_token_headers, etag)
+    assert response.status_code == 304
+
+    _answer(client, superuser_token_headers, questions[0], 3)
+    response = _get(client, path, superuser_token_headers, etag)
+    assert response.status_code == 200
+    assert response.json()[0]["user_answer"] == 3
+
+
+def test_results_revalidate_until_scores_change(
+    client, superuser_token_headers, db: Session, questions
+) -> None:
+    """Test recalculating unchanged results keeps the ETag stable."""
+    _answer(client, superuser_token_headers, questions[0], 4)
+    first = _get(client, "/competencies/results", superuser_token_headers)
+    etag = first.headers["ETag"]
+    assert first.json()["user_competencies"][0]["score"] == 4
+
+    second = _get(client, "/competencies/results", superuser_token_headers)
+    assert second.headers["ETag"] == etag
+    assert second.json() == first.json()
+
+    response = _get(client, "/competencies/results", superuser_token_headers, etag)
+    assert response.status_code == 304
+
+    _answer(client, superuser_token_headers, questions[1], 2)
+    response = _get(client, "/competencies/results", superuser_token_headers, etag)
+    assert response.status_code == 200
+    assert response.json()["user_competencies"][0]["score"] == 3
+
+
+def test_company_scores_change_other_users_results(
+    client, superuser_token_headers, other_user_headers, db: Session, questions
+) -> None:
+    """Test another user's new scores invalidate the company averages."""
+    _answer(client, superuser_token_headers, questions[0], 4)
+    response = _get(client, "/competencies/results", superuser_token_headers)
+    etag = response.headers["ETag"]
+
+    _answer(client, other_user_headers, questions[0], 2)
+    _get(client, "/competencies/results", other_user_headers)
+
+    response = _get(client, "/competencies/results", superuser_token_headers, etag)
+    assert response.status_code == 200
+    assert response.json()["company_averages"][0]["average_score"] == 3
+
+
+def test_feedback_revalidation(
+    client, superuser_token_headers, db: Session, questions
+) -> None:
+    """Test stored feedback revalidates until it is replaced or invalidated."""
+    response = _get(client, "/competencies/feedback", superuser_token_headers)
+    etag = response.headers["ETag"]
+    assert response.json()["from_cache"] is False
+    response = _get(client, "/competencies/feedback", superuser_token_headers, etag)
+    assert response.status_code == 304
+
+    user = crud.crud_user.get_by_email(db, email="test@example.com")
+    crud.crud_ai_feedback.create_or_update(
+        db,
+        user_id=user.id,
+        obj_in=schemas.AIFeedbackCreate(feedback_content={"summary": "ok"}),
+    )
+    db.commit()
+    response = _get(client, "/competencies/feedback", superuser_token_headers, etag)
+    assert response.status_code == 200
+    assert response.json()["from_cache"] is True
+    etag = response.headers["ETag"]
+
+    _answer(client, superuser_token_headers, questions[0], 5)
+    response = _get(client, "/competencies/feedback", superuser_token_headers, etag)
+    assert response.status_code == 200
+    assert response.json()["from_cache"] is False
@@ -0,0 +1,240 @@
+"""Test Idempotency-Key replays of answer submissions and feedback."""
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud
+from app.api.idempotency import REPLAYED_HEADER, ExpiredKeyPruner
+from app.core.config import settings
+from app.models import Answer, CompetencyItem, IdempotencyKey, Question
+from app.schemas.user import UserCreate
+from app.services.ai_feedback_service import LLMCallStats, ai_feedback_service
+from tests.utils.query_budget import assert_max_queries
+
+
+@pytest.fixture
+def questions(db: Session) -> List[Question]:
+    """Seed one item with two questions."""
+    item = CompetencyItem(name="Communication", order=1)
+    db.add(item)
+    db.flush()
+    questions = [
+        Question(text=f"q{n}", competency_item_id=item.id, order=n) for n in range(2)
+    ]
+    db.add_all(questions)
+    db.commit()
+    return questions
+
+
+def _submit(client, headers: Dict[str, str], key: str, question: Question, score):
+    return client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers={**headers, "Idempotency-Key": key},
+        json={"answers": [{"question_id": question.id, "score": score}]},
+    )
+
+
+def _writes(statements: List[str]) -> List[str]:
+    return [
+        sql
+        for sql in statements
+        if sql.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+        and "idempotency_keys" not in sql
+    ]
+
+
+def test_replayed_submission_writes_nothing(
+    client, superuser_token_headers, db: Session, questions
+) -> None:
+    """Test a retry gets the first response and leaves later changes alone."""
+    first = _submit(client, superuser_token_headers, "retry-1", questions[0], 3)
+    assert first.status_code == 200
+    assert REPLAYED_HEADER not in first.headers
+
+    # A later submission without the key must survive the replay
+    client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=superuser_token_headers,
+        json={"answers": [{"question_id": questions[0].id, "score": 5}]},
+    )
+    with assert_max_queries(10) as statements:
+        replay = _submit(client, superuser_token_headers, "retry-1", questions[0], 3)
+    assert replay.status_code == 200
+    assert replay.headers[REPLAYED_HEADER] == "true"
+    assert replay.json() == first.json()
+    assert _writes(statements) == []
+    db.expire_all()
+    assert db.query(Answer.score).scalar() == 5
+
+
+def test_key_reuse_for_another_request(
+    client, superuser_token_headers, questions
+) -> None:
+    """Test a key is bound to its request and can be used again once expired."""
+    assert _submit(client, superuser_token_headers, "k", questions[0], 3).is_success
+    response = _submit(client, superuser_token_headers, "k", questions[0], 4)
+    assert response.status_code == 422
+
+    response = client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers={**superuser_token_headers, "Idempotency-Key": "x" * 256},
+        json={"answers": []},
+    )
+    assert response.status_code == 422
+
+
+def test_expired_key_runs_again(
+    client, superuser_token_headers, db: Session, questions
+) -> None:
+    """Test keys past their TTL are pruned and claimed anew."""
+    _submit(client, superuser_token_headers, "k", questions[0], 3)
+    db.query(IdempotencyKey).update(
+        {IdempotencyKey.expires_at: datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+    response = _submit(client, superuser_token_headers, "k", questions[0], 4)
+    assert response.status_code == 200
+    assert REPLAYED_HEADER not in response.headers
+    db.expire_all()
+    assert db.query(IdempotencyKey).count() == 1
+
+
+def test_forced_feedback_runs_once(
+    client, superuser_token_headers, questions, monkeypatch
+) -> None:
+    """Test a retried regeneration replays instead of calling the provider."""
+    _submit(client, superuser_token_headers, "answers", questions[0], 4)
+    generate = ai_feedback_service.generate_enhanced_competency_feedback_with_stats
+    calls = []
+
+    def counting(*args):
+        calls.append(args)
+        return generate(*args)
+
+    monkeypatch.setattr(
+        ai_feedback_service,
+        "generate_enhanced_competency_feedback_with_stats",
+        counting,
+    )
+    url = f"{settings.API_V1_STR}/competencies/feedback?force_regenerate=true"
+    headers = {**superuser_token_headers, "Idempotency-Key": "feedback-1"}
+    first = client.get(url, headers=headers)
+    replay = client.get(url, headers=headers)
+    assert first.status_code == replay.status_code == 200
+    assert replay.headers[REPLAYED_HEADER] == "true"
+    assert replay.json() == first.json()
+    assert len(calls) == 1
+
+
+def test_failed_regeneration_releases_key(
+    client, superuser_token_headers, db: Session, questions, monkeypatch
+) -> None:
+    """Test a key whose request failed after claiming it can be retried."""
+    _submit(client, superuser_token_headers, "answers", questions[0], 4)
+
+    def unavailable(*args):
+        raise ConnectionError("provider unavailable")
+
+    monkeypatch.setattr(
+        ai_feedback_service,
+        "generate_enhanced_competency_feedback_with_stats",
+        unavailable,
+    )
+    url = f"{settings.API_V1_STR}/competencies/feedback?force_regenerate=true"
+    headers = {**superuser_token_headers, "Idempotency-Key": "feedback-1"}
+    with pytest.raises(ConnectionError):
+        client.get(url, headers=headers)
+
+    monkeypatch.undo()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert REPLAYED_HEADER not in response.headers
+    assert response.json()["feedback"]
+
+
+def test_abandoned_claim_is_taken_over(client, superuser_token_headers, db: Session):
+    """Test a key left in progress by a crashed request is claimed again."""
+    user = crud.crud_user.get_by_email(db, email="test@example.com")
+    row, claimed = crud.crud_idempotency_key.claim(
+        db, user_id=user.id, key="k", request_hash="h"
+    )
+    db.commit()
+    assert claimed
+    assert not crud.crud_idempotency_key.claim(
+        db, user_id=user.id, key="k", request_hash="h"
+    )[1]
+
+    abandoned = timedelta(seconds=settings.IDEMPOTENCY_KEY_ABANDON_SECONDS + 1)
+    row.created_at = datetime.utcnow() - abandoned
+    db.commit()
+    assert crud.crud_idempotency_key.claim(
+        db, user_id=user.id, key="k", request_hash="h"
+    )[1]
+    # Only the retry that took it over runs
+    assert not crud.crud_idempotency_key.claim(
+        db, user_id=user.id, key="k", request_hash="h"
+    )[1]
+
+
+def test_expired_keys_are_pruned_in_batches(db: Session) -> None:
+    """Test the pruner deletes expired keys only, a batch at a time."""
+    user = crud.crud_user.create(
+        db,
+        obj_in=UserCreate(email="keys@example.com", password="password", name="K"),
+    )
+    expired = datetime.utcnow() - timedelta(hours=1)
+    live = datetime.utcnow() + timedelta(hours=1)
+    for n, expires_at in enumerate([expired, expired, expired, live]):
+        db.add(
+            IdempotencyKey(
+                user_id=user.id,
+                key_hash=str(n),
+                request_hash="h",
+                expires_at=expires_at,
+            )
+        )
+    db.commit()
+
+    pruner = ExpiredKeyPruner(sessionmaker(bind=db.get_bind()), 60, batch_size=2)
+    assert pruner.due()
+    assert not pruner.due()
+    assert pruner.run() == 2
+    assert pruner.run() == 1
+    assert pruner.run() == 0
+    db.expire_all()
+    assert db.query(IdempotencyKey).count() == 1
+
+
+def test_fallback_feedback_is_not_replayed(
+    client, superuser_token_headers, questions, monkeypatch
+) -> None:
+    """Test a retry after a failed provider call asks the provider again."""
+    _submit(client, superuser_token_headers, "answers", questions[0], 4)
+    calls = []
+
+    def failing(*args):
+        calls.append(args)
+        stats = LLMCallStats(
+            prompt_version="test",
+            model="test",
+            prompt_chars=0,
+            estimated_input_tokens=0,
+            outcome="error",
+        )
+        return {"summary": "fallback"}, stats
+
+    monkeypatch.setattr(
+        ai_feedback_service,
+        "generate_enhanced_competency_feedback_with_stats",
+        failing,
+    )
+    url = f"{settings.API_V1_STR}/competencies/feedback?force_regenerate=true"
+    headers = {**superuser_token_headers, "Idempotency-Key": "feedback-1"}
+    for _ in range(2):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert REPLAYED_HEADER not in response.headers
+    assert len(calls) == 2
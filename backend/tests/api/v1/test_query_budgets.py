@@ -0,0 +1,106 @@
+"""Test endpoints stay within their SQL statement budgets."""
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.query_stats import query_metrics
+from app.models import Answer, CompetencyItem, Question, User, UserCompetency
+from tests.utils.query_budget import assert_max_queries
+
+ITEMS = 6
+QUESTIONS_PER_ITEM = 3
+OTHER_USERS = 4
+
+
+@pytest.fixture
+def catalog(client, superuser_token_headers, db: Session) -> List[Question]:
+    """Seed a catalog large enough that a per-item query breaks the budget."""
+    items = [
+        CompetencyItem(name=f"item {i}", description="d", order=i) for i in range(ITEMS)
+    ]
+    db.add_all(items)
+    db.flush()
+    questions = [
+        Question(text=f"q {item.id}-{n}", competency_item_id=item.id, order=n)
+        for item in items
+        for n in range(QUESTIONS_PER_ITEM)
+    ]
+    others = [
+        User(email=f"other{n}@example.com", name=f"other {n}", hashed_password="x")
+        for n in range(OTHER_USERS)
+    ]
+    db.add_all(questions + others)
+    db.flush()
+    for user in others:
+        db.add_all(
+            Answer(user_id=user.id, question_id=q.id, score=2) for q in questions
+        )
+        db.add_all(
+            UserCompetency(user_id=user.id, competency_item_id=item.id, score=2.0)
+            for item in items
+        )
+    db.commit()
+    # Warm per-process state (revocation list, question ids) like a live server
+    client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=superuser_token_headers,
+        json={"answers": [{"question_id": questions[0].id, "score": 1}]},
+    )
+    client.get(
+        f"{settings.API_V1_STR}/competencies/results", headers=superuser_token_headers
+    )
+    return questions
+
+
+def _answers(questions: List[Question]) -> Dict[str, Any]:
+    return {"answers": [{"question_id": q.id, "score": 4} for q in questions]}
+
+
+@pytest.mark.parametrize(
+    "method, path, budget",
+    [
+        ("GET", "/questions/", 1),
+        ("GET", "/questions/with-answers", 2),
+        ("GET", "/answers/", 1),
+        ("GET", "/competencies/items", 1),
+        ("POST", "/answers/", 5),
+        ("GET", "/competencies/results", 8),
+    ],
+)
+def test_endpoint_query_budget(
+    client, superuser_token_headers, catalog, method: str, path: str, budget: int
+) -> None:
+    """Test each hot endpoint issues a fixed number of statements."""
+    json = _answers(catalog) if method == "POST" else None
+    with assert_max_queries(budget):
+        response = client.request(
+            method,
+            f"{settings.API_V1_STR}{path}",
+            headers=superuser_token_headers,
+            json=json,
+        )
+    assert response.status_code == 200
+
+
+def test_query_counts_are_reported(
+    client, superuser_token_headers, catalog, monkeypatch
+) -> None:
+    """Test per-request counts reach the debug headers and the route totals."""
+    monkeypatch.setattr(settings, "DEBUG", True)
+    query_metrics.reset()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/competencies/results", headers=superuser_token_headers
+    )
+    assert int(response.headers["X-DB-Query-Count"]) > 0
+    assert float(response.headers["X-DB-Time-Ms"]) >= 0
+
+    response = client.get(
+        f"{settings.API_V1_STR}/admin/query-stats", headers=superuser_token_headers
+    )
+    stats = {s["route"]: s for s in response.json()}
+    results = stats[f"{settings.API_V1_STR}/competencies/results"]
+    assert results["requests"] == 1
+    assert results["n_plus_one_requests"] == 0
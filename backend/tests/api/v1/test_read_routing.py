@@ -0,0 +1,181 @@
+"""Test read-only endpoints are routed to the replica."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import crud, schemas
+from app.api import deps
+from app.core.config import settings
+from app.core.database import Base, make_async_url
+from app.core.read_routing import is_pinned_to_primary, recent_writers
+from app.core.user_cache import user_cache
+from app.models import CompetencyItem, LLMUsage, Question, User
+
+
+@pytest.fixture
+def replica(client, db: Session, monkeypatch):
+    """Route replica reads to a second, empty database that never catches up."""
+    primary = db.get_bind().url
+    url = primary.set(database=f"{primary.database}_replica").render_as_string(
+        hide_password=False
+    )
+    replica_engine = create_engine(url)
+    async_replica_engine = create_async_engine(make_async_url(url), poolclass=NullPool)
+    Base.metadata.create_all(bind=replica_engine)
+    replica_session = sessionmaker(autoflush=False, bind=replica_engine)
+    monkeypatch.setattr(deps, "ReplicaSessionLocal", replica_session)
+    monkeypatch.setattr(
+        deps,
+        "AsyncReplicaSessionLocal",
+        async_sessionmaker(async_replica_engine, expire_on_commit=False),
+    )
+    yield replica_session
+    Base.metadata.drop_all(bind=replica_engine)
+    replica_engine.dispose()
+
+
+def test_reads_use_replica(client, replica, superuser_token_headers) -> None:
+    """Test a user without recent writes reads from the replica."""
+    response = client.post(
+        f"{settings.API_V1_STR}/career-plans/",
+        headers=superuser_token_headers,
+        json={"career_direction": "management"},
+    )
+    assert response.status_code == 200
+    recent_writers.clear()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/career-plans/", headers=superuser_token_headers
+    )
+    assert response.status_code == 404
+
+
+def test_writer_is_pinned_to_primary(client, replica, superuser_token_headers) -> None:
+    """Test a user reads their own write right after making it."""
+    response = client.post(
+        f"{settings.API_V1_STR}/career-plans/",
+        headers=superuser_token_headers,
+        json={"career_direction": "management"},
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        f"{settings.API_V1_STR}/career-plans/", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["career_direction"] == "management"
+
+
+def test_async_writer_is_pinned_to_primary(
+    client, replica, superuser_token_headers, db: Session
+) -> None:
+    """Test the answer upsert pins the user for the async read endpoints."""
+    competency_item = CompetencyItem(name="Routing", description="d", order=1)
+    db.add(competency_item)
+    db.flush()
+    question = Question(text="q", competency_item_id=competency_item.id, order=1)
+    db.add(question)
+    db.commit()
+
+    response = client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=superuser_token_headers,
+        json={"answers": [{"question_id": question.id, "score": 4}]},
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        f"{settings.API_V1_STR}/answers/", headers=superuser_token_headers
+    )
+    assert [a["score"] for a in response.json()] == [4]
+
+    recent_writers.clear()
+    response = client.get(
+        f"{settings.API_V1_STR}/answers/", headers=superuser_token_headers
+    )
+    assert response.json() == []
+
+
+def test_reads_authenticate_on_replica(
+    client, replica, superuser_token_headers, db: Session, monkeypatch
+) -> None:
+    """Test read-only endpoints load the user from the replica, not the primary."""
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", False)
+    user = crud.crud_user.get_by_email(db, email="test@example.com")
+    columns = {c.key: getattr(user, c.key) for c in User.__table__.columns}
+    with replica() as replica_db:
+        replica_db.add(User(**columns))
+        replica_db.commit()
+    # Only the replica knows the user now
+    db.delete(user)
+    db.commit()
+    recent_writers.clear()
+    user_cache.clear()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/career-plans/", headers=superuser_token_headers
+    )
+    assert response.status_code == 404
+    user_cache.clear()
+    response = client.get(
+        f"{settings.API_V1_STR}/questions/", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+
+
+def test_replica_rows_are_not_cached(
+    client, replica, superuser_token_headers, db: Session, monkeypatch
+) -> None:
+    """Test a user loaded from a lagging replica can't reach primary requests."""
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", False)
+    user = crud.crud_user.get_by_email(db, email="test@example.com")
+    columns = {c.key: getattr(user, c.key) for c in User.__table__.columns}
+    with replica() as replica_db:
+        replica_db.add(User(**{**columns, "name": "Stale Name"}))
+        replica_db.commit()
+    recent_writers.clear()
+    user_cache.clear()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/career-plans/", headers=superuser_token_headers
+    )
+    assert response.status_code == 404
+    assert user_cache.get(user.id) is None
+    response = client.get(
+        f"{settings.API_V1_STR}/questions/", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    assert user_cache.get(user.id) is None
+
+    response = client.get(
+        f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers
+    )
+    assert response.json()["name"] == "Test User"
+    assert user_cache.get(user.id).name == "Test User"
+
+
+def test_cached_feedback_is_a_pure_read(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test serving stored feedback neither records usage nor pins the user."""
+    user = crud.crud_user.get_by_email(db, email="test@example.com")
+    crud.crud_ai_feedback.create_or_update(
+        db,
+        user_id=user.id,
+        obj_in=schemas.AIFeedbackCreate(feedback_content={"summary": "ok"}),
+    )
+    db.commit()
+    recent_writers.clear()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/competencies/feedback", headers=superuser_token_headers
+    )
+    assert response.json()["from_cache"] is True
+    response = client.get(
+        f"{settings.API_V1_STR}/bootstrap/", headers=superuser_token_headers
+    )
+    assert response.json()["feedback"]["from_cache"] is True
+    assert db.query(LLMUsage).count() == 0
+    assert not is_pinned_to_primary(user.id)
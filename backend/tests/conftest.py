@@ -2,11 +2,20 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
+from app.api.idempotency import key_pruner
 from app.core.config import settings
-from app.core.database import Base
+from app.core.database import Base, make_async_url
+from app.core.read_routing import recent_writers
+from app.core.revocation import revocation_list
+from app.core.user_cache import user_cache
+from app.crud.crud_competency import question_ids_cache
 from app.main import app
+from app.services.answer_buffer import answer_buffer
+from app.services.catalog import catalog
 
 
 # Create test database
@@ -15,6 +24,14 @@ SQLALCHEMY_TEST_DATABASE_URL = f"mysql+pymysql://root:rootpassword@db:3306/compe
 engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Each TestClient runs its own event loop, so async connections can't be pooled
+async_engine = create_async_engine(
+    make_async_url(SQLALCHEMY_TEST_DATABASE_URL), poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="function")
 def db():
@@ -30,20 +47,47 @@ def db():
         session.close()
         # Clean up all data after each test
         Base.metadata.drop_all(bind=engine)
+        # User ids are reused across tests, so cached principals must go too
+        user_cache.clear()
+        revocation_list.reset()
+        question_ids_cache.clear()
+        recent_writers.clear()
+        catalog.invalidate()
 
 
 @pytest.fixture
-def client(db):
+def client(db, monkeypatch):
     """Get test client."""
     from app.api import deps
     
     def override_get_db():
+        # Same unit of work as deps.get_db, on the shared test session
         try:
             yield db
-        finally:
-            pass
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    # Read-only endpoints open their own sessions on the test database
+    monkeypatch.setattr(deps, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(deps, "ReplicaSessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(deps, "AsyncSessionLocal", TestingAsyncSessionLocal)
+    monkeypatch.setattr(deps, "AsyncReplicaSessionLocal", TestingAsyncSessionLocal)
+    monkeypatch.setattr(answer_buffer, "session_factory", TestingSessionLocal)
+    monkeypatch.setattr(key_pruner, "session_factory", TestingSessionLocal)
+
     app.dependency_overrides[deps.get_db] = override_get_db
+    app.dependency_overrides[deps.get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -69,6 +113,7 @@ def superuser_token_headers(client, db):
             is_superuser=True
         )
         user = crud.crud_user.create(db, obj_in=user_in)
+        db.commit()
     
     # Get token
     login_data = {
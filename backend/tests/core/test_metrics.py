@@ -0,0 +1,56 @@
+"""Test the Prometheus metrics endpoint."""
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.core.database import engine
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_cover_routes_pools_and_threadpool(
+    client, superuser_token_headers
+) -> None:
+    """Test request, pool and threadpool metrics are exposed."""
+    route = f"{settings.API_V1_STR}/questions/"
+    before = _sample(
+        "http_request_duration_seconds_count", method="GET", route=route, status="200"
+    )
+    client.get(route, headers=superuser_token_headers)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "http_requests_in_flight" in body
+    assert 'db_pool_size{pool="primary"}' in body
+    assert "threadpool_threads_limit" in body
+    assert f'db_queries_per_request_count{{route="{route}"}}' in body
+    assert (
+        _sample(
+            "http_request_duration_seconds_count",
+            method="GET",
+            route=route,
+            status="200",
+        )
+        == before + 1
+    )
+
+
+def test_feedback_cache_results_are_counted(client, superuser_token_headers) -> None:
+    """Test a feedback request without cached feedback counts as a miss."""
+    before = _sample("ai_feedback_requests_total", result="miss")
+    response = client.get(
+        f"{settings.API_V1_STR}/competencies/feedback", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    assert _sample("ai_feedback_requests_total", result="miss") == before + 1
+
+
+def test_pool_checkout_is_timed() -> None:
+    """Test checking out a connection records the wait by pool name."""
+    before = _sample("db_pool_checkout_seconds_count", pool="primary")
+    with engine.connect():
+        pass
+    assert _sample("db_pool_checkout_seconds_count", pool="primary") == before + 1
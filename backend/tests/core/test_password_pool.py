@@ -0,0 +1,71 @@
+"""Test the password hashing pool."""
+import threading
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.password_pool import (
+    PasswordHasherPool,
+    PasswordPoolBusy,
+    get_crypt_context,
+    password_pool,
+)
+
+
+def test_pool_rejects_calls_over_admission_limit() -> None:
+    """Test calls beyond the admission limit fail fast instead of queueing."""
+    pool = PasswordHasherPool(workers=0, max_pending=0, timeout=1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow() -> None:
+        started.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=pool._run, args=(slow,))
+    worker.start()
+    started.wait(5)
+    with pytest.raises(PasswordPoolBusy):
+        pool._run(lambda: None)
+    release.set()
+    worker.join()
+    assert pool._run(lambda: "ok") == "ok"
+    assert pool.rejected == 1
+
+
+def test_login_returns_503_when_pool_is_full(
+    client, superuser_token_headers, db: Session
+) -> None:
+    """Test overflowing logins get a 503 with Retry-After."""
+    held = 0
+    while password_pool._slots.acquire(blocking=False):
+        held += 1
+    try:
+        r = client.post(
+            f"{settings.API_V1_STR}/auth/login",
+            data={"username": "test@example.com", "password": "testpassword"},
+        )
+    finally:
+        for _ in range(held):
+            password_pool._slots.release()
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+
+
+def test_password_is_rehashed_when_cost_changes(
+    client, superuser_token_headers, db: Session, monkeypatch
+) -> None:
+    """Test a stored hash is upgraded on login after the cost changes."""
+    user = crud.crud_user.get_by_email(db, email="test@example.com")
+    user.hashed_password = get_crypt_context(4).hash("testpassword")
+    db.commit()
+
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    r = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        data={"username": "test@example.com", "password": "testpassword"},
+    )
+    assert r.status_code == 200
+    db.refresh(user)
+    assert user.hashed_password.startswith("$2b$05$")
@@ -0,0 +1,90 @@
+"""Test the request profiler."""
+import os
+import time
+
+import pytest
+from pyinstrument import Profiler
+
+from app.core import security
+from app.core.config import settings
+from app.core.profiling import folded_stacks, request_profiler, self_times
+
+
+@pytest.fixture
+def profiles_dir(tmp_path, monkeypatch) -> str:
+    """Write profiles to a temporary directory and start with no totals."""
+    monkeypatch.setattr(request_profiler, "output_dir", str(tmp_path))
+    request_profiler.reset()
+    yield str(tmp_path)
+    request_profiler.reset()
+
+
+def _spin(seconds: float) -> None:
+    started_at = time.perf_counter()
+    while time.perf_counter() - started_at < seconds:
+        pass
+
+
+def test_folded_stacks_and_self_times() -> None:
+    """Test a profile collapses into stacks and per-function self time."""
+    profiler = Profiler(interval=0.001)
+    profiler.start()
+    _spin(0.05)
+    root = profiler.stop().root_frame()
+
+    stacks = folded_stacks(root)
+    assert any("_spin (" in stack.split(";")[-1] for stack in stacks)
+    hottest, seconds = max(self_times(root).items(), key=lambda item: item[1])
+    assert hottest.startswith(("_spin", "perf_counter"))
+    assert seconds > 0
+
+
+def test_admin_header_profiles_request(
+    client, superuser_token_headers, profiles_dir
+) -> None:
+    """Test an admin's profile header writes folded stacks for the route."""
+    response = client.get(
+        f"{settings.API_V1_STR}/questions/",
+        headers={**superuser_token_headers, settings.PROFILE_HEADER: "1"},
+    )
+    assert response.status_code == 200
+
+    route_dir = os.path.join(profiles_dir, "GET_api_v1_questions")
+    path = os.path.join(route_dir, response.headers["X-Profile-File"])
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines
+    stack, samples = lines[0].rsplit(" ", 1)
+    assert stack and int(samples) > 0
+
+    response = client.get(
+        f"{settings.API_V1_STR}/admin/profiles", headers=superuser_token_headers
+    )
+    profiles = {p["route"]: p for p in response.json()}
+    questions = profiles[f"GET {settings.API_V1_STR}/questions/"]
+    assert questions["profiles"] == 1
+    assert questions["hot_functions"]
+
+
+def test_profile_header_requires_superuser(client, profiles_dir) -> None:
+    """Test the profile header is ignored for non-admin tokens."""
+    token = security.create_access_token(
+        1, claims={"is_active": True, "is_superuser": False}
+    )
+    response = client.get(
+        "/health",
+        headers={
+            "Authorization": f"Bearer {token}",
+            settings.PROFILE_HEADER: "1",
+        },
+    )
+    assert "X-Profile-File" not in response.headers
+    assert os.listdir(profiles_dir) == []
+
+
+def test_sampled_requests_are_profiled(client, profiles_dir, monkeypatch) -> None:
+    """Test the sample rate profiles requests without exposing the file."""
+    monkeypatch.setattr(request_profiler, "sample_rate", 1.0)
+    response = client.get("/health")
+    assert "X-Profile-File" not in response.headers
+    assert os.listdir(os.path.join(profiles_dir, "GET_health"))
@@ -0,0 +1,61 @@
+"""Test the slow query log."""
+import json
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core import slow_query_log as slow_query_log_module
+from app.core.slow_query_log import SlowQueryLog, parameter_shape
+from app.models import User
+
+
+@pytest.fixture
+def slow_log(tmp_path, monkeypatch):
+    """Log every statement to a temporary file."""
+    log = SlowQueryLog(
+        threshold_ms=0,
+        sample_rate=1.0,
+        path=str(tmp_path / "slow.jsonl"),
+        max_bytes=1024 * 1024,
+        backup_count=1,
+    )
+    monkeypatch.setattr(slow_query_log_module, "slow_query_log", log)
+    yield log
+    log.shutdown()
+
+
+def test_slow_statement_is_logged_with_plan(slow_log, db: Session) -> None:
+    """Test a slow statement is logged with its call site, shape and plan."""
+    user = User(email="slow@example.com", name="slow", hashed_password="x")
+    db.add(user)
+    db.commit()
+
+    crud.crud_answer.get_user_answers(db, user_id=user.id)
+    slow_log.flush()
+
+    with open(slow_log.path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    entry = next(e for e in entries if e["statement"].startswith("SELECT answers"))
+    assert entry["call_site"].startswith("app/crud/crud_competency.py:")
+    assert entry["call_site"].endswith("in get_user_answers")
+    assert entry["parameters"] in (["int"], {"user_id_1": "int"})
+    assert entry["explain"] and "error" not in entry["explain"][0]
+
+
+def test_fast_statements_are_not_sampled() -> None:
+    """Test statements under the threshold or outside the sample are skipped."""
+    log = SlowQueryLog(
+        threshold_ms=100, sample_rate=0.0, path="unused", max_bytes=1, backup_count=0
+    )
+    assert not log.should_capture(50)
+    assert not log.should_capture(500)
+    log.sample_rate = 1.0
+    assert log.should_capture(500)
+
+
+def test_parameter_shape_hides_values() -> None:
+    """Test only parameter types are recorded."""
+    assert parameter_shape((1, "secret")) == ["int", "str"]
+    assert parameter_shape({"email": "a@example.com"}) == {"email": "str"}
+    assert parameter_shape([(1, 2), (3, 4)]) == {"rows": 2, "row": ["int", "int"]}
@@ -0,0 +1,127 @@
+"""Test request tracing."""
+import json
+from typing import List
+
+import pytest
+
+from app.core.config import settings
+from app.core.tracing import JsonLinesExporter, OTLPHttpExporter, Span, tracer
+
+
+class MemoryExporter:
+    """Keeps exported spans for assertions."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, spans: List[Span]) -> None:
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+def exported(monkeypatch) -> MemoryExporter:
+    """Trace every request into memory."""
+    exporter = MemoryExporter()
+    monkeypatch.setattr(tracer, "sample_rate", 1.0)
+    monkeypatch.setattr(tracer, "exporters", [exporter])
+    yield exporter
+    tracer.flush()
+
+
+def test_request_is_traced_end_to_end(
+    client, superuser_token_headers, exported
+) -> None:
+    """Test spans from the request down to SQL share one nested trace."""
+    response = client.get(
+        f"{settings.API_V1_STR}/competencies/results", headers=superuser_token_headers
+    )
+    tracer.flush()
+
+    trace_id = response.headers["X-Trace-Id"]
+    spans = {s.span_id: s for s in exported.spans if s.trace_id == trace_id}
+    names = {s.name for s in spans.values()}
+    root = next(s for s in spans.values() if s.parent_id is None)
+    assert root.name == f"GET {settings.API_V1_STR}/competencies/results"
+    assert root.attributes["http.status_code"] == 200
+    assert "CompetencyCalculator.get_competency_results" in names
+    assert "crud.CRUDAnswer.get_user_answers" in names
+
+    query = next(s for s in spans.values() if s.name == "db.query")
+    assert query.attributes["db.statement"]
+    # Every span hangs off the request and ends within it
+    for span in spans.values():
+        ancestor = span
+        while ancestor.parent_id is not None:
+            ancestor = spans[ancestor.parent_id]
+        assert ancestor is root
+        assert root.start_ns <= span.start_ns <= span.end_ns <= root.end_ns
+
+
+def test_unsampled_requests_export_nothing(
+    client, superuser_token_headers, exported, monkeypatch
+) -> None:
+    """Test a zero sample rate records no spans."""
+    monkeypatch.setattr(tracer, "sample_rate", 0.0)
+    response = client.get(
+        f"{settings.API_V1_STR}/questions/", headers=superuser_token_headers
+    )
+    tracer.flush()
+    assert "X-Trace-Id" not in response.headers
+    assert exported.spans == []
+
+
+def test_traceparent_continues_the_callers_trace(
+    client, superuser_token_headers, exported, monkeypatch
+) -> None:
+    """Test a sampled traceparent header is followed despite the sample rate."""
+    monkeypatch.setattr(tracer, "sample_rate", 0.0)
+    trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+    client.get(
+        f"{settings.API_V1_STR}/questions/",
+        headers={
+            **superuser_token_headers,
+            "traceparent": f"00-{trace_id}-{parent_id}-01",
+        },
+    )
+    tracer.flush()
+    root = next(s for s in exported.spans if s.parent_id == parent_id)
+    assert root.trace_id == trace_id
+
+
+def _finished_span() -> Span:
+    return Span(
+        name="GET /health",
+        trace_id="a" * 32,
+        span_id="b" * 16,
+        parent_id=None,
+        start_ns=1_000_000,
+        end_ns=3_000_000,
+        attributes={"http.status_code": 200, "http.route": "/health"},
+    )
+
+
+def test_json_lines_exporter(tmp_path) -> None:
+    """Test spans are written one JSON object per line."""
+    exporter = JsonLinesExporter(str(tmp_path / "traces.jsonl"), 1024 * 1024, 1)
+    exporter.export([_finished_span()])
+    with open(exporter.path, encoding="utf-8") as f:
+        entry = json.loads(f.readline())
+    assert entry["name"] == "GET /health"
+    assert entry["duration_ms"] == 2.0
+
+
+def test_otlp_payload() -> None:
+    """Test the OTLP/HTTP JSON body follows the collector's schema."""
+    exporter = OTLPHttpExporter("http://localhost:4318/v1/traces", "competency-api")
+    payload = exporter.payload([_finished_span()])
+    resource_spans = payload["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "competency-api"}}
+    ]
+    span = resource_spans["scopeSpans"][0]["spans"][0]
+    assert span["traceId"] == "a" * 32
+    assert span["startTimeUnixNano"] == "1000000"
+    assert {"key": "http.status_code", "value": {"intValue": "200"}} in span[
+        "attributes"
+    ]
+    assert "parentSpanId" not in span
@@ -0,0 +1,70 @@
+"""Test the authenticated user cache."""
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.cache import LRUTTLCache
+from app.core.user_cache import user_cache
+
+
+def test_lru_eviction_and_ttl(monkeypatch) -> None:
+    """Test least recently used entries are evicted and stale ones expire."""
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    cache: LRUTTLCache[str] = LRUTTLCache(max_size=2, ttl_seconds=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"
+    cache.set(3, "c")
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+
+    now[0] += 61
+    assert cache.get(3) is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cached_user_is_invalidated_on_update(
+    client, superuser_token_headers, db: Session, monkeypatch
+) -> None:
+    """Test requests reuse the cached user until the user is updated."""
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", False)
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    assert r.json()["name"] == "Test User"
+    user = crud.crud_user.get_by_email(db, email="test@example.com")
+    assert user_cache.get(user.id) is not None
+
+    r = client.put(
+        f"{settings.API_V1_STR}/users/me",
+        headers=superuser_token_headers,
+        json={"name": "Renamed User"},
+    )
+    assert r.status_code == 200
+    assert user_cache.get(user.id) is None
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    assert r.json()["name"] == "Renamed User"
+
+    r = client.get(
+        f"{settings.API_V1_STR}/admin/user-cache", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    assert r.json()["hits"] >= 1
+
+
+def test_trusted_token_claims(
+    client, superuser_token_headers, db: Session, monkeypatch
+) -> None:
+    """Test fresh token claims authenticate without touching the cache."""
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+    r = client.get(
+        f"{settings.API_V1_STR}/admin/user-cache", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    assert r.json()["hits"] == 0
+    assert r.json()["misses"] == 0
@@ -0,0 +1,49 @@
+"""Test AI feedback storage."""
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.models import FeedbackBlob, User
+
+
+def _create_user(db: Session, email: str) -> User:
+    user = User(email=email, name=email, hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_identical_payloads_are_stored_once(db: Session) -> None:
+    """Test users with identical feedback share the same blobs."""
+    feedback_in = schemas.AIFeedbackCreate(
+        feedback_content={"strengths": "強み", "overall": "総合"},
+        career_suggestions=["定期的な振り返りを行いましょう"],
+        book_recommendations=[{"title": "7つの習慣", "author": "コヴィー"}],
+    )
+    first = crud.crud_ai_feedback.create_or_update(
+        db, user_id=_create_user(db, "a@example.com").id, obj_in=feedback_in
+    )
+    second = crud.crud_ai_feedback.create_or_update(
+        db, user_id=_create_user(db, "b@example.com").id, obj_in=feedback_in
+    )
+
+    assert first.feedback_hash == second.feedback_hash
+    assert db.query(FeedbackBlob).count() == 3
+    assert second.feedback_content == feedback_in.feedback_content
+    assert second.book_recommendations == feedback_in.book_recommendations
+
+
+def test_regeneration_keeps_version_history(db: Session) -> None:
+    """Test each regeneration appends a version referencing its blobs."""
+    user = _create_user(db, "c@example.com")
+    for overall in ("v1", "v2"):
+        crud.crud_ai_feedback.create_or_update(
+            db,
+            user_id=user.id,
+            obj_in=schemas.AIFeedbackCreate(feedback_content={"overall": overall}),
+        )
+
+    current = crud.crud_ai_feedback.get_by_user_id(db, user_id=user.id)
+    history = crud.crud_ai_feedback.get_history(db, user_id=user.id)
+    assert current.feedback_content == {"overall": "v2"}
+    assert current.career_suggestions is None
+    assert [v.feedback_content["overall"] for v in history] == ["v2", "v1"]
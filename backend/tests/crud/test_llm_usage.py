@@ -0,0 +1,43 @@
+"""Test the LLM usage ledger and its daily rollups."""
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud, schemas
+from app.crud.crud_llm_usage import _bucket_index
+from app.models import LLMUsage, LLMUsageDaily, User
+
+
+def _usage(user_id: int, **kwargs) -> schemas.LLMUsageCreate:
+    fields = {
+        "department": "Engineering",
+        "prompt_version": "enhanced-v2",
+        "model": "gpt-4",
+        "outcome": "success",
+        **kwargs,
+    }
+    return schemas.LLMUsageCreate(user_id=user_id, **fields)
+
+
+def test_first_calls_of_a_day_share_one_rollup(db: Session) -> None:
+    """Test calls recorded by separate sessions fold into the same new row."""
+    user = User(email="usage@example.com", name="Usage", hashed_password="x")
+    db.add(user)
+    db.commit()
+    sessions = sessionmaker(bind=db.get_bind())
+    for obj_in in (
+        _usage(user.id, input_tokens=1000, output_tokens=500, latency_ms=800),
+        _usage(user.id, input_tokens=200, output_tokens=100, latency_ms=900),
+        _usage(user.id, latency_ms=30000, outcome="error"),
+    ):
+        with sessions() as session:
+            crud.crud_llm_usage.record(session, obj_in=obj_in)
+            session.commit()
+
+    assert db.query(LLMUsage).count() == 3
+    rollup = db.query(LLMUsageDaily).one()
+    assert rollup.call_count == 3
+    assert rollup.error_count == 1
+    assert (rollup.input_tokens, rollup.output_tokens) == (1200, 600)
+    expected = [0] * len(rollup.latency_histogram)
+    expected[_bucket_index(800)] = 2
+    expected[_bucket_index(30000)] = 1
+    assert rollup.latency_histogram == expected
@@ -0,0 +1,153 @@
+"""EXPLAIN the hot CRUD queries and fail on full table scans."""
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+import pytest
+from jose import jwt
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models import (
+    Answer,
+    CompetencyItem,
+    Question,
+    User,
+    UserCareerPlan,
+    UserCompetency,
+)
+from app.services.catalog import catalog, catalog_version
+from app.services.competency_calculator import CompetencyCalculator
+from tests.utils.query_plan import Statement, assert_indexed, capture_selects
+
+USERS = 20
+ITEMS = 4
+QUESTIONS_PER_ITEM = 5
+
+
+@pytest.fixture
+def seeded(db: Session) -> Dict[str, Any]:
+    """Populate enough rows that an unindexed lookup shows up as a scan."""
+    items = [
+        CompetencyItem(name=f"item {i}", description="d", order=i) for i in range(ITEMS)
+    ]
+    db.add_all(items)
+    db.flush()
+    questions = [
+        Question(text=f"q {item.id}-{n}", competency_item_id=item.id, order=n)
+        for item in items
+        for n in range(QUESTIONS_PER_ITEM)
+    ]
+    users = [
+        User(email=f"user{n}@example.com", name=f"user {n}", hashed_password="x")
+        for n in range(USERS)
+    ]
+    db.add_all(questions + users)
+    db.flush()
+    for user in users:
+        db.add_all(
+            Answer(user_id=user.id, question_id=q.id, score=3) for q in questions
+        )
+        db.add_all(
+            UserCompetency(user_id=user.id, competency_item_id=item.id, score=3.0)
+            for item in items
+        )
+        db.add(UserCareerPlan(user_id=user.id))
+        crud.crud_ai_feedback.create_or_update(
+            db,
+            user_id=user.id,
+            obj_in=schemas.AIFeedbackCreate(feedback_content={"overall": user.name}),
+        )
+        crud.crud_refresh_token.issue(db, user_id=user.id)
+    db.commit()
+    return {"user": users[-1], "item": items[-1], "question": questions[-1]}
+
+
+def _is_revoked(db: Session, seeded: Dict[str, Any]) -> Any:
+    token = create_access_token(seeded["user"].id)
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    return crud.crud_token_revocation.is_revoked(
+        db,
+        jti=payload["jti"],
+        user_id=seeded["user"].id,
+        issued_at=datetime.utcnow() - timedelta(minutes=1),
+    )
+
+
+def _per_user_reads(statements: List[Statement]) -> List[Statement]:
+    # The catalog and its one-row-per-item averages are small and read whole
+    return [
+        s
+        for s in statements
+        if "FROM competency_items" not in s[0]
+        and "FROM company_average_competencies" not in s[0]
+    ]
+
+
+HOT_QUERIES: Dict[str, Callable[[Session, Dict[str, Any]], Any]] = {
+    "catalog version": lambda db, s: catalog_version(db),
+    "user by id": lambda db, s: crud.crud_user.get(db, id=s["user"].id),
+    "user by email": lambda db, s: crud.crud_user.get_by_email(
+        db, email=s["user"].email
+    ),
+    "answers by user": lambda db, s: crud.crud_answer.get_user_answers(
+        db, user_id=s["user"].id
+    ),
+    "answer by user and question": lambda db, s: crud.crud_answer.get_user_answer(
+        db, user_id=s["user"].id, question_id=s["question"].id
+    ),
+    "question with competency": lambda db, s: crud.crud_question.get_with_competency(
+        db, id=s["question"].id
+    ),
+    "questions by competency item": lambda db, s: db.get(
+        CompetencyItem, s["item"].id
+    ).questions,
+    "latest ai feedback by user": lambda db, s: crud.crud_ai_feedback.get_by_user_id(
+        db, user_id=s["user"].id
+    ),
+    "ai feedback history by user": lambda db, s: crud.crud_ai_feedback.get_history(
+        db, user_id=s["user"].id
+    ),
+    "career plan by user": lambda db, s: crud.crud_user_career_plan.get_by_user_id(
+        db, user_id=s["user"].id
+    ),
+    "token revocation lookup": _is_revoked,
+}
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_index(db: Session, seeded: Dict[str, Any], name: str) -> None:
+    """Test each hot CRUD query is answered from an index."""
+    db.expire_all()
+    with capture_selects(db) as statements:
+        HOT_QUERIES[name](db, seeded)
+    assert_indexed(db, statements)
+
+
+def test_bulk_answer_submission_uses_index(db: Session, seeded: Dict[str, Any]) -> None:
+    """Test the warm answer upsert reads back rows through the unique key."""
+    user_id = seeded["user"].id
+    answers = [schemas.AnswerCreate(question_id=seeded["question"].id, score=4)]
+    # The first call loads the valid question ids; only the warm path is hot
+    crud.crud_answer.bulk_create_or_update(db, user_id=user_id, answers=answers)
+    with capture_selects(db) as statements:
+        crud.crud_answer.bulk_create_or_update(db, user_id=user_id, answers=answers)
+    assert_indexed(db, statements)
+
+
+def test_competency_calculation_uses_index(db: Session, seeded: Dict[str, Any]) -> None:
+    """Test per-user score lookups go through the user/item unique key."""
+    catalog.get(db)  # Loaded once per catalog version, not per user
+    db.expire_all()
+    with capture_selects(db) as statements:
+        CompetencyCalculator.calculate_user_competencies(db, user_id=seeded["user"].id)
+    assert_indexed(db, _per_user_reads(statements))
+
+
+def test_company_average_uses_index(db: Session, seeded: Dict[str, Any]) -> None:
+    """Test the company averages are aggregated from the covering index."""
+    db.expire_all()
+    with capture_selects(db) as statements:
+        CompetencyCalculator.calculate_company_averages(db)
+    assert_indexed(db, _per_user_reads(statements), allow_covering_scan=True)
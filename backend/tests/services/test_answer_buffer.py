@@ -0,0 +1,250 @@
+"""Test the write-behind buffer for autosaved answers."""
+import threading
+import time
+from typing import Dict, List
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud
+from app.core.config import settings
+from app.models import Answer, CompetencyItem, Question, User
+from app.services.answer_buffer import AnswerWriteBuffer, answer_buffer
+
+
+@pytest.fixture
+def questions(db: Session) -> List[Question]:
+    """Seed one item with three questions."""
+    item = CompetencyItem(name="Planning", order=1)
+    db.add(item)
+    db.flush()
+    questions = [
+        Question(text=f"q{n}", competency_item_id=item.id, order=n) for n in range(3)
+    ]
+    db.add_all(questions)
+    db.commit()
+    return questions
+
+
+@pytest.fixture
+def users(db: Session) -> List[User]:
+    """Seed two users."""
+    users = [
+        User(email=f"user{n}@example.com", name=f"User {n}", hashed_password="x")
+        for n in range(2)
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+@pytest.fixture
+def buffer(db: Session):
+    """A buffer on the test database that only flushes when told to."""
+    buffer = AnswerWriteBuffer(
+        sessionmaker(bind=db.get_bind()), flush_seconds=3600, max_pending=100
+    )
+    yield buffer
+    buffer.shutdown()
+
+
+def _stored(db: Session) -> Dict[tuple, int]:
+    db.expire_all()
+    return {(a.user_id, a.question_id): a.score for a in db.query(Answer)}
+
+
+def test_rapid_changes_coalesce_into_one_batch(
+    db: Session, buffer, questions, users
+) -> None:
+    """Test only the latest score per question is written, for all users at once."""
+    for score in (1, 2, 5):
+        buffer.put(users[0].id, questions[0].id, score)
+    buffer.put(users[0].id, questions[1].id, 3)
+    buffer.put(users[1].id, questions[0].id, 4)
+    assert _stored(db) == {}
+
+    assert buffer.flush() == 3
+    assert _stored(db) == {
+        (users[0].id, questions[0].id): 5,
+        (users[0].id, questions[1].id): 3,
+        (users[1].id, questions[0].id): 4,
+    }
+    assert not buffer.has_pending(users[0].id)
+    assert buffer.flush() == 0
+
+
+def test_failed_flush_keeps_answers(
+    db: Session, buffer, questions, users, monkeypatch
+) -> None:
+    """Test a failed write is retried later without overwriting newer scores."""
+    user_id = users[0].id
+    buffer.put(user_id, questions[0].id, 2)
+    buffer.put(user_id, questions[1].id, 2)
+
+    def unavailable(*args, **kwargs):
+        # A score autosaved while the write is in flight
+        buffer.put(user_id, questions[1].id, 4)
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(crud.crud_answer, "upsert_scores", unavailable)
+    with pytest.raises(ConnectionError):
+        buffer.flush()
+    assert buffer.pending(user_id) == {questions[0].id: 2, questions[1].id: 4}
+
+    monkeypatch.undo()
+    buffer.flush()
+    assert _stored(db) == {(user_id, questions[0].id): 2, (user_id, questions[1].id): 4}
+
+
+def test_answers_to_deleted_questions_are_dropped(
+    db: Session, buffer, questions, users
+) -> None:
+    """Test a question deleted after its autosave does not block the batch."""
+    buffer.put(users[0].id, questions[0].id, 3)
+    buffer.put(users[0].id, questions[2].id, 3)
+    db.delete(questions[2])
+    db.commit()
+
+    assert buffer.flush() == 1
+    assert _stored(db) == {(users[0].id, questions[0].id): 3}
+    assert not buffer.has_pending(users[0].id)
+
+
+def test_timer_and_size_trigger_flushes(db: Session, questions, users) -> None:
+    """Test the background thread flushes on its interval and when full."""
+    factory = sessionmaker(bind=db.get_bind())
+    timed = AnswerWriteBuffer(factory, flush_seconds=0.05, max_pending=100)
+    full = AnswerWriteBuffer(factory, flush_seconds=3600, max_pending=2)
+    try:
+        timed.put(users[0].id, questions[0].id, 1)
+        full.put(users[1].id, questions[0].id, 1)
+        full.put(users[1].id, questions[1].id, 1)
+        deadline = time.monotonic() + 5
+        while len(_stored(db)) < 3 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert len(_stored(db)) == 3
+    finally:
+        timed.shutdown()
+        full.shutdown()
+
+
+def test_shutdown_drains_pending_answers(db: Session, buffer, questions, users) -> None:
+    """Test graceful shutdown writes everything and stops the thread."""
+    buffer.put(users[0].id, questions[0].id, 4)
+    buffer.shutdown()
+    assert _stored(db) == {(users[0].id, questions[0].id): 4}
+    assert buffer._thread is None
+
+
+def test_autosave_endpoint(client, superuser_token_headers, db: Session, questions):
+    """Test autosaves are accepted, read back, and folded into the submission."""
+    url = f"{settings.API_V1_STR}/answers"
+    response = client.patch(
+        f"{url}/{questions[0].id}", headers=superuser_token_headers, json={"score": 2}
+    )
+    assert response.status_code == 202
+    assert response.json() == {"question_id": questions[0].id, "score": 2}
+    response = client.patch(
+        f"{url}/999999", headers=superuser_token_headers, json={"score": 2}
+    )
+    assert response.status_code == 404
+
+    # Reading the answers writes the user's autosaves first
+    response = client.get(f"{url}/", headers=superuser_token_headers)
+    assert [(a["question_id"], a["score"]) for a in response.json()] == [
+        (questions[0].id, 2)
+    ]
+
+    client.patch(
+        f"{url}/{questions[1].id}", headers=superuser_token_headers, json={"score": 5}
+    )
+    client.patch(
+        f"{url}/{questions[2].id}", headers=superuser_token_headers, json={"score": 5}
+    )
+    response = client.post(
+        f"{url}/",
+        headers=superuser_token_headers,
+        json={"answers": [{"question_id": questions[2].id, "score": 1}]},
+    )
+    scores = {a["question_id"]: a["score"] for a in response.json()}
+    assert scores == {questions[1].id: 5, questions[2].id: 1}
+    user = crud.crud_user.get_by_email(db, email="test@example.com")
+    assert not answer_buffer.has_pending(user.id)
+
+
+def test_take_waits_for_a_flush_in_progress(
+    db: Session, buffer, questions, users, monkeypatch
+) -> None:
+    """Test an older autosave being flushed cannot land after a submission."""
+    user_id = users[0].id
+    buffer.put(user_id, questions[0].id, 2)
+    upsert = crud.crud_answer.upsert_scores
+    writing, release = threading.Event(), threading.Event()
+
+    def slow_upsert(*args, **kwargs):
+        writing.set()
+        release.wait(5)
+        return upsert(*args, **kwargs)
+
+    monkeypatch.setattr(crud.crud_answer, "upsert_scores", slow_upsert)
+    flusher = threading.Thread(target=buffer.flush)
+    flusher.start()
+    assert writing.wait(5)
+
+    taken = []
+    taker = threading.Thread(target=lambda: taken.append(buffer.take(user_id)))
+    taker.start()
+    taker.join(0.1)
+    assert taker.is_alive()
+
+    release.set()
+    flusher.join(5)
+    taker.join(5)
+    assert taken == [{}]
+    # The submission writes after the flush has committed, so it wins
+    monkeypatch.undo()
+    crud.crud_answer.upsert_scores(db, scores={user_id: {questions[0].id: 5}})
+    db.commit()
+    assert _stored(db) == {(user_id, questions[0].id): 5}
+
+
+def test_taken_answers_return_on_rollback(
+    db: Session, buffer, questions, users
+) -> None:
+    """Test a failed submission puts taken autosaves back, behind newer ones."""
+    user_id = users[0].id
+    buffer.put(user_id, questions[0].id, 2)
+    buffer.put(user_id, questions[1].id, 2)
+    taken = buffer.take(user_id)
+    assert taken == {questions[0].id: 2, questions[1].id: 2}
+    assert not buffer.has_pending(user_id)
+
+    buffer.restore_on_rollback(db, user_id, taken)
+    buffer.put(user_id, questions[1].id, 4)
+    db.rollback()
+    assert buffer.pending(user_id) == {questions[0].id: 2, questions[1].id: 4}
+
+    taken = buffer.take(user_id)
+    buffer.restore_on_rollback(db, user_id, taken)
+    db.commit()
+    assert not buffer.has_pending(user_id)
+
+
+def test_rejected_answers_only_cost_their_owner(
+    db: Session, buffer, questions, users
+) -> None:
+    """Test stale cached question ids and deleted users don't block others."""
+    buffer.put(users[0].id, questions[0].id, 1)
+    buffer.put(users[0].id, questions[2].id, 1)
+    buffer.put(users[1].id, questions[1].id, 2)
+    # Cached ids still include the question deleted below
+    crud.crud_answer._validate_question_ids(db, [q.id for q in questions])
+    db.execute(delete(Question).where(Question.id == questions[2].id))
+    db.execute(delete(User).where(User.id == users[1].id))
+    db.commit()
+
+    assert buffer.flush() == 1
+    assert _stored(db) == {(users[0].id, questions[0].id): 1}
+    assert not buffer.has_pending(users[0].id)
+    assert not buffer.has_pending(users[1].id)
@@ -0,0 +1,143 @@
+"""Test the in-memory questionnaire catalog."""
+from typing import List
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.core.config import settings
+from app.crud.crud_data_version import CATALOG
+from app.models import Answer, CompetencyItem, DataVersion, Question, User
+from app.services.catalog import bump_catalog_version, catalog, catalog_version
+from tests.utils.query_budget import assert_max_queries
+
+
+@pytest.fixture
+def questions(db: Session) -> List[Question]:
+    """Seed two items with two questions each."""
+    items = [CompetencyItem(name=f"item {i}", order=i) for i in range(2)]
+    db.add_all(items)
+    db.flush()
+    questions = [
+        Question(text=f"q {item.id}-{n}", competency_item_id=item.id, order=n)
+        for item in items
+        for n in range(2)
+    ]
+    db.add_all(questions)
+    db.commit()
+    return questions
+
+
+def test_catalog_changes_bump_the_version(db: Session, questions) -> None:
+    """Test ORM and bulk changes to the catalog bump its version once each."""
+    version = catalog_version(db)
+    assert version == 1
+
+    questions[0].text = "changed"
+    questions[1].text = "changed too"
+    db.commit()
+    assert catalog_version(db) == version + 1
+
+    db.execute(update(Question).values(max_score=4))
+    db.commit()
+    assert catalog_version(db) == version + 2
+
+    user = User(email="catalog@example.com", name="Catalog", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add(Answer(user_id=user.id, question_id=questions[0].id, score=3))
+    db.commit()
+    assert catalog_version(db) == version + 2
+
+
+def test_snapshot_serves_encoded_responses(
+    client, superuser_token_headers, db: Session, questions
+) -> None:
+    """Test responses equal the schema encoding and are served from memory."""
+    response = client.get(
+        f"{settings.API_V1_STR}/questions/", headers=superuser_token_headers
+    )
+    expected = [
+        schemas.Question.model_validate(q).model_dump(mode="json") for q in questions
+    ]
+    assert sorted(response.json(), key=lambda q: q["id"]) == sorted(
+        expected, key=lambda q: q["id"]
+    )
+
+    with assert_max_queries(0):
+        response = client.get(
+            f"{settings.API_V1_STR}/questions/{questions[1].id}",
+            headers=superuser_token_headers,
+        )
+    assert response.json()["text"] == questions[1].text
+
+    response = client.get(
+        f"{settings.API_V1_STR}/questions/?skip=1&limit=2",
+        headers=superuser_token_headers,
+    )
+    assert len(response.json()) == 2
+
+    response = client.get(
+        f"{settings.API_V1_STR}/competencies/items", headers=superuser_token_headers
+    )
+    assert [item["name"] for item in response.json()] == ["item 0", "item 1"]
+
+
+def test_questions_with_answers_splices_scores(
+    client, superuser_token_headers, db: Session, questions
+) -> None:
+    """Test each question carries the user's score or null."""
+    response = client.post(
+        f"{settings.API_V1_STR}/answers/",
+        headers=superuser_token_headers,
+        json={"answers": [{"question_id": questions[2].id, "score": 4}]},
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        f"{settings.API_V1_STR}/questions/with-answers",
+        headers=superuser_token_headers,
+    )
+    answers = {q["id"]: q["user_answer"] for q in response.json()}
+    assert answers == {q.id: (4 if q is questions[2] else None) for q in questions}
+    schemas.QuestionWithAnswer.model_validate(response.json()[0])
+
+
+def test_empty_catalog_encodes_empty_list(db: Session) -> None:
+    """Test splicing scores into an empty catalog still yields valid JSON."""
+    assert catalog.get(db).questions_with_answers_json({1: 3}) == b"[]"
+
+
+def test_local_commit_reloads_snapshot(db: Session, questions) -> None:
+    """Test a catalog change committed in this process is visible at once."""
+    assert catalog.get(db).question_json[questions[0].id]
+
+    questions[0].text = "reworded"
+    db.commit()
+    snapshot = catalog.get(db)
+    assert snapshot.questions_page_json(0, 100).count(b"reworded") == 1
+
+
+def test_version_change_elsewhere_reloads_snapshot(
+    db: Session, questions, monkeypatch
+) -> None:
+    """Test a change from another process is picked up at the next check."""
+    snapshot = catalog.get(db)
+
+    # A raw SQL change does not go through this process's ORM hooks
+    connection = db.connection()
+    connection.execute(
+        update(Question.__table__)
+        .where(Question.__table__.c.id == questions[0].id)
+        .values(text="edited elsewhere")
+    )
+    bump_catalog_version(db)
+    db.commit()
+    assert catalog.get(db) is snapshot
+
+    monkeypatch.setattr(catalog, "check_seconds", 0)
+    reloaded = catalog.get(db)
+    assert reloaded.version == snapshot.version + 1
+    assert b"edited elsewhere" in reloaded.question_json[questions[0].id]
+    assert db.get(DataVersion, CATALOG).version == reloaded.version
@@ -0,0 +1,83 @@
+"""Test compact AI feedback prompt construction."""
+from types import SimpleNamespace
+
+from app.services.prompt_builder import (
+    build_enhanced_feedback_prompt,
+    encode_competency_table,
+    estimate_tokens,
+)
+
+COMPETENCY_DATA = [
+    {
+        "name": "リーダーシップ",
+        "user_score": 4.33,
+        "company_average": 3.5,
+        "difference": 0.83,
+        "gap_analysis": "強み",
+    },
+    {
+        "name": "時間管理",
+        "user_score": 2.0,
+        "company_average": None,
+        "difference": None,
+        "gap_analysis": "改善要",
+    },
+]
+
+
+def test_encode_competency_table() -> None:
+    """Test competency rows are encoded one line per item."""
+    table = encode_competency_table(COMPETENCY_DATA)
+    lines = table.splitlines()
+    assert len(lines) == 3
+    assert lines[1] == "リーダーシップ|4.3|3.5|+0.8|強み"
+    assert lines[2] == "時間管理|2.0|-|-|改善要"
+
+
+def test_empty_career_plan_fields_are_omitted() -> None:
+    """Test unset career plan fields do not appear in the prompt."""
+    plan = SimpleNamespace(career_direction="マネージャー志望", target_position=None)
+    built = build_enhanced_feedback_prompt(
+        COMPETENCY_DATA, plan, "テスト", max_input_tokens=10_000
+    )
+    assert "目指す方向性: マネージャー志望" in built.text
+    assert "目標ポジション" not in built.text
+    assert "未設定" not in built.text
+    assert built.truncated_fields == ()
+
+
+def test_long_career_plan_fields_are_truncated_to_budget() -> None:
+    """Test the input token budget is enforced by truncating free text."""
+    plan = SimpleNamespace(
+        career_direction="方向性" * 400,
+        specific_goals="目標" * 100,
+    )
+    unbounded = build_enhanced_feedback_prompt(
+        COMPETENCY_DATA, plan, "テスト", max_input_tokens=100_000
+    )
+    budget = unbounded.estimated_tokens - 1000
+    built = build_enhanced_feedback_prompt(
+        COMPETENCY_DATA, plan, "テスト", max_input_tokens=budget
+    )
+    assert built.estimated_tokens <= budget
+    assert built.truncated_fields == ("career_direction",)
+    assert estimate_tokens(built.text) == built.estimated_tokens
+
+
+def test_unreachable_budget_truncates_to_the_floor() -> None:
+    """Test an unreachable budget cuts every field once and then gives up."""
+    plan = SimpleNamespace(
+        career_direction="方向性" * 400,
+        specific_goals="goal " * 200,
+        challenges_faced="課題" * 100,
+    )
+    built = build_enhanced_feedback_prompt(
+        COMPETENCY_DATA, plan, "テスト", max_input_tokens=10
+    )
+    assert built.estimated_tokens > 10
+    assert set(built.truncated_fields) == {
+        "career_direction",
+        "specific_goals",
+        "challenges_faced",
+    }
+    assert "方向性" * 13 + "方…" in built.text
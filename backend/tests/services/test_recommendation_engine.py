@@ -0,0 +1,92 @@
+"""Test the catalog-driven recommendation engine."""
+from app.services.recommendation_engine import (
+    CatalogEntry,
+    RecommendationEngine,
+    get_recommendation_engine,
+    score_band,
+)
+
+
+def _engine() -> RecommendationEngine:
+    return RecommendationEngine(
+        [
+            CatalogEntry(
+                id="lead-high",
+                kind="suggestion",
+                payload={"text": "lead a team"},
+                competencies=("Leadership",),
+                bands=("high",),
+            ),
+            CatalogEntry(
+                id="time-low",
+                kind="training",
+                payload={"text": "time management training"},
+                competencies=("Time",),
+                bands=("low",),
+            ),
+            CatalogEntry(
+                id="book-manager",
+                kind="book",
+                payload={"title": "Manager Book", "author": "A"},
+                competencies=("Leadership",),
+                bands=("high",),
+                keywords=("manager",),
+            ),
+            CatalogEntry(
+                id="book-general",
+                kind="book",
+                payload={"title": "General Book", "author": "B"},
+                weight=0.1,
+            ),
+            CatalogEntry(
+                id="general",
+                kind="suggestion",
+                payload={"text": "keep reflecting"},
+                weight=0.1,
+            ),
+        ]
+    )
+
+
+def test_score_band() -> None:
+    """Test scores are mapped to low, mid and high bands."""
+    assert score_band(2.9) == "low"
+    assert score_band(3.0) == "mid"
+    assert score_band(4.0) == "high"
+
+
+def test_recommend_matches_competency_bands() -> None:
+    """Test only entries tagged with the user's score band are ranked first."""
+    result = _engine().recommend({"Leadership": 4.5, "Time": 2.0})
+    assert result.suggestions == ["lead a team", "keep reflecting"]
+    assert result.trainings == ["time management training"]
+    assert [book["title"] for book in result.books] == [
+        "Manager Book",
+        "General Book",
+    ]
+
+
+def test_recommend_without_matches_falls_back_to_general_entries() -> None:
+    """Test general entries are returned when no competency matches."""
+    result = _engine().recommend({"Leadership": 3.5})
+    assert result.career_suggestions == ["keep reflecting"]
+    assert [book["title"] for book in result.books] == ["General Book"]
+
+
+def test_career_keywords_boost_entries() -> None:
+    """Test career-direction keywords raise matching entries."""
+    engine = _engine()
+    plain = engine.score({"Leadership": 4.0})
+    boosted = engine.score({"Leadership": 4.0}, "I want to become a manager")
+    assert boosted[2] > plain[2]
+
+
+def test_bundled_catalog_covers_seeded_competencies() -> None:
+    """Test the bundled catalog yields suggestions and books for weak areas."""
+    result = get_recommendation_engine().recommend(
+        {"時間管理": 1.5, "専門知識": 2.0, "リーダーシップ": 4.5},
+        "エンジニアからマネージャーを目指す",
+    )
+    assert "タスク管理ツールの活用や時間管理研修の受講をおすすめします" in result.trainings
+    assert len(result.career_suggestions) == 5
+    assert len(result.books) == 3
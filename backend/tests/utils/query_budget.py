@@ -0,0 +1,37 @@
+"""Assert how many SQL statements a block of code issues."""
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@contextmanager
+def assert_max_queries(budget: int) -> Iterator[List[str]]:
+    """
+    Fail if more than budget statements run on any engine inside the block.
+
+    Listens on every engine, so statements from the TestClient's thread and
+    from async sessions are counted too.
+    """
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    if len(statements) > budget:
+        repeated = "\n".join(
+            f"  {n}x {' '.join(sql.split())[:160]}"
+            for sql, n in Counter(statements).most_common(5)
+        )
+        raise AssertionError(
+            f"{len(statements)} queries exceeded the budget of {budget}; "
+            f"most frequent:\n{repeated}"
+        )
@@ -0,0 +1,82 @@
+"""Capture queries and check their execution plans."""
+import re
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+
+Statement = Tuple[str, Any]
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+@contextmanager
+def capture_selects(db: Session) -> Iterator[List[Statement]]:
+    """Record the SELECT statements the session executes inside the block."""
+    engine = db.get_bind()
+    statements: List[Statement] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def plan_problems(
+    db: Session, statement: str, parameters: Any, allow_covering_scan: bool = False
+) -> List[str]:
+    """
+    EXPLAIN a statement and describe any full table scan or sort in its plan.
+
+    Supports MySQL (access type ALL/index, "Using filesort") and SQLite
+    (SCAN of a table, temp B-tree for ORDER BY). With allow_covering_scan,
+    reading a whole index that covers the query is accepted, as for
+    aggregates over every row.
+    """
+    dialect = db.get_bind().dialect.name
+    conn = db.connection()
+    if dialect == "sqlite":
+        rows = conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).fetchall()
+        problems = []
+        for row in rows:
+            detail = row[-1]
+            match = _SQLITE_SCAN.match(detail)
+            if match and match.group(1) in Base.metadata.tables:
+                if not (allow_covering_scan and "COVERING INDEX" in detail):
+                    problems.append(detail)
+            elif "TEMP B-TREE FOR ORDER BY" in detail:
+                problems.append(detail)
+        return problems
+
+    rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings()
+    problems = []
+    for row in rows:
+        covered = row["type"] == "index" and "Using index" in (row["Extra"] or "")
+        if row["type"] in ("ALL", "index") and not (allow_covering_scan and covered):
+            problems.append(f"{row['table']}: full scan ({row['type']})")
+        elif "Using filesort" in (row["Extra"] or ""):
+            problems.append(f"{row['table']}: {row['Extra']}")
+    return problems
+
+
+def assert_indexed(
+    db: Session, statements: List[Statement], allow_covering_scan: bool = False
+) -> None:
+    """Fail if any captured statement's plan scans or sorts a whole table."""
+    assert statements, "no queries were captured"
+    failures = []
+    for statement, parameters in statements:
+        problems = plan_problems(db, statement, parameters, allow_covering_scan)
+        if problems:
+            failures.append(f"{statement}\n  -> " + "\n  -> ".join(problems))
+    assert not failures, "query plan regressed:\n" + "\n".join(failures)
@@ -8,10 +8,12 @@ import { Input } from '@/components/ui/input'
 import { Label } from '@/components/ui/label'
 import { Textarea } from '@/components/ui/textarea'
 import { careerPlansApi, UserCareerPlan, UserCareerPlanCreate } from '@/lib/api-client'
+import { useTakeBootstrap } from '@/lib/bootstrap'
 import { Target, Users, BookOpen, Lightbulb } from 'lucide-react'
 
 export default function CareerPlanPage() {
   const router = useRouter()
+  const takeBootstrap = useTakeBootstrap()
   const [careerPlan, setCareerPlan] = useState<UserCareerPlan | null>(null)
   const [formData, setFormData] = useState<UserCareerPlanCreate>({
     career_direction: '',
@@ -31,19 +33,26 @@ export default function CareerPlanPage() {
   useEffect(() => {
     const fetchCareerPlan = async () => {
       try {
-        const response = await careerPlansApi.getCareerPlan()
-        setCareerPlan(response.data)
+        const bootstrap = takeBootstrap()
+        const plan = bootstrap
+          ? bootstrap.career_plan
+          : (await careerPlansApi.getCareerPlan()).data
+        if (!plan) {
+          console.log('No existing career plan found')
+          return
+        }
+        setCareerPlan(plan)
         setFormData({
-          career_direction: response.data.career_direction || '',
-          target_position: response.data.target_position || '',
-          target_timeframe: response.data.target_timeframe || '',
-          strengths_to_enhance: response.data.strengths_to_enhance || '',
-          weaknesses_to_overcome: response.data.weaknesses_to_overcome || '',
-          specific_goals: response.data.specific_goals || '',
-          personality_traits: response.data.personality_traits || '',
-          preferred_learning_style: response.data.preferred_learning_style || '',
-          challenges_faced: response.data.challenges_faced || '',
-          motivation_factors: response.data.motivation_factors || '',
+          career_direction: plan.career_direction || '',
+          target_position: plan.target_position || '',
+          target_timeframe: plan.target_timeframe || '',
+          strengths_to_enhance: plan.strengths_to_enhance || '',
+          weaknesses_to_overcome: plan.weaknesses_to_overcome || '',
+          specific_goals: plan.specific_goals || '',
+          personality_traits: plan.personality_traits || '',
+          preferred_learning_style: plan.preferred_learning_style || '',
+          challenges_faced: plan.challenges_faced || '',
+          motivation_factors: plan.motivation_factors || '',
         })
       } catch (error) {
         console.log('No existing career plan found')
@@ -53,7 +62,7 @@ export default function CareerPlanPage() {
     }
 
     fetchCareerPlan()
-  }, [])
+  }, [takeBootstrap])
 
   const handleInputChange = (field: keyof UserCareerPlanCreate, value: string) => {
     setFormData(prev => ({
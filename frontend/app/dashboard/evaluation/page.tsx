@@ -6,6 +6,7 @@ import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/com
 import { Button } from '@/components/ui/button'
 import { Label } from '@/components/ui/label'
 import { questionsApi, answersApi, QuestionWithAnswer, AnswerCreate } from '@/lib/api-client'
+import { useTakeBootstrap } from '@/lib/bootstrap'
 import { ChevronLeft, ChevronRight } from 'lucide-react'
 
 const SCORE_OPTIONS = [
@@ -18,6 +19,7 @@ const SCORE_OPTIONS = [
 
 export default function EvaluationPage() {
   const router = useRouter()
+  const takeBootstrap = useTakeBootstrap()
   const [questions, setQuestions] = useState<QuestionWithAnswer[]>([])
   const [answers, setAnswers] = useState<Record<number, number>>({})
   const [currentIndex, setCurrentIndex] = useState(0)
@@ -27,12 +29,15 @@ export default function EvaluationPage() {
   useEffect(() => {
     const fetchQuestions = async () => {
       try {
-        const response = await questionsApi.getAllWithAnswers()
-        setQuestions(response.data)
+        const bootstrap = takeBootstrap()
+        const questionsData = bootstrap
+          ? bootstrap.questions
+          : (await questionsApi.getAllWithAnswers()).data
+        setQuestions(questionsData)
         
         // Set existing answers
         const existingAnswers: Record<number, number> = {}
-        response.data.forEach((q) => {
+        questionsData.forEach((q) => {
           if (q.user_answer !== undefined && q.user_answer !== null) {
             existingAnswers[q.id] = q.user_answer
           }
@@ -46,7 +51,7 @@ export default function EvaluationPage() {
     }
 
     fetchQuestions()
-  }, [])
+  }, [takeBootstrap])
 
   const handleAnswerChange = (questionId: number, score: number) => {
     setAnswers((prev) => ({
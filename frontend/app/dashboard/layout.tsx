@@ -1,12 +1,13 @@
 'use client'
 
-import { useEffect, useState } from 'react'
+import { useCallback, useEffect, useRef, useState } from 'react'
 import { useRouter } from 'next/navigation'
 import Link from 'next/link'
 import { User, LayoutDashboard, FileText, LogOut } from 'lucide-react'
 import { Button } from '@/components/ui/button'
-import { isAuthenticated, removeAuthToken } from '@/lib/auth'
-import { authApi } from '@/lib/api-client'
+import { getRefreshToken, isAuthenticated, removeAuthToken } from '@/lib/auth'
+import { authApi, bootstrapApi, Bootstrap } from '@/lib/api-client'
+import { BootstrapContext } from '@/lib/bootstrap'
 
 export default function DashboardLayout({
   children,
@@ -16,6 +17,13 @@ export default function DashboardLayout({
   const router = useRouter()
   const [user, setUser] = useState<any>(null)
   const [isLoading, setIsLoading] = useState(true)
+  const bootstrapRef = useRef<Bootstrap | null>(null)
+
+  const takeBootstrap = useCallback(() => {
+    const bootstrap = bootstrapRef.current
+    bootstrapRef.current = null
+    return bootstrap
+  }, [])
 
   useEffect(() => {
     if (!isAuthenticated()) {
@@ -23,10 +31,11 @@ export default function DashboardLayout({
       return
     }
 
-    const fetchUser = async () => {
+    const fetchBootstrap = async () => {
       try {
-        const response = await authApi.getCurrentUser()
-        setUser(response.data)
+        const response = await bootstrapApi.get()
+        bootstrapRef.current = response.data
+        setUser(response.data.user)
       } catch (error) {
         console.error('Failed to fetch user:', error)
         router.push('/login')
@@ -35,10 +44,15 @@ export default function DashboardLayout({
       }
     }
 
-    fetchUser()
+    fetchBootstrap()
   }, [router])
 
-  const handleLogout = () => {
+  const handleLogout = async () => {
+    try {
+      await authApi.logout(getRefreshToken())
+    } catch (error) {
+      console.error('Failed to revoke session:', error)
+    }
     removeAuthToken()
     router.push('/login')
   }
@@ -121,7 +135,9 @@ export default function DashboardLayout({
         {/* Content */}
         <main className="flex-1 overflow-y-auto bg-gray-50">
           <div className="max-w-7xl mx-auto p-6">
-            {children}
+            <BootstrapContext.Provider value={takeBootstrap}>
+              {children}
+            </BootstrapContext.Provider>
           </div>
         </main>
       </div>
@@ -5,12 +5,14 @@ import { useSearchParams } from 'next/navigation'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
 import { competenciesApi, CompetencyResult, AIFeedbackResponse } from '@/lib/api-client'
+import { useTakeBootstrap } from '@/lib/bootstrap'
 import Link from 'next/link'
 import { FileText, TrendingUp, Users, Brain, Target, Lightbulb, BookOpen, AlertTriangle, CheckCircle } from 'lucide-react'
 import { RadarChart } from '@/components/ui/radar-chart'
 
 export default function DashboardPage() {
   const searchParams = useSearchParams()
+  const takeBootstrap = useTakeBootstrap()
   const [results, setResults] = useState<CompetencyResult | null>(null)
   const [feedback, setFeedback] = useState<AIFeedbackResponse | null>(null)
   const [isLoading, setIsLoading] = useState(true)
@@ -35,14 +37,18 @@ export default function DashboardPage() {
 
   useEffect(() => {
     const fetchResults = async () => {
+      // The layout's bootstrap already holds the results and cached feedback
+      const bootstrap = takeBootstrap()
       try {
         console.log('Fetching competency results...')
-        const response = await competenciesApi.getResults()
-        console.log('Competency results:', response.data)
-        setResults(response.data)
+        const resultsData = bootstrap
+          ? bootstrap.results
+          : (await competenciesApi.getResults()).data
+        console.log('Competency results:', resultsData)
+        setResults(resultsData)
         
         // Only fetch AI feedback if user just completed evaluation
-        if (response.data.user_competencies.length > 0) {
+        if (resultsData.user_competencies.length > 0) {
           const justCompleted = searchParams.get('evaluation') === 'completed'
           if (justCompleted) {
             setIsLoadingFeedback(true)
@@ -61,10 +67,12 @@ export default function DashboardPage() {
             // Check for existing AI feedback in database
             try {
               console.log('Checking for existing AI feedback in database...')
-              const feedbackResponse = await competenciesApi.getFeedback(false)
-              if (feedbackResponse.data.feedback && feedbackResponse.data.from_cache) {
+              const feedbackData = bootstrap
+                ? bootstrap.feedback
+                : (await competenciesApi.getFeedback(false)).data
+              if (feedbackData.feedback && feedbackData.from_cache) {
                 console.log('Found existing AI feedback in database')
-                setFeedback(feedbackResponse.data)
+                setFeedback(feedbackData)
               } else {
                 console.log('No existing AI feedback found - user can request it manually')
               }
@@ -88,7 +96,7 @@ export default function DashboardPage() {
     }
 
     fetchResults()
-  }, [searchParams])
+  }, [searchParams, takeBootstrap])
 
   if (isLoading) {
     return (
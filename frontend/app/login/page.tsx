@@ -11,7 +11,7 @@ import { Input } from '@/components/ui/input'
 import { Button } from '@/components/ui/button'
 import { Label } from '@/components/ui/label'
 import { authApi } from '@/lib/api-client'
-import { setAuthToken } from '@/lib/auth'
+import { setAuthToken, setRefreshToken } from '@/lib/auth'
 
 const loginSchema = z.object({
   email: z.string().email('有効なメールアドレスを入力してください'),
@@ -48,6 +48,9 @@ export default function LoginPage() {
       })
       
       setAuthToken(response.data.access_token)
+      if (response.data.refresh_token) {
+        setRefreshToken(response.data.refresh_token)
+      }
       router.push('/dashboard')
     } catch (err: any) {
       setError(err.response?.data?.detail || 'ログインに失敗しました')
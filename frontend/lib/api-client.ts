@@ -1,5 +1,11 @@
 import axios from 'axios';
-import { getAuthToken, removeAuthToken } from './auth';
+import {
+  getAuthToken,
+  getRefreshToken,
+  removeAuthToken,
+  setAuthToken,
+  setRefreshToken,
+} from './auth';
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8002';
 
@@ -24,11 +30,49 @@ apiClient.interceptors.request.use(
   }
 );
 
+// Access tokens are short-lived; concurrent 401s share one refresh call
+let refreshPromise: Promise<string> | null = null;
+
+const refreshAccessToken = (): Promise<string> => {
+  const refreshToken = getRefreshToken();
+  if (!refreshToken) {
+    return Promise.reject(new Error('No refresh token'));
+  }
+  if (!refreshPromise) {
+    refreshPromise = axios
+      .post<LoginResponse>(`${API_URL}/api/v1/auth/refresh`, {
+        refresh_token: refreshToken,
+      })
+      .then((response) => {
+        setAuthToken(response.data.access_token);
+        if (response.data.refresh_token) {
+          setRefreshToken(response.data.refresh_token);
+        }
+        return response.data.access_token;
+      })
+      .finally(() => {
+        refreshPromise = null;
+      });
+  }
+  return refreshPromise;
+};
+
 // Response interceptor to handle auth errors
 apiClient.interceptors.response.use(
   (response) => response,
-  (error) => {
-    if (error.response?.status === 401) {
+  async (error) => {
+    const original = error.config;
+    if (error.response?.status === 401 && original && !original._retried) {
+      original._retried = true;
+      try {
+        const token = await refreshAccessToken();
+        original.headers.Authorization = `Bearer ${token}`;
+        return apiClient(original);
+      } catch {
+        removeAuthToken();
+        window.location.href = '/login';
+      }
+    } else if (error.response?.status === 401) {
       removeAuthToken();
       window.location.href = '/login';
     }
@@ -55,6 +99,8 @@ export interface LoginRequest {
 export interface LoginResponse {
   access_token: string;
   token_type: string;
+  refresh_token?: string;
+  expires_in?: number;
 }
 
 export interface RegisterRequest {
@@ -142,6 +188,9 @@ export const authApi = {
   
   getCurrentUser: () => 
     apiClient.get<User>('/users/me'),
+
+  logout: (refreshToken: string | null) =>
+    apiClient.post('/auth/logout', { refresh_token: refreshToken }),
 };
 
 export const questionsApi = {
@@ -242,4 +291,18 @@ export const careerPlansApi = {
   
   deleteCareerPlan: () => 
     apiClient.delete('/career-plans/'),
-};
\ No newline at end of file
+};
+export interface Bootstrap {
+  user: User;
+  questions: QuestionWithAnswer[];
+  career_plan: UserCareerPlan | null;
+  results: CompetencyResult;
+  // Same body as competenciesApi.getFeedback(false)
+  feedback: AIFeedbackResponse;
+}
+
+export const bootstrapApi = {
+  // Everything the dashboard shows after login, in one round trip
+  get: () => 
+    apiClient.get<Bootstrap>('/bootstrap/'),
+};
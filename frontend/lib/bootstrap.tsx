@@ -0,0 +1,11 @@
+'use client'
+
+import { createContext, useContext } from 'react'
+import { Bootstrap } from './api-client'
+
+// The dashboard layout loads every page's initial data with one request.
+// The first page to render takes it; pages navigated to later fetch their
+// own data, since the bootstrap is stale by then.
+export const BootstrapContext = createContext<() => Bootstrap | null>(() => null)
+
+export const useTakeBootstrap = () => useContext(BootstrapContext)